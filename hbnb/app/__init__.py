@@ -5,6 +5,8 @@ from flask_bcrypt import Bcrypt
 from flask_migrate import Migrate
 from prometheus_flask_exporter import PrometheusMetrics
 from app.db import db
+from app.log import configure_logging
+from config import config
 
 # Initialisation des extensions
 bcrypt = Bcrypt()
@@ -20,15 +22,13 @@ def create_app(config_name="default"):
     """
     app = Flask(__name__)
 
-    # Configuration
+    # Configuration: caches, journalisation, hachage... (config.py)
+    app.config.from_object(config[config_name])
     if config_name == "testing":
         app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-        app.config["TESTING"] = True
-    else:
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///hbnb.db"
 
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SECRET_KEY"] = "dev"  # À changer en production
+    # Journalisation structurée, écrite par un thread d'arrière-plan
+    configure_logging(app.config)
 
     # Initialisation des extensions
     db.init_app(app)
@@ -42,8 +42,38 @@ def create_app(config_name="default"):
         from app.models.place import Place
         from app.models.review import Review
         from app.models.amenity import Amenity
+        from app.models.catalog_version import CatalogVersion
+        from app.models.admin_stat import AdminStat
+        from app.models.idempotency_key import IdempotencyKey
+        from app.models.place_fts import install_fulltext_index
+        from app.services.facade import facade
+        from app.services.idempotency import idempotency_store
 
         # Création des tables
         db.create_all()
 
+        # Index plein texte des logements (bases existantes)
+        with db.engine.begin() as connection:
+            install_fulltext_index(connection)
+
+        # Caches de la façade, recomptage périodique des statistiques
+        facade.init_app(app)
+
+        # Clés d'idempotence, purgées en arrière-plan à leur expiration
+        idempotency_store.init_app(app)
+
+    @app.cli.command("reconcile-stats")
+    def reconcile_stats():
+        """Recompte les statistiques d'administration à la demande"""
+        from app.services.facade import facade
+
+        facade.reconcile_admin_stats()
+
+    @app.cli.command("purge-idempotency-keys")
+    def purge_idempotency_keys():
+        """Supprime les clés d'idempotence expirées"""
+        from app.services.idempotency import idempotency_store
+
+        idempotency_store.purge()
+
     return app
@@ -1,8 +1,10 @@
 """Admin endpoints implementation."""
 
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.facade import facade
+from app.api.v1.transaction import unit_of_work
+from app.services.passwords import PasswordHasherBusy
 
 api = Namespace("admin", description="Admin operations")
 
@@ -36,31 +38,67 @@ amenity_model = api.model(
     {"id": fields.String(readonly=True), "name": fields.String(required=True)},
 )
 
+place_rating_model = api.model(
+    "PlaceRating",
+    {
+        "id": fields.String(),
+        "title": fields.String(),
+        "avg_rating": fields.Float(),
+    },
+)
+
 stats_model = api.model(
     "Stats",
     {
-        "total_users": fields.Integer(),
-        "total_places": fields.Integer(),
-        "total_reviews": fields.Integer(),
-        "total_amenities": fields.Integer(),
-        "avg_rating": fields.Float(),
+        "users_count": fields.Integer(),
+        "places_count": fields.Integer(),
+        "reviews_count": fields.Integer(),
+        "amenities_count": fields.Integer(),
+        "average_rating": fields.Float(),
+        "reconciled_at": fields.DateTime(
+            description="Last full recount of the counters"
+        ),
+        "age_seconds": fields.Float(
+            description="Seconds since reconciled_at"
+        ),
+        "fresh": fields.Boolean(
+            description="True when recounted for this request"
+        ),
+        "places_by_rating": fields.List(
+            fields.Nested(place_rating_model),
+            description="Only with fresh=1",
+        ),
     },
 )
 
+stats_parser = reqparse.RequestParser()
+stats_parser.add_argument(
+    "fresh",
+    type=inputs.boolean,
+    default=False,
+    location="args",
+    help="Recount the tables instead of reading the counters",
+)
+
 
 @api.route("/users/")
 class AdminUsers(Resource):
     @api.doc("create_user")
     @api.expect(user_model)
     @api.marshal_with(user_model, code=201)
+    @api.response(503, "Password hashing saturated")
     @jwt_required()
+    @unit_of_work
     def post(self):
         """Create a new user (admin only)."""
         current_user = get_jwt_identity()
-        return (
-            facade.admin_create_user(api.payload, current_user.get("id")),
-            201,
-        )
+        try:
+            return (
+                facade.admin_create_user(api.payload, current_user),
+                201,
+            )
+        except PasswordHasherBusy:
+            api.abort(503, "Too many password changes, retry later")
 
 
 @api.route("/users/<string:user_id>")
@@ -68,21 +106,27 @@ class AdminUser(Resource):
     @api.doc("update_user")
     @api.expect(user_model)
     @api.marshal_with(user_model)
+    @api.response(503, "Password hashing saturated")
     @jwt_required()
+    @unit_of_work
     def put(self, user_id):
         """Update any user (admin only)."""
         current_user = get_jwt_identity()
-        return facade.admin_update_user(
-            user_id, api.payload, current_user.get("id")
-        )
+        try:
+            return facade.admin_update_user(
+                user_id, api.payload, current_user
+            )
+        except PasswordHasherBusy:
+            api.abort(503, "Too many password changes, retry later")
 
     @api.doc("delete_user")
     @api.response(204, "User deleted")
     @jwt_required()
+    @unit_of_work
     def delete(self, user_id):
         """Delete any user (admin only)."""
         current_user = get_jwt_identity()
-        facade.admin_delete_user(user_id, current_user.get("id"))
+        facade.admin_delete_user(user_id, current_user)
         return "", 204
 
 
@@ -92,35 +136,60 @@ class AdminPlace(Resource):
     @api.expect(place_model)
     @api.marshal_with(place_model)
     @jwt_required()
+    @unit_of_work
     def put(self, place_id):
         """Update any place (admin only)."""
         current_user = get_jwt_identity()
         return facade.admin_manage_place(
-            place_id, api.payload, current_user.get("id")
+            place_id, api.payload, current_user
         )
 
     @api.doc("delete_place")
     @api.response(204, "Place deleted")
     @jwt_required()
+    @unit_of_work
     def delete(self, place_id):
         """Delete any place (admin only)."""
         current_user = get_jwt_identity()
-        facade.admin_delete_place(place_id, current_user.get("id"))
+        facade.admin_delete_place(place_id, current_user)
         return "", 204
 
 
+@api.route("/places/geo-index")
+class AdminPlaceGeoIndex(Resource):
+    @api.doc("rebuild_geo_index")
+    @jwt_required()
+    def post(self):
+        """Rebuild the geohash index of every place (admin only)."""
+        current_user = get_jwt_identity()
+        count = facade.admin_rebuild_geo_index(current_user)
+        return {"indexed": count}
+
+
+@api.route("/places/ratings")
+class AdminPlaceRatings(Resource):
+    @api.doc("rebuild_rating_aggregates")
+    @jwt_required()
+    def post(self):
+        """Rebuild the rating aggregates of every place (admin only)."""
+        current_user = get_jwt_identity()
+        count = facade.admin_rebuild_rating_aggregates(current_user)
+        return {"rebuilt": count}
+
+
 @api.route("/amenities/")
 class AdminAmenities(Resource):
     @api.doc("create_amenity")
     @api.expect(amenity_model)
     @api.marshal_with(amenity_model, code=201)
     @jwt_required()
+    @unit_of_work
     def post(self):
         """Create a new amenity (admin only)."""
         current_user = get_jwt_identity()
         return (
             facade.admin_manage_amenity(
-                None, api.payload, current_user.get("id")
+                None, api.payload, current_user
             ),
             201,
         )
@@ -132,20 +201,25 @@ class AdminAmenity(Resource):
     @api.expect(amenity_model)
     @api.marshal_with(amenity_model)
     @jwt_required()
+    @unit_of_work
     def put(self, amenity_id):
         """Update an amenity (admin only)."""
         current_user = get_jwt_identity()
         return facade.admin_manage_amenity(
-            amenity_id, api.payload, current_user.get("id")
+            amenity_id, api.payload, current_user
         )
 
 
 @api.route("/stats")
 class AdminStats(Resource):
     @api.doc("get_stats")
+    @api.expect(stats_parser)
     @api.marshal_with(stats_model)
     @jwt_required()
     def get(self):
         """Get global statistics (admin only)."""
         current_user = get_jwt_identity()
-        return facade.admin_get_stats(current_user.get("id"))
+        args = stats_parser.parse_args()
+        return facade.admin_get_stats(
+            current_user, fresh=args["fresh"]
+        )
@@ -1,9 +1,21 @@
 """Amenities API endpoints implementation."""
 
+import json
+from flask import Response
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.facade import facade  # Import singleton facade instance
 from app.services.user_service import UserService
+from app.api.v1.bulk import bulk_items, bulk_response, bulk_result_model
+from app.api.v1.caching import cached
+from app.api.v1.conditional import conditional_entity, conditional_version
+from app.api.v1.listing import (
+    marshal_page,
+    page_model,
+    pagination_parser,
+    sparse_fields,
+)
+from app.api.v1.transaction import unit_of_work
 import logging
 
 # Configuration des logs
@@ -24,20 +36,44 @@ amenity_model = api.model(
     },
 )
 
+amenity_page_model = page_model(api, amenity_model)
+amenity_bulk_model = bulk_result_model(api, amenity_model)
+
 # Création d'une seule instance de UserService
 user_service = UserService(facade)
 
 
 @api.route("/")
 class AmenityList(Resource):
-    @api.doc("list_amenities", responses={200: ("Success", [amenity_model])})
-    @api.marshal_list_with(amenity_model)
+    @api.doc(
+        "list_amenities",
+        responses={200: ("Success", amenity_page_model), 400: "Bad cursor"},
+    )
+    @api.expect(pagination_parser)
+    @cached("amenities")
+    @conditional_version(lambda: facade.get_amenity_catalog().version)
     def get(self):
-        """List all amenities"""
+        """List amenities, one page at a time"""
+        args = pagination_parser.parse_args()
+        if not any(args[key] for key in ("limit", "cursor", "fields")):
+            # Default first page, serialized once per catalog version
+            body = facade.get_amenity_catalog().rendered(
+                "first_page",
+                lambda: json.dumps(
+                    marshal_page(facade.list_amenities(), amenity_model)
+                ),
+            )
+            return Response(body, mimetype="application/json")
         try:
-            return facade.get_all_amenities()
+            names = sparse_fields(args["fields"], amenity_model)
+            page = facade.list_amenities(
+                limit=args["limit"], cursor=args["cursor"], fields=names
+            )
+            return marshal_page(page, amenity_model, names)
+        except ValueError as e:
+            api.abort(400, str(e))
         except Exception as e:
-            logger.error(f"Error getting amenities: {str(e)}")
+            logger.error("Error getting amenities: %s", e)
             return {"error": "Internal server error"}, 500
 
     @api.doc(
@@ -59,15 +95,18 @@ class AmenityList(Resource):
         )
     )
     @jwt_required()
+    @unit_of_work
     def post(self):
         """Create a new amenity (admin only)"""
         try:
             # Get current user from JWT
             current_user = get_jwt_identity()
-            logger.debug(f"User attempting to create amenity: {current_user}")
+            logger.debug(
+                "User %s attempting to create amenity", current_user.get("id")
+            )
 
             # Verify admin status
-            if not user_service.is_admin(current_user.get("id")):
+            if not user_service.is_admin(current_user):
                 return {"error": "Admin privileges required"}, 403
 
             # Validate input
@@ -77,16 +116,40 @@ class AmenityList(Resource):
 
             # Create amenity using facade
             amenity = facade.create_amenity({"name": name})
-            return amenity, 201
+            return amenity.to_dict(), 201
 
         except ValueError as e:
-            logger.warning(f"Validation error: {str(e)}")
+            logger.warning("Validation error: %s", e)
             return {"error": str(e)}, 400
         except Exception as e:
-            logger.error(f"Error creating amenity: {str(e)}")
+            logger.error("Error creating amenity: %s", e)
             return {"error": "Internal server error"}, 500
 
 
+@api.route("/bulk")
+class AmenityBulk(Resource):
+    @api.doc(
+        "bulk_create_amenities",
+        responses={
+            201: ("Every amenity created", amenity_bulk_model),
+            207: ("Some amenities rejected", amenity_bulk_model),
+            400: "Validation Error",
+            403: "Admin privileges required",
+        },
+    )
+    @api.expect([amenity_model])
+    @jwt_required()
+    def post(self):
+        """Create many amenities in one request (admin only)"""
+        if not user_service.is_admin(get_jwt_identity()):
+            return {"error": "Admin privileges required"}, 403
+        try:
+            items = bulk_items(api.payload, amenity_model)
+            return bulk_response(facade.bulk_create_amenities(items))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+
 @api.route("/<string:amenity_id>")
 @api.param("amenity_id", "The amenity identifier")
 class AmenityResource(Resource):
@@ -94,6 +157,8 @@ class AmenityResource(Resource):
         "get_amenity",
         responses={200: ("Success", amenity_model), 404: "Amenity not found"},
     )
+    @cached("amenities")
+    @conditional_entity("amenities", "amenity_id")
     @api.marshal_with(amenity_model)
     def get(self, amenity_id):
         """Fetch an amenity by ID"""
@@ -103,7 +168,7 @@ class AmenityResource(Resource):
                 return {"error": "Amenity not found"}, 404
             return amenity
         except Exception as e:
-            logger.error(f"Error getting amenity: {str(e)}")
+            logger.error("Error getting amenity: %s", e)
             return {"error": "Internal server error"}, 500
 
     @api.doc(
@@ -126,13 +191,14 @@ class AmenityResource(Resource):
         )
     )
     @jwt_required()
+    @unit_of_work
     def put(self, amenity_id):
         """Update an amenity (admin only)"""
         try:
             current_user = get_jwt_identity()
 
             # Verify admin status
-            if not user_service.is_admin(current_user.get("id")):
+            if not user_service.is_admin(current_user):
                 return {"error": "Admin privileges required"}, 403
 
             # Check if amenity exists
@@ -147,12 +213,12 @@ class AmenityResource(Resource):
             # Update amenity
             amenity_data = {"name": name}
             amenity = facade.update_amenity(amenity_id, amenity_data)
-            return amenity
+            return amenity.to_dict()
 
         except ValueError as e:
             return {"error": str(e)}, 400
         except Exception as e:
-            logger.error(f"Error updating amenity: {str(e)}")
+            logger.error("Error updating amenity: %s", e)
             return {"error": "Internal server error"}, 500
 
     @api.doc(
@@ -164,13 +230,14 @@ class AmenityResource(Resource):
         },
     )
     @jwt_required()
+    @unit_of_work
     def delete(self, amenity_id):
         """Delete an amenity (admin only)"""
         try:
             current_user = get_jwt_identity()
 
             # Verify admin status
-            if not user_service.is_admin(current_user.get("id")):
+            if not user_service.is_admin(current_user):
                 return {"error": "Admin privileges required"}, 403
 
             # Check if amenity exists
@@ -182,5 +249,5 @@ class AmenityResource(Resource):
             return "", 204
 
         except Exception as e:
-            logger.error(f"Error deleting amenity: {str(e)}")
+            logger.error("Error deleting amenity: %s", e)
             return {"error": "Internal server error"}, 500
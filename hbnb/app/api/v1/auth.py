@@ -1,9 +1,10 @@
+import logging
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import create_access_token
 from app.services.facade import facade
-from flask import Flask, request, jsonify
-from app.models.user import User
-from app import db
+from app.services.passwords import PasswordHasherBusy
+
+logger = logging.getLogger(__name__)
 
 api = Namespace("auth", description="Authentication operations")
 
@@ -16,78 +17,42 @@ login_model = api.model(
 )
 
 
-@app.route("/api/users", methods=["POST"])
-def create_user():
-    data = request.get_json()
-    try:
-        new_user = User(
-            username=data["username"],
-            password=data["password"],
-            email=data["email"],
-        )
-        db.session.add(new_user)
-        db.session.commit()
-        return (
-            jsonify(
-                {
-                    "message": "User created successfully",
-                    "user": new_user.to_dict(),
-                }
-            ),
-            201,
-        )
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 400
-
-
 @api.route("/login")
 class Login(Resource):
     @api.expect(login_model)
     @api.response(200, "Login successful")
     @api.response(401, "Authentication failed")
     @api.response(400, "Validation Error")
+    @api.response(503, "Too many concurrent logins")
     def post(self):
         """Authenticate user and return JWT token"""
         try:
-            print(
-                f"Login attempt received with payload: {
-                    api.payload}"
-            )  # Debug log
-
             if not api.payload:
-                print("No payload received")  # Debug log
+                logger.info("Login rejected", extra={"reason": "no_payload"})
                 return {"message": "Missing login credentials"}, 400
 
             if "email" not in api.payload or "password" not in api.payload:
-                print("Missing email or password in payload")  # Debug log
+                logger.info(
+                    "Login rejected", extra={"reason": "missing_fields"}
+                )
                 return {"message": "Email and password are required"}, 400
 
             email = api.payload["email"].strip()
             password = api.payload["password"]
 
-            print(f"Looking for user with email: {email}")  # Debug log
-
-            user = facade.get_user_by_email(email)
+            user = facade.authenticate_user(email, password)
 
             if not user:
-                print(f"No user found with email: {email}")  # Debug log
+                logger.info(
+                    "Login failed", extra={"reason": "invalid_credentials"}
+                )
                 return {"message": "Invalid credentials"}, 401
 
-            print(f"Found user: {user.email}, verifying password")  # Debug log
-
-            if not user.verify_password(password):
-                print("Password verification failed")  # Debug log
-                return {"message": "Invalid credentials"}, 401
-
-            token_data = {
-                "id": str(user.id),
-                "is_admin": getattr(user, "is_admin", False),
-            }
-
-            access_token = create_access_token(identity=token_data)
+            access_token = create_access_token(
+                identity=facade.token_claims(user)
+            )
 
-            print("Login successful, token generated")  # Debug log
+            logger.debug("Login succeeded", extra={"user_id": str(user.id)})
 
             return {
                 "access_token": access_token,
@@ -100,6 +65,9 @@ class Login(Resource):
                 },
             }, 200
 
+        except PasswordHasherBusy:
+            logger.warning("Login refused, password hashing saturated")
+            return {"message": "Too many login attempts, retry later"}, 503
         except Exception as e:
-            print(f"Login error: {str(e)}")  # Debug log
+            logger.exception("Login error")
             return {"message": f"Error during login: {str(e)}"}, 500
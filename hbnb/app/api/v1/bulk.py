@@ -0,0 +1,53 @@
+"""Shared helpers for the bulk create endpoints."""
+
+from flask_restx import fields
+
+
+def bulk_result_model(api, model):
+    """Build the bulk create result envelope for items of `model`"""
+    result = api.model(
+        f"{model.name}BulkItemResult",
+        {
+            "index": fields.Integer(description="Position in the request"),
+            "id": fields.String(description="Identifier of the new item"),
+            "error": fields.String(description="Why the item was rejected"),
+        },
+    )
+    return api.model(
+        f"{model.name}BulkResult",
+        {
+            "created": fields.Integer,
+            "failed": fields.Integer,
+            "results": fields.List(fields.Nested(result)),
+        },
+    )
+
+
+def bulk_items(payload, model, extra=()):
+    """
+    Validate the request body shape and keep the writable fields of
+    `model` (plus `extra`) of each item; ids, owners and aggregates
+    cannot be set through a bulk request.
+    """
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of items")
+    writable = [
+        name for name, field in model.items() if not field.readonly
+    ] + list(extra)
+    return [
+        {name: item[name] for name in writable if name in item}
+        if isinstance(item, dict)
+        else item
+        for item in payload
+    ]
+
+
+def bulk_response(results):
+    """201 when every item was created, 207 Multi-Status otherwise"""
+    failed = sum(1 for result in results if "error" in result)
+    body = {
+        "created": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+    return body, 207 if failed else 201
@@ -0,0 +1,88 @@
+"""Response caching for the public GET endpoints."""
+
+import gzip
+from functools import wraps
+from urllib.parse import urlencode
+from flask import Response, request
+from flask_restx.utils import unpack
+from app.api.v1.listing import NDJSON, wants_ndjson
+from app.services.response_cache import response_cache
+
+# Headers kept with a cached body
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def _cache_key():
+    """
+    Path and query string with the parameters in a stable order, and
+    the format negotiated from Accept (JSON pages or NDJSON streams)
+    """
+    query = urlencode(sorted(request.args.items(multi=True)))
+    mimetype = NDJSON if wants_ndjson() else "application/json"
+    return f"{mimetype} {request.path}?{query}"
+
+
+def _serve(entry):
+    """Rebuild a cached response, compressed when the client allows"""
+    body = entry["body"]
+    headers = dict(entry["headers"])
+    if "gzip" in request.accept_encodings:
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    response = Response(body, headers=headers)
+    response.vary.update(("Accept", "Accept-Encoding"))
+    response.headers["X-Cache"] = "HIT"
+    return response.make_conditional(request)
+
+
+def cached(*tags):
+    """
+    Serve the view from the response cache. `tags` name what the body
+    depends on and may use the view arguments, e.g. "place:{place_id}";
+    the facade invalidates them when it writes. Only complete 200
+    responses are stored; streams, errors and 304s pass through.
+    Apply it outside the conditional GET decorators.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(resource, *args, **kwargs):
+            if not response_cache.enabled:
+                return view(resource, *args, **kwargs)
+            key = _cache_key()
+            tokens = response_cache.tokens(
+                [tag.format(**kwargs) for tag in tags]
+            )
+            entry = response_cache.get(request.endpoint, key, tokens)
+            if entry is not None:
+                return _serve(entry)
+
+            result = view(resource, *args, **kwargs)
+            if isinstance(result, Response):
+                response = result
+            else:
+                data, code, headers = unpack(result)
+                response = resource.api.make_response(data, code, headers)
+            if (
+                response.status_code == 200
+                and response.mimetype == "application/json"
+                and not response.is_streamed
+            ):
+                response_cache.set(
+                    key,
+                    tokens,
+                    {
+                        name: response.headers[name]
+                        for name in _STORED_HEADERS
+                        if name in response.headers
+                    },
+                    response.get_data(),
+                )
+            response.vary.add("Accept")
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
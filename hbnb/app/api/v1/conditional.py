@@ -0,0 +1,181 @@
+"""Conditional GET support (ETag / Last-Modified) for the API views."""
+
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import Response, g, request
+from flask_restx import abort
+from flask_restx.utils import unpack
+from werkzeug.http import http_date, quote_etag
+from app.services.facade import facade
+
+
+def _etag(*parts):
+    """Strong entity tag built from the version parts"""
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _entity_etag(table, entity_id, version, updated_at):
+    """Tag of one row: moves with its version and with updated_at"""
+    return _etag(table, entity_id, version, updated_at.isoformat())
+
+
+def _http_time(value):
+    """Stored timestamps are naive UTC, HTTP dates whole seconds"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def _not_modified(etag, last_modified=None):
+    """Evaluate If-None-Match, then If-Modified-Since (RFC 9110)"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _respond(view, args, kwargs, etag, last_modified=None):
+    """Answer 304 from the version alone, else tag the view response"""
+    headers = {"ETag": quote_etag(etag)}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if _not_modified(etag, last_modified):
+        return Response(status=304, headers=headers)
+
+    result = view(*args, **kwargs)
+    if isinstance(result, Response):
+        if result.status_code == 200:
+            result.headers.update(headers)
+        return result
+    data, code, extra = unpack(result)
+    if code != 200:
+        return data, code, extra
+    return data, code, {**dict(extra or {}), **headers}
+
+
+def conditional_entity(table, id_arg):
+    """
+    Conditional GET for a single row of `table`, identified by the view
+    argument `id_arg`. Only version and updated_at are read before
+    deciding, so a 304 never loads nor serializes the entity.
+    Apply it outside marshal_with.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            row = facade.get_row_version(table, kwargs[id_arg])
+            if row is None:
+                # Missing row: the view answers its own 404
+                return view(*args, **kwargs)
+            version, updated_at = row
+            etag = _entity_etag(table, kwargs[id_arg], version, updated_at)
+            return _respond(
+                view, args, kwargs, etag, _http_time(updated_at)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_version(version):
+    """
+    Conditional GET for a body fully determined by `version()`, e.g.
+    an in-memory catalog, so a 304 needs no database query at all.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = _etag(
+                version(),
+                request.full_path,
+                request.headers.get("Accept", ""),
+            )
+            return _respond(view, args, kwargs, etag)
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_collection(table, skip_args=(), **criteria_args):
+    """
+    Conditional GET for a collection of `table`, tagged by the newest
+    updated_at and the row count. `criteria_args` maps columns to the
+    view arguments narrowing the collection, e.g. place_id="place_id".
+    The query string and Accept header are part of the tag since they
+    shape the body. No Last-Modified: deletions do not move it.
+    Requests with one of the `skip_args` query parameters, filters on
+    data the tag does not follow, always run the view.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if any(arg in request.args for arg in skip_args):
+                return view(*args, **kwargs)
+            criteria = {
+                column: kwargs[arg] for column, arg in criteria_args.items()
+            }
+            newest, count = facade.get_collection_version(table, **criteria)
+            etag = _etag(
+                table,
+                newest.isoformat() if newest else "",
+                count,
+                request.full_path,
+                request.headers.get("Accept", ""),
+            )
+            return _respond(view, args, kwargs, etag)
+
+        return wrapper
+
+    return decorator
+
+
+def if_match(table, id_arg):
+    """
+    Honor If-Match on a write to one row of `table`, identified by the
+    view argument `id_arg`: unless the header holds the current tag of
+    the row (or "*"), answer 412 without running the view. Otherwise
+    the version behind the tag is kept for expected_version(), so that
+    the UPDATE itself only matches the row at that version.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.expected_version = None
+            if request.if_match:
+                row = facade.get_row_version(table, kwargs[id_arg])
+                if row is None:
+                    abort(412, "Precondition failed: no current version")
+                version, updated_at = row
+                etag = _entity_etag(
+                    table, kwargs[id_arg], version, updated_at
+                )
+                if not (
+                    request.if_match.star_tag
+                    or request.if_match.contains(etag)
+                ):
+                    abort(412, "Precondition failed: the entity changed")
+                g.expected_version = version
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def expected_version():
+    """Version the If-Match header of the request was checked against"""
+    return g.get("expected_version")
+
+
+def abort_conflict(error):
+    """A concurrent write won: 412 under If-Match, else 409"""
+    abort(412 if request.if_match else 409, str(error))
@@ -0,0 +1,89 @@
+"""Idempotency-Key support for the create endpoints."""
+
+import json
+from functools import wraps
+from flask import Response, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_restx import abort
+from flask_restx.utils import unpack
+from app.services.idempotency import digest, idempotency_store
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _caller():
+    """Keys are scoped to the authenticated user, if any"""
+    verify_jwt_in_request(optional=True)
+    identity = get_jwt_identity()
+    if isinstance(identity, dict):
+        return str(identity.get("id", ""))
+    return str(identity or "")
+
+
+def _payload(result):
+    """Status and JSON body of a view result"""
+    if isinstance(result, Response):
+        return result.status_code, result.get_data(as_text=True)
+    data, code, _ = unpack(result)
+    return code, json.dumps(data)
+
+
+def idempotent(view):
+    """
+    Honor the Idempotency-Key header: the first response to a key
+    (per user and route) is stored, and retries with the same key and
+    body get it back without running the view again. The same key with
+    another body is refused with 422, and a retry arriving while the
+    first request runs with 409. Error responses, raised (api.abort)
+    or returned, are never stored: their work was rolled back, so the
+    key is released and a retry runs the request again.
+    Apply it outside marshal_with and jwt_required.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            abort(
+                400,
+                f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} "
+                "characters long",
+            )
+
+        claim = digest(key, _caller(), request.method, request.path)
+        fingerprint = digest(request.get_data())
+        stored = idempotency_store.claim(claim, fingerprint)
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                abort(
+                    422,
+                    f"{IDEMPOTENCY_HEADER} already used for another request",
+                )
+            if stored.status is None:
+                abort(
+                    409,
+                    f"A request with this {IDEMPOTENCY_HEADER} is in progress",
+                )
+            return Response(
+                stored.body,
+                status=stored.status,
+                mimetype="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+        try:
+            result = view(*args, **kwargs)
+        except BaseException:
+            idempotency_store.release(claim)
+            raise
+        status, body = _payload(result)
+        if status >= 400:
+            idempotency_store.release(claim)
+        else:
+            idempotency_store.complete(claim, status, body)
+        return result
+
+    return wrapper
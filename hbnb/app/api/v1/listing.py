@@ -0,0 +1,133 @@
+"""Shared helpers for the paginated list endpoints."""
+
+import json
+from flask import Response, request, stream_with_context
+from flask_restx import fields, inputs, marshal, reqparse
+
+NDJSON = "application/x-ndjson"
+
+# Items serialized before a chunk is handed to the server
+STREAM_CHUNK_ITEMS = 100
+
+# Query string accepted by every list endpoint
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument(
+    "limit",
+    type=int,
+    location="args",
+    help="Maximum number of items to return (default 50, max 500)",
+)
+pagination_parser.add_argument(
+    "cursor",
+    type=str,
+    location="args",
+    help="Opaque cursor taken from the `next` field of the previous page",
+)
+pagination_parser.add_argument(
+    "fields",
+    type=str,
+    location="args",
+    help="Comma-separated item fields to return, e.g. id,title,price",
+)
+pagination_parser.add_argument(
+    "stream",
+    type=inputs.boolean,
+    default=False,
+    location="args",
+    help="Stream every remaining item instead of one page "
+    "(also implied by Accept: application/x-ndjson)",
+)
+
+
+def page_model(api, model):
+    """Build the page envelope model wrapping `model` for a namespace"""
+    return api.model(
+        f"{model.name}Page",
+        {
+            "items": fields.List(fields.Nested(model)),
+            "next": fields.String(
+                description="Cursor of the following page, null when done"
+            ),
+        },
+    )
+
+
+def sparse_fields(raw, model):
+    """
+    Parse the `fields` parameter into a list of field names of `model`.
+    The id is always kept, so that items can still be told apart and
+    fetched. Returns None when every field is wanted.
+    """
+    if not raw:
+        return None
+    names = []
+    for name in raw.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in model]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not names:
+        return None
+    if "id" in model and "id" not in names:
+        names.insert(0, "id")
+    return names
+
+
+def marshal_page(page, model, names=None):
+    """Marshal a page, keeping only `names` when a projection is asked"""
+    item_fields = model if names is None else {n: model[n] for n in names}
+    return marshal(
+        page,
+        {
+            "items": fields.List(fields.Nested(item_fields)),
+            "next": fields.String,
+        },
+    )
+
+
+def wants_ndjson():
+    """True when the client prefers newline-delimited JSON"""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON])
+    return best == NDJSON
+
+
+def wants_stream(args):
+    """True when the whole collection should be streamed"""
+    return bool(args.get("stream")) or wants_ndjson()
+
+
+def stream_page(items, model, names=None):
+    """
+    Stream `items` as they are produced instead of building the list.
+    The JSON body keeps the page shape with a null `next`; NDJSON sends
+    one item per line.
+    """
+    item_fields = model if names is None else {n: model[n] for n in names}
+    ndjson = wants_ndjson()
+
+    def generate():
+        chunk = []
+        first = True
+        if not ndjson:
+            yield '{"items": ['
+        for item in items:
+            data = json.dumps(marshal(item, item_fields))
+            if ndjson:
+                chunk.append(data + "\n")
+            else:
+                chunk.append(data if first else "," + data)
+                first = False
+            if len(chunk) >= STREAM_CHUNK_ITEMS:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+        if not ndjson:
+            yield '], "next": null}'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=NDJSON if ndjson else "application/json",
+    )
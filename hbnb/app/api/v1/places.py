@@ -1,6 +1,30 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.facade import facade
+from app.services.facade import (
+    ConflictError,
+    ForbiddenError,
+    NotFoundError,
+    facade,
+)
+from app.api.v1.bulk import bulk_items, bulk_response, bulk_result_model
+from app.api.v1.caching import cached
+from app.api.v1.conditional import (
+    abort_conflict,
+    conditional_collection,
+    conditional_entity,
+    expected_version,
+    if_match,
+)
+from app.api.v1.idempotency import idempotent
+from app.api.v1.listing import (
+    marshal_page,
+    page_model,
+    pagination_parser,
+    sparse_fields,
+    stream_page,
+    wants_stream,
+)
+from app.api.v1.transaction import unit_of_work
 
 api = Namespace("places", description="Place operations")
 
@@ -28,19 +52,146 @@ place_model = api.model(
     },
 )
 
+place_page_model = page_model(api, place_model)
+place_bulk_model = bulk_result_model(api, place_model)
+
+# Amenity sets added to, removed from or replacing those of places
+amenity_links_model = api.model(
+    "PlaceAmenityLinks",
+    {
+        "place_ids": fields.List(
+            fields.String,
+            description="Places to change (the URL place when omitted)",
+        ),
+        "amenity_ids": fields.List(fields.String, required=True),
+    },
+)
+amenity_links_result_model = api.model(
+    "PlaceAmenityLinksResult",
+    {"added": fields.Integer, "removed": fields.Integer},
+)
+
+
+def change_amenities(place_ids, mode):
+    """Apply an amenity link change for the current user"""
+    payload = api.payload or {}
+    if place_ids is None:
+        place_ids = payload.get("place_ids")
+        if not place_ids:
+            api.abort(400, "place_ids must list at least one place")
+    try:
+        return facade.set_place_amenities(
+            place_ids,
+            payload.get("amenity_ids") or [],
+            mode,
+            user=get_jwt_identity(),
+        )
+    except ValueError as e:
+        if str(e).startswith("Unauthorized"):
+            api.abort(403, str(e))
+        api.abort(400, str(e))
+
+
+# Search filters accepted by the place listing
+place_list_parser = pagination_parser.copy()
+place_list_parser.add_argument(
+    "q",
+    type=str,
+    location="args",
+    help="Keywords searched in titles and descriptions, best match first",
+)
+place_list_parser.add_argument(
+    "price_min", type=float, location="args", help="Minimum price per night"
+)
+place_list_parser.add_argument(
+    "price_max", type=float, location="args", help="Maximum price per night"
+)
+place_list_parser.add_argument(
+    "rating_min", type=float, location="args", help="Minimum average rating"
+)
+place_list_parser.add_argument(
+    "amenities",
+    action="split",
+    location="args",
+    help="Comma-separated amenity ids, at least one required",
+)
+place_list_parser.add_argument(
+    "amenities_all",
+    action="split",
+    location="args",
+    help="Comma-separated amenity ids, all required",
+)
+place_list_parser.add_argument(
+    "amenities_none",
+    action="split",
+    location="args",
+    help="Comma-separated amenity ids, none allowed",
+)
+AMENITY_FILTERS = ("amenities", "amenities_all", "amenities_none")
+PLACE_FILTERS = ("q", "price_min", "price_max", "rating_min") + AMENITY_FILTERS
+
+nearby_place_model = api.inherit(
+    "NearbyPlace",
+    place_model,
+    {"distance_km": fields.Float(description="Distance from the point")},
+)
+
+nearby_parser = reqparse.RequestParser()
+nearby_parser.add_argument(
+    "lat", type=float, required=True, location="args", help="Latitude"
+)
+nearby_parser.add_argument(
+    "lon", type=float, required=True, location="args", help="Longitude"
+)
+nearby_parser.add_argument(
+    "radius_km",
+    type=float,
+    default=10.0,
+    location="args",
+    help="Search radius in kilometers",
+)
+nearby_parser.add_argument(
+    "k", type=int, default=20, location="args", help="Maximum results"
+)
+
 
 @api.route("/")
 class PlaceList(Resource):
     @api.doc("list_places")
-    @api.marshal_list_with(place_model)
+    @api.expect(place_list_parser)
+    @api.response(200, "Success", place_page_model)
+    @cached("places")
+    # Amenity links do not move places.updated_at
+    @conditional_collection("places", skip_args=AMENITY_FILTERS)
     def get(self):
-        """Public endpoint - List all places"""
-        return facade.get_all_places()
+        """Public endpoint - Search places, one page at a time"""
+        args = place_list_parser.parse_args()
+        filters = {
+            key: args[key] for key in PLACE_FILTERS if args[key] is not None
+        }
+        try:
+            names = sparse_fields(args["fields"], place_model)
+            if wants_stream(args):
+                items = facade.stream_places(
+                    filters, cursor=args["cursor"], fields=names
+                )
+                return stream_page(items, place_model, names)
+            page = facade.list_places(
+                filters,
+                limit=args["limit"],
+                cursor=args["cursor"],
+                fields=names,
+            )
+        except ValueError as e:
+            api.abort(400, str(e))
+        return marshal_page(page, place_model, names)
 
     @api.doc("create_place")
     @api.expect(place_model)
+    @idempotent
     @api.marshal_with(place_model, code=201)
     @jwt_required()
+    @unit_of_work
     def post(self):
         """Protected endpoint - Create a new place"""
         try:
@@ -58,10 +209,111 @@ class PlaceList(Resource):
             api.abort(400, str(e))
 
 
+@api.route("/bulk")
+class PlaceBulk(Resource):
+    @api.doc("bulk_create_places")
+    @api.expect([place_model])
+    @api.response(201, "Every place created", place_bulk_model)
+    @api.response(207, "Some places rejected", place_bulk_model)
+    @jwt_required()
+    def post(self):
+        """Protected endpoint - Create many places in one request"""
+        current_user = get_jwt_identity()
+        try:
+            items = bulk_items(api.payload, place_model, ["amenity_ids"])
+            results = facade.bulk_create_places(items, current_user["id"])
+        except ValueError as e:
+            api.abort(400, str(e))
+        return bulk_response(results)
+
+
+@api.route("/amenities")
+class PlacesAmenities(Resource):
+    @api.doc("add_places_amenities")
+    @api.expect(amenity_links_model)
+    @api.response(200, "Links added", amenity_links_result_model)
+    @jwt_required()
+    @unit_of_work
+    def post(self):
+        """Protected endpoint - Add amenities to many places (owner)"""
+        return change_amenities(None, "add")
+
+    @api.doc("replace_places_amenities")
+    @api.expect(amenity_links_model)
+    @api.response(200, "Links replaced", amenity_links_result_model)
+    @jwt_required()
+    @unit_of_work
+    def put(self):
+        """Protected endpoint - Replace the amenities of many places"""
+        return change_amenities(None, "replace")
+
+    @api.doc("remove_places_amenities")
+    @api.expect(amenity_links_model)
+    @api.response(200, "Links removed", amenity_links_result_model)
+    @jwt_required()
+    @unit_of_work
+    def delete(self):
+        """Protected endpoint - Remove amenities from many places"""
+        return change_amenities(None, "remove")
+
+
+@api.route("/<string:place_id>/amenities")
+@api.param("place_id", "The place identifier")
+class PlaceAmenities(Resource):
+    @api.doc("add_place_amenities")
+    @api.expect(amenity_links_model)
+    @api.response(200, "Links added", amenity_links_result_model)
+    @jwt_required()
+    @unit_of_work
+    def post(self, place_id):
+        """Protected endpoint - Add amenities to a place (owner)"""
+        return change_amenities([place_id], "add")
+
+    @api.doc("replace_place_amenities")
+    @api.expect(amenity_links_model)
+    @api.response(200, "Links replaced", amenity_links_result_model)
+    @jwt_required()
+    @unit_of_work
+    def put(self, place_id):
+        """Protected endpoint - Replace the amenities of a place"""
+        return change_amenities([place_id], "replace")
+
+    @api.doc("remove_place_amenities")
+    @api.expect(amenity_links_model)
+    @api.response(200, "Links removed", amenity_links_result_model)
+    @jwt_required()
+    @unit_of_work
+    def delete(self, place_id):
+        """Protected endpoint - Remove amenities from a place"""
+        return change_amenities([place_id], "remove")
+
+
+@api.route("/nearby")
+class PlaceNearby(Resource):
+    @api.doc("list_places_nearby")
+    @api.expect(nearby_parser)
+    @api.marshal_list_with(nearby_place_model)
+    def get(self):
+        """Public endpoint - Closest places around a point"""
+        args = nearby_parser.parse_args()
+        try:
+            nearby = facade.get_places_nearby(
+                args["lat"], args["lon"], args["radius_km"], args["k"]
+            )
+        except ValueError as e:
+            api.abort(400, str(e))
+        return [
+            {**marshal(place, place_model), "distance_km": distance}
+            for place, distance in nearby
+        ]
+
+
 @api.route("/<string:place_id>")
 @api.param("place_id", "The place identifier")
 class Place(Resource):
     @api.doc("get_place")
+    @cached("place:{place_id}")
+    @conditional_entity("places", "place_id")
     @api.marshal_with(place_model)
     def get(self, place_id):
         """Public endpoint - Get place details"""
@@ -73,53 +325,47 @@ class Place(Resource):
     @api.doc("update_place")
     @api.expect(place_model)
     @api.marshal_with(place_model)
+    @api.response(412, "Place changed since the If-Match tag")
     @jwt_required()
+    @if_match("places", "place_id")
+    @unit_of_work
     def put(self, place_id):
         """Protected endpoint - Update place (owner only)"""
+        current_user = get_jwt_identity()
         try:
-            # Get current authenticated user
-            current_user = get_jwt_identity()
-
-            # Check if place exists
-            place = facade.get_place(place_id)
-            if not place:
-                api.abort(404, "Place not found")
-
-            # Verify ownership
-            if str(place.owner_id) != str(current_user.get("id")):
-                api.abort(
-                    403, "Unauthorized: only the owner can modify this place"
-                )
-
-            # Update place
-            return facade.update_place(place_id, api.payload)
-
+            # One UPDATE guarded by owner, and by the If-Match version
+            return facade.update_place_if_owner(
+                place_id,
+                api.payload,
+                current_user.get("id"),
+                version=expected_version(),
+            )
+        except NotFoundError:
+            api.abort(404, "Place not found")
+        except ForbiddenError:
+            api.abort(
+                403, "Unauthorized: only the owner can modify this place"
+            )
+        except ConflictError as e:
+            abort_conflict(e)
         except ValueError as e:
             api.abort(400, str(e))
 
     @api.doc("delete_place")
     @api.response(204, "Place deleted")
     @jwt_required()
+    @unit_of_work
     def delete(self, place_id):
         """Protected endpoint - Delete place (owner only)"""
+        current_user = get_jwt_identity()
         try:
-            # Get current authenticated user
-            current_user = get_jwt_identity()
-
-            # Check if place exists
-            place = facade.get_place(place_id)
-            if not place:
-                api.abort(404, "Place not found")
-
-            # Verify ownership
-            if str(place.owner_id) != str(current_user.get("id")):
-                api.abort(
-                    403, "Unauthorized: only the owner can delete this place"
-                )
-
-            # Delete place
-            facade.delete_place(place_id)
-            return "", 204
-
-        except Exception as e:
+            facade.delete_place_if_owner(place_id, current_user.get("id"))
+        except NotFoundError:
+            api.abort(404, "Place not found")
+        except ForbiddenError:
+            api.abort(
+                403, "Unauthorized: only the owner can delete this place"
+            )
+        except ValueError as e:
             api.abort(500, str(e))
+        return "", 204
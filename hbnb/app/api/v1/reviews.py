@@ -1,6 +1,30 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.facade import facade
+from app.services.facade import (
+    ConflictError,
+    ForbiddenError,
+    NotFoundError,
+    facade,
+)
+from app.api.v1.bulk import bulk_items, bulk_response, bulk_result_model
+from app.api.v1.caching import cached
+from app.api.v1.conditional import (
+    abort_conflict,
+    conditional_collection,
+    conditional_entity,
+    expected_version,
+    if_match,
+)
+from app.api.v1.idempotency import idempotent
+from app.api.v1.listing import (
+    marshal_page,
+    page_model,
+    pagination_parser,
+    sparse_fields,
+    stream_page,
+    wants_stream,
+)
+from app.api.v1.transaction import unit_of_work
 
 api = Namespace("reviews", description="Review operations")
 
@@ -19,54 +43,76 @@ review_model = api.model(
     },
 )
 
+review_page_model = page_model(api, review_model)
+review_bulk_model = bulk_result_model(api, review_model)
+
 
 @api.route("/")
 class ReviewList(Resource):
     @api.doc("list_reviews")
-    @api.marshal_list_with(review_model)
+    @api.expect(pagination_parser)
+    @api.response(200, "Success", review_page_model)
+    @conditional_collection("reviews")
     def get(self):
-        """List all reviews - Public endpoint"""
-        return facade.get_all_reviews()
+        """List reviews, one page at a time - Public endpoint"""
+        args = pagination_parser.parse_args()
+        try:
+            names = sparse_fields(args["fields"], review_model)
+            if wants_stream(args):
+                items = facade.stream_reviews(
+                    cursor=args["cursor"], fields=names
+                )
+                return stream_page(items, review_model, names)
+            page = facade.list_reviews(
+                limit=args["limit"], cursor=args["cursor"], fields=names
+            )
+        except ValueError as e:
+            api.abort(400, str(e))
+        return marshal_page(page, review_model, names)
 
     @api.doc("create_review")
     @api.expect(review_model)
+    @idempotent
     @api.marshal_with(review_model, code=201)
     @jwt_required()
+    @unit_of_work
     def post(self):
         """Create a new review - Authenticated users only"""
+        current_user = get_jwt_identity()
         try:
-            current_user = get_jwt_identity()
-            review_data = api.payload
-            place_id = review_data.get("place_id")
-
-            # Vérifier si le lieu existe
-            place = facade.get_place(place_id)
-            if not place:
-                api.abort(404, "Place not found")
-
-            # Vérifier que l'utilisateur n'est pas le propriétaire
-            if str(place.owner_id) == str(current_user.get("id")):
-                api.abort(400, "You cannot review your own place")
-
-            # Vérifier si l'utilisateur a déjà reviewé ce lieu
-            existing_review = facade.get_user_review_for_place(
-                current_user.get("id"), place_id
+            return (
+                facade.create_review(api.payload, current_user.get("id")),
+                201,
             )
-            if existing_review:
-                api.abort(400, "You have already reviewed this place")
+        except NotFoundError as e:
+            api.abort(404, str(e))
+        except ValueError as e:
+            api.abort(400, str(e))
 
-            # Ajouter l'ID utilisateur
-            review_data["user_id"] = current_user.get("id")
-            return facade.create_review(review_data), 201
 
+@api.route("/bulk")
+class ReviewBulk(Resource):
+    @api.doc("bulk_create_reviews")
+    @api.expect([review_model])
+    @api.response(201, "Every review created", review_bulk_model)
+    @api.response(207, "Some reviews rejected", review_bulk_model)
+    @jwt_required()
+    def post(self):
+        """Create many reviews in one request - Authenticated users only"""
+        current_user = get_jwt_identity()
+        try:
+            items = bulk_items(api.payload, review_model)
+            results = facade.bulk_create_reviews(items, current_user["id"])
         except ValueError as e:
             api.abort(400, str(e))
+        return bulk_response(results)
 
 
 @api.route("/<string:review_id>")
 @api.param("review_id", "The review identifier")
 class Review(Resource):
     @api.doc("get_review")
+    @conditional_entity("reviews", "review_id")
     @api.marshal_with(review_model)
     def get(self, review_id):
         """Get a review by ID - Public endpoint"""
@@ -78,63 +124,75 @@ class Review(Resource):
     @api.doc("update_review")
     @api.expect(review_model)
     @api.marshal_with(review_model)
+    @api.response(412, "Review changed since the If-Match tag")
     @jwt_required()
+    @if_match("reviews", "review_id")
+    @unit_of_work
     def put(self, review_id):
         """Update a review - Author only"""
+        current_user = get_jwt_identity()
         try:
-            current_user = get_jwt_identity()
-            review = facade.get_review(review_id)
-
-            if not review:
-                api.abort(404, "Review not found")
-
-            # Vérifier que l'utilisateur est l'auteur
-            if str(review.user_id) != str(current_user.get("id")):
-                api.abort(403, "Unauthorized action")
-
-            # Empêcher la modification du place_id
-            if (
-                "place_id" in api.payload
-                and api.payload["place_id"] != review.place_id
-            ):
-                api.abort(400, "Cannot change the place of a review")
-
-            return facade.update_review(review_id, api.payload)
-
+            # UPDATE guarded by author, place_id and the If-Match version
+            return facade.update_review_if_author(
+                review_id,
+                api.payload,
+                current_user.get("id"),
+                version=expected_version(),
+            )
+        except NotFoundError:
+            api.abort(404, "Review not found")
+        except ForbiddenError:
+            api.abort(403, "Unauthorized action")
+        except ConflictError as e:
+            abort_conflict(e)
         except ValueError as e:
             api.abort(400, str(e))
 
     @api.doc("delete_review")
     @api.response(204, "Review deleted")
     @jwt_required()
+    @unit_of_work
     def delete(self, review_id):
         """Delete a review - Author only"""
+        current_user = get_jwt_identity()
         try:
-            current_user = get_jwt_identity()
-            review = facade.get_review(review_id)
-
-            if not review:
-                api.abort(404, "Review not found")
-
-            # Vérifier que l'utilisateur est l'auteur
-            if str(review.user_id) != str(current_user.get("id")):
-                api.abort(403, "Unauthorized action")
-
-            facade.delete_review(review_id)
-            return "", 204
-
-        except Exception as e:
+            facade.delete_review_if_author(review_id, current_user.get("id"))
+        except NotFoundError:
+            api.abort(404, "Review not found")
+        except ForbiddenError:
+            api.abort(403, "Unauthorized action")
+        except ValueError as e:
             api.abort(500, str(e))
+        return "", 204
 
 
 @api.route("/places/<string:place_id>/reviews")
 @api.param("place_id", "The place identifier")
 class PlaceReviews(Resource):
     @api.doc("get_place_reviews")
-    @api.marshal_list_with(review_model)
+    @api.expect(pagination_parser)
+    @api.response(200, "Success", review_page_model)
+    @cached("reviews:{place_id}")
+    @conditional_collection("reviews", place_id="place_id")
     def get(self, place_id):
-        """Get all reviews for a specific place - Public endpoint"""
+        """Get the reviews of a specific place - Public endpoint"""
         place = facade.get_place(place_id)
         if not place:
             api.abort(404, "Place not found")
-        return facade.get_reviews_by_place(place_id)
+        args = pagination_parser.parse_args()
+        try:
+            names = sparse_fields(args["fields"], review_model)
+            if wants_stream(args):
+                items = facade.stream_reviews(
+                    place_id, cursor=args["cursor"], fields=names
+                )
+                return stream_page(items, review_model, names)
+            page = facade.list_reviews(
+                place_id=place_id,
+                limit=args["limit"],
+                cursor=args["cursor"],
+                fields=names,
+            )
+        except ValueError as e:
+            api.abort(400, str(e))
+        return marshal_page(page, review_model, names)
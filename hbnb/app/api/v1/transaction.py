@@ -0,0 +1,54 @@
+"""One unit of work, hence one commit, per API request."""
+
+from functools import wraps
+from flask import Response, request
+from flask_restx import abort
+from flask_restx.utils import unpack
+from werkzeug.exceptions import HTTPException
+from app.services.unit_of_work import UnitOfWork
+
+
+def _status(result):
+    if isinstance(result, Response):
+        return result.status_code
+    return unpack(result)[1]
+
+
+def unit_of_work(view):
+    """
+    Run a Resource method in one unit of work: the facade calls it
+    makes are flushed and committed together when it returns. An
+    exception (api.abort included) or an error status rolls them all
+    back; a write conflict without If-Match is retried once. Apply it
+    under jwt_required and marshal_with.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return _run(view, *args, **kwargs)
+        except HTTPException as e:
+            # A concurrent write won a race the client did not ask to
+            # detect (no If-Match): the unit was rolled back, run the
+            # view once more on the new rows
+            if e.code != 409 or request.if_match:
+                raise
+        return _run(view, *args, **kwargs)
+
+    return wrapper
+
+
+def _run(view, *args, **kwargs):
+    returned = False
+    try:
+        with UnitOfWork() as unit:
+            result = view(*args, **kwargs)
+            returned = True
+            if _status(result) >= 400:
+                unit.fail()
+    except ValueError as e:
+        if not returned:
+            raise
+        # The view succeeded but its work could not be committed
+        abort(400, str(e))
+    return result
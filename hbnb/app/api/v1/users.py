@@ -2,7 +2,25 @@
 
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.facade import facade
+from app.services.facade import ConflictError, facade
+from app.api.v1.conditional import (
+    abort_conflict,
+    conditional_collection,
+    conditional_entity,
+    expected_version,
+    if_match,
+)
+from app.api.v1.idempotency import idempotent
+from app.api.v1.listing import (
+    marshal_page,
+    page_model,
+    pagination_parser,
+    sparse_fields,
+    stream_page,
+    wants_stream,
+)
+from app.api.v1.transaction import unit_of_work
+from app.services.passwords import PasswordHasherBusy
 
 api = Namespace("users", description="User operations")
 
@@ -16,18 +34,32 @@ user_model = api.model(
     },
 )
 
+user_page_model = page_model(api, user_model)
+
 
 @api.route("/")
 class UserList(Resource):
     @api.doc("list_users")
-    @api.marshal_list_with(user_model)
+    @api.expect(pagination_parser)
+    @api.response(200, "Success", user_page_model)
     @jwt_required()
+    @conditional_collection("users")
     def get(self):
-        """List all users"""
+        """List users, one page at a time"""
+        args = pagination_parser.parse_args()
         try:
-            return (
-                facade.get_all_users()
-            )  # Assurez-vous que cette méthode existe
+            names = sparse_fields(args["fields"], user_model)
+            if wants_stream(args):
+                items = facade.stream_users(
+                    cursor=args["cursor"], fields=names
+                )
+                return stream_page(items, user_model, names)
+            page = facade.list_users(
+                limit=args["limit"], cursor=args["cursor"], fields=names
+            )
+            return marshal_page(page, user_model, names)
+        except ValueError as e:
+            api.abort(400, str(e))
         except Exception as e:
             api.abort(500, str(e))
 
@@ -46,6 +78,9 @@ class UserList(Resource):
     @api.response(201, "User created successfully")
     @api.response(400, "Validation Error")
     @api.response(409, "Email already registered")
+    @api.response(503, "Password hashing saturated")
+    @idempotent
+    @unit_of_work
     def post(self):
         """Create a new user"""
         try:
@@ -60,6 +95,8 @@ class UserList(Resource):
             }, 201
         except ValueError as e:
             return {"message": str(e)}, 400
+        except PasswordHasherBusy:
+            return {"message": "Too many password changes, retry later"}, 503
         except Exception as e:
             api.abort(500, str(e))
 
@@ -68,8 +105,9 @@ class UserList(Resource):
 @api.param("user_id", "The user identifier")
 class User(Resource):
     @api.doc("get_user")
-    @api.marshal_with(user_model)
     @jwt_required()
+    @conditional_entity("users", "user_id")
+    @api.marshal_with(user_model)
     def get(self, user_id):
         """Fetch a user by ID"""
         try:
@@ -83,19 +121,29 @@ class User(Resource):
 
     @api.doc("update_user")
     @api.expect(user_model)
+    @api.response(412, "User changed since the If-Match tag")
+    @api.response(503, "Password hashing saturated")
     @jwt_required()
+    @if_match("users", "user_id")
+    @unit_of_work
     def put(self, user_id):
         """Update a user"""
         current_user = get_jwt_identity()
 
         # Vérifiez si l'utilisateur a les droits nécessaires
-        if current_user["id"] != user_id and not current_user.get(
-            "is_admin", False
+        if current_user["id"] != user_id and not facade.is_admin(
+            current_user
         ):
             return {"message": "Access denied"}, 403
 
         try:
-            updated_user = facade.update_user(user_id, api.payload)
+            updated_user = facade.update_user(
+                user_id, api.payload, version=expected_version()
+            )
             return updated_user
+        except ConflictError as e:
+            abort_conflict(e)
+        except PasswordHasherBusy:
+            api.abort(503, "Too many password changes, retry later")
         except ValueError as e:
             api.abort(400, str(e))
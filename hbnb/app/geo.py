@@ -0,0 +1,75 @@
+"""Geohash cells and great-circle distances for place searches."""
+
+from math import asin, cos, radians, sin, sqrt
+
+# Précision stockée sur Place (cellules d'environ 5m x 5m)
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(lat, lon, precision=GEOHASH_PRECISION):
+    """Encode a coordinate into a geohash of `precision` characters"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            rng[0] = mid
+        else:
+            bits = bits * 2
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """Height and width in degrees of a geohash cell"""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def covering_cells(lat, lon, radius_km):
+    """
+    Geohash prefixes whose cells cover the circle around (lat, lon).
+    Picks the finest precision whose cells are at least `radius_km`
+    wide, so the cell holding the center plus its 8 neighbours always
+    contains the circle. Returns None when no precision is coarse
+    enough (huge radius or polar circle) and a full scan is needed.
+    """
+    worst_lat = min(90.0, abs(lat) + radius_km / KM_PER_DEGREE)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lon_deg = cell_size(precision)
+        height = lat_deg * KM_PER_DEGREE
+        width = lon_deg * KM_PER_DEGREE * cos(radians(worst_lat))
+        if height >= radius_km and width >= radius_km:
+            break
+    else:
+        return None
+
+    cells = set()
+    for dlat in (-lat_deg, 0.0, lat_deg):
+        for dlon in (-lon_deg, 0.0, lon_deg):
+            cell_lat = max(-90.0, min(90.0, lat + dlat))
+            cell_lon = (lon + dlon + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(cell_lat, cell_lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometers between two coordinates"""
+    phi1, phi2 = radians(lat1), radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = radians(lon2 - lon1)
+    a = sin(dphi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
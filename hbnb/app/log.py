@@ -0,0 +1,150 @@
+"""Structured logging: JSON records written by a background thread."""
+
+import atexit
+import copy
+import itertools
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Logger every module logger of the application descends from
+ROOT_LOGGER = "app"
+
+# Defaults, overridden by LOG_LEVEL / LOG_QUEUE_SIZE
+DEFAULT_LOG_LEVEL = "WARNING"
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else came through `extra`
+_RECORD_ATTRS = set(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the `extra` fields inlined"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one record out of every 1/rate below WARNING for the loggers
+    under each configured name, e.g. {"app.persistence": 0.01} for the
+    per-call records of a hot path. The longest matching name wins.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.every = {
+            name: max(1, round(1 / rate)) if rate > 0 else 0
+            for name, rate in rates.items()
+        }
+        self._seen = {name: itertools.count() for name in rates}
+
+    def _sampled_as(self, name: str) -> Optional[str]:
+        while name:
+            if name in self.every:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        sampled_as = self._sampled_as(record.name)
+        if sampled_as is None:
+            return True
+        every = self.every[sampled_as]
+        return bool(every) and next(self._seen[sampled_as]) % every == 0
+
+
+class _BackgroundHandler(QueueHandler):
+    """
+    Enqueues records for the listener thread. Only the message is
+    resolved here, so the arguments are not read from another thread;
+    serialization and I/O happen on the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Drop rather than block the request when the writer lags
+            pass
+
+
+def _level(value: Any) -> int:
+    return value if isinstance(value, int) else logging.getLevelName(value)
+
+
+def configure_logging(config: Dict[str, Any], stream=None) -> None:
+    """
+    Route the application loggers to a JSON handler on a background
+    thread. LOG_LEVEL sets the default level, LOG_LEVELS per-module
+    levels ({"app.persistence": "DEBUG"}) and LOG_SAMPLING the share
+    of records kept below WARNING per module ({"app.persistence": 0.01}).
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        if isinstance(handler, _BackgroundHandler):
+            root.removeHandler(handler)
+    root.setLevel(_level(config.get("LOG_LEVEL", DEFAULT_LOG_LEVEL)))
+    root.propagate = False
+
+    records = queue.Queue(config.get("LOG_QUEUE_SIZE", DEFAULT_LOG_QUEUE_SIZE))
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(JsonFormatter())
+    handler = _BackgroundHandler(records)
+    if config.get("LOG_SAMPLING"):
+        handler.addFilter(SamplingFilter(config["LOG_SAMPLING"]))
+    root.addHandler(handler)
+
+    for name, level in config.get("LOG_LEVELS", {}).items():
+        logging.getLogger(name).setLevel(_level(level))
+
+    _listener = QueueListener(records, writer, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def _flush_logs() -> None:
+    """Write the queued records before the process exits"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
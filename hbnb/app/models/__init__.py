@@ -8,5 +8,7 @@ def init_db():
     from app.models.place import Place
     from app.models.review import Review
     from app.models.amenity import Amenity
+    from app.models.catalog_version import CatalogVersion
+    from app.models.admin_stat import AdminStat
 
     db.create_all()
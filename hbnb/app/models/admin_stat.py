@@ -0,0 +1,17 @@
+"""Admin statistics model module"""
+
+from app.db import db
+
+
+class AdminStat(db.Model):
+    """
+    Compteur matérialisé des statistiques d'administration.
+    Les écritures de la façade le décalent dans leur transaction;
+    reconciled_at date le dernier recalcul complet.
+    """
+
+    __tablename__ = "admin_stats"
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    reconciled_at = db.Column(db.DateTime)
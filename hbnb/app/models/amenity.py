@@ -14,6 +14,10 @@ class Amenity(BaseModel):
     """
 
     __tablename__ = "amenities"
+    # Index de pagination par curseur (created_at, id)
+    __table_args__ = (
+        db.Index("ix_amenities_created_at_id", "created_at", "id"),
+    )
 
     # Colonne name unique et non-nullable selon requirements
     name = db.Column(db.String(255), nullable=False, unique=True)
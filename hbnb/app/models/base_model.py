@@ -2,6 +2,7 @@
 
 from app.models.base_model import BaseModel
 from app.db import db
+from sqlalchemy.orm import declared_attr
 import uuid
 from datetime import datetime, timezone
 
@@ -23,6 +24,13 @@ class BaseModel(db.Model):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Numéro de version: chaque UPDATE porte WHERE version = <lue> et
+    # l'incrémente, une modification concurrente n'y touche aucune ligne
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.__table__.c.version}
 
     def to_dict(self):
         """Convert to dictionary."""
@@ -0,0 +1,16 @@
+"""Catalog version model module"""
+
+from app.db import db
+
+
+class CatalogVersion(db.Model):
+    """
+    Numéro de version d'un catalogue gardé en mémoire par les workers.
+    Chaque écriture l'incrémente dans sa transaction; les workers le
+    relisent pour savoir si leur copie est à jour.
+    """
+
+    __tablename__ = "catalog_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,21 @@
+"""Idempotency key model module"""
+
+from app.db import db
+
+
+class IdempotencyKey(db.Model):
+    """
+    Réponse enregistrée d'une requête POST envoyée avec un en-tête
+    Idempotency-Key, rejouée telle quelle aux nouvelles tentatives.
+    digest condense la clé, l'utilisateur et la route en 16 octets;
+    status reste NULL tant que la première requête est en cours.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    digest = db.Column(db.LargeBinary(16), primary_key=True)
+    # Empreinte du corps de la requête, pour refuser une clé réutilisée
+    fingerprint = db.Column(db.LargeBinary(16), nullable=False)
+    status = db.Column(db.SmallInteger)
+    body = db.Column(db.Text)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
@@ -1,6 +1,8 @@
 """Place model module"""
 
+from sqlalchemy import event
 from app.db import db
+from app.geo import encode_geohash
 from app.models.base_model import BaseModel
 from app.models.association_tables import place_amenities
 
@@ -16,6 +18,10 @@ class Place(BaseModel):
     """
 
     __tablename__ = "places"
+    # Index de pagination par curseur (created_at, id)
+    __table_args__ = (
+        db.Index("ix_places_created_at_id", "created_at", "id"),
+    )
 
     # Colonnes requises par le projet
     title = db.Column(db.String(255), nullable=False)
@@ -23,6 +29,18 @@ class Place(BaseModel):
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    # Cellule geohash des coordonnées, indexée pour les recherches proches
+    geohash = db.Column(db.String(12), index=True)
+    # Agrégats des avis, maintenus dans la transaction de chaque avis
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_avg = db.Column(db.Float, index=True)
+    # Histogramme des notes par nombre d'étoiles
+    stars_1 = db.Column(db.Integer, nullable=False, default=0)
+    stars_2 = db.Column(db.Integer, nullable=False, default=0)
+    stars_3 = db.Column(db.Integer, nullable=False, default=0)
+    stars_4 = db.Column(db.Integer, nullable=False, default=0)
+    stars_5 = db.Column(db.Integer, nullable=False, default=0)
     owner_id = db.Column(
         db.String(36),
         db.ForeignKey("users.id", ondelete="CASCADE"),
@@ -35,10 +53,12 @@ class Place(BaseModel):
         backref=db.backref("places", lazy=True, cascade="all, delete-orphan"),
     )
 
+    # Chargement à la demande: chaque méthode de la façade choisit
+    # explicitement son profil de chargement (voir HBnBFacade.get_place)
     amenities = db.relationship(
         "Amenity",
         secondary=place_amenities,
-        lazy="subquery",  # Optimisé pour les requêtes fréquentes
+        lazy="select",
         back_populates="places",
     )
 
@@ -69,11 +89,22 @@ class Place(BaseModel):
         if self.longitude and (not -180 <= self.longitude <= 180):
             raise ValueError("Invalid longitude")
 
-    def to_dict(self):
+    @property
+    def rating_histogram(self):
+        """Nombre d'avis par note, de "1" à "5" étoiles"""
+        return {
+            str(star): getattr(self, f"stars_{star}") or 0
+            for star in range(1, 6)
+        }
+
+    def to_dict(self, amenities=None):
         """
         Convertit l'objet en dictionnaire pour l'API.
-        Inclut les relations essentielles.
+        Inclut les relations essentielles; `amenities` peut fournir les
+        équipements déjà sérialisés (catalogue) pour éviter leur chargement.
         """
+        if amenities is None:
+            amenities = [a.to_dict() for a in self.amenities]
         return {
             "id": self.id,
             "title": self.title,
@@ -84,5 +115,15 @@ class Place(BaseModel):
             "owner_id": self.owner_id,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
-            "amenities": [a.to_dict() for a in self.amenities],
+            "amenities": amenities,
         }
+
+
+@event.listens_for(Place, "before_insert")
+@event.listens_for(Place, "before_update")
+def _index_location(mapper, connection, place):
+    """Maintient la cellule geohash à chaque création ou modification"""
+    if place.latitude is None or place.longitude is None:
+        place.geohash = None
+    else:
+        place.geohash = encode_geohash(place.latitude, place.longitude)
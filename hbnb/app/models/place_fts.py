@@ -0,0 +1,141 @@
+"""Full-text index over place titles and descriptions.
+
+On SQLite the index is an FTS5 shadow table kept in sync with `places`
+by triggers, so every write path (ORM, bulk or raw SQL) updates it in
+the same transaction. Other databases fall back to LIKE matching.
+"""
+
+import re
+import weakref
+from sqlalchemy import column, event, func, literal_column, or_, select
+from sqlalchemy import table, text
+from sqlalchemy.exc import OperationalError
+from app.models.place import Place
+
+FTS_TABLE = "places_fts"
+
+# Poids bm25 par colonne: place_id n'est pas classé, le titre compte
+# plus que la description
+_RANK = f"bm25({FTS_TABLE}, 0.0, 10.0, 1.0)"
+
+# place_id reste une colonne indexée pour que les triggers retrouvent
+# la ligne par MATCH au lieu de parcourir toute la table virtuelle
+_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        place_id, title, description, tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON places
+    BEGIN
+        INSERT INTO {FTS_TABLE} (place_id, title, description)
+        VALUES (new.id, new.title, coalesce(new.description, ''));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON places
+    BEGIN
+        DELETE FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH 'place_id : "' || old.id || '"';
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, description ON places
+    BEGIN
+        DELETE FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH 'place_id : "' || old.id || '"';
+        INSERT INTO {FTS_TABLE} (place_id, title, description)
+        VALUES (new.id, new.title, coalesce(new.description, ''));
+    END""",
+    f"""INSERT INTO {FTS_TABLE} (place_id, title, description)
+    SELECT id, title, coalesce(description, '') FROM places""",
+]
+
+_fts = table(FTS_TABLE, column("place_id"))
+_available = weakref.WeakKeyDictionary()
+
+
+def install_fulltext_index(connection):
+    """Create and backfill the FTS5 table when it does not exist yet"""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+    if exists:
+        return
+    try:
+        for statement in _CREATE:
+            connection.execute(text(statement))
+    except OperationalError:
+        # SQLite compilé sans FTS5: la recherche passe en LIKE
+        pass
+
+
+@event.listens_for(Place.__table__, "after_create")
+def _create_fulltext_index(target, connection, **kw):
+    install_fulltext_index(connection)
+
+
+@event.listens_for(Place.__table__, "before_drop")
+def _drop_fulltext_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+def fulltext_available(session):
+    """Whether the FTS5 table exists on the session's database"""
+    engine = session.get_bind()
+    if engine not in _available:
+        _available[engine] = (
+            engine.dialect.name == "sqlite"
+            and session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+                {"name": FTS_TABLE},
+            ).first()
+            is not None
+        )
+    return _available[engine]
+
+
+def search_terms(q):
+    """Split free text into search words, dropping FTS5 operators"""
+    terms = re.findall(r"\w+", q or "", re.UNICODE)
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return terms
+
+
+def match_places(session, q):
+    """
+    Return (subquery, rank) matching `q` on title and description.
+    The subquery exposes place_id and rank; lower ranks are more
+    relevant. Every word must match, the last one as a prefix.
+    """
+    terms = search_terms(q)
+    if fulltext_available(session):
+        phrases = [f'"{term}"' for term in terms[:-1]]
+        phrases.append(f'"{terms[-1]}"*')
+        expression = "{title description} : (" + " ".join(phrases) + ")"
+        subquery = (
+            select(
+                _fts.c.place_id,
+                literal_column(_RANK).label("rank"),
+            )
+            .where(literal_column(FTS_TABLE).op("MATCH")(expression))
+            .subquery()
+        )
+        return subquery, subquery.c.rank
+
+    # Sans FTS5 toutes les correspondances ont le même rang
+    conditions = [
+        or_(
+            func.lower(Place.title).contains(term.lower(), autoescape=True),
+            func.lower(Place.description).contains(
+                term.lower(), autoescape=True
+            ),
+        )
+        for term in terms
+    ]
+    subquery = (
+        select(Place.id.label("place_id"), literal_column("0").label("rank"))
+        .where(*conditions)
+        .subquery()
+    )
+    return subquery, subquery.c.rank
@@ -33,6 +33,11 @@ class Review(BaseModel):
         db.UniqueConstraint(
             "user_id", "place_id", name="unique_user_place_review"
         ),
+        # Index de pagination par curseur (created_at, id)
+        db.Index("ix_reviews_created_at_id", "created_at", "id"),
+        db.Index(
+            "ix_reviews_place_created_at_id", "place_id", "created_at", "id"
+        ),
     )
 
     # Relations avec cascade delete
@@ -2,7 +2,6 @@
 
 from app.db import db
 from app.models.base_model import BaseModel
-from werkzeug.security import generate_password_hash, check_password_hash
 
 
 class User(BaseModel):
@@ -16,6 +15,8 @@ class User(BaseModel):
     """
 
     __tablename__ = "users"
+    # Index de pagination par curseur (created_at, id)
+    __table_args__ = (db.Index("ix_users_created_at_id", "created_at", "id"),)
 
     # Colonnes selon requirements
     email = db.Column(db.String(255), unique=True, nullable=False)
@@ -23,6 +24,9 @@ class User(BaseModel):
     first_name = db.Column(db.String(255), nullable=False)
     last_name = db.Column(db.String(255), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
+    # Incrémenté quand le rôle ou le mot de passe change:
+    # les jetons émis avant ne sont plus crus sur parole
+    token_version = db.Column(db.Integer, nullable=False, default=0)
 
     def __init__(self, *args, **kwargs):
         """
@@ -47,14 +51,19 @@ class User(BaseModel):
             raise ValueError("Invalid email format")
 
     def set_password(self, password):
-        """Hash le mot de passe avant stockage"""
+        """Hash le mot de passe avant stockage (pool de hachage)"""
         if not password:
             raise ValueError("Password cannot be empty")
-        self.password = generate_password_hash(password)
+        # Import tardif: app.services importe la façade, qui importe User
+        from app.services.passwords import password_hasher
+
+        self.password = password_hasher.hash(password)
 
     def check_password(self, password):
         """Vérifie si le mot de passe correspond"""
-        return check_password_hash(self.password, password)
+        from app.services.passwords import password_hasher
+
+        return password_hasher.verify(self.password, password)
 
     def to_dict(self):
         """
@@ -1,5 +1,8 @@
+import logging
 from abc import ABC, abstractmethod
 
+logger = logging.getLogger(__name__)
+
 
 class Repository(ABC):
     @abstractmethod
@@ -33,16 +36,16 @@ class InMemoryRepository(Repository):
         self.model_class = model_class
 
     def add(self, obj):
-        print(f"Ajout de l'objet {obj.id} : {obj}")
+        logger.debug("Ajout de l'objet %s", obj.id)
         self._storage[obj.id] = obj
 
     def get(self, obj_id):
         obj = self._storage.get(obj_id)
-        print(f"Récupération de l'objet {obj_id} : {obj}")
+        logger.debug("Récupération de l'objet %s", obj_id)
         return obj
 
     def get_all(self):
-        print(f"Récupération de tous les objets")
+        logger.debug("Récupération de tous les objets")
         return list(self._storage.values())
 
     def update(self, obj_id, data):
@@ -51,19 +54,19 @@ class InMemoryRepository(Repository):
             for key, value in data.items():
                 if hasattr(obj, key):
                     setattr(obj, key, value)
-            print(f"Mise à jour de l'objet {obj_id} : {obj}")
+            logger.debug("Mise à jour de l'objet %s", obj_id)
         else:
             raise ValueError(f"Object with ID {obj_id} not found")
 
     def delete(self, obj_id):
         if obj_id in self._storage:
             del self._storage[obj_id]
-            print(f"Suppression de l'objet {obj_id}")
+            logger.debug("Suppression de l'objet %s", obj_id)
         else:
             raise ValueError(f"Object with ID {obj_id} not found")
 
     def get_by_attribute(self, attr_name, attr_value):
-        print(f"Récupération de l'objet avec {attr_name} = {attr_value}")
+        logger.debug("Récupération de l'objet par %s", attr_name)
         return next(
             (
                 obj
@@ -1,5 +1,17 @@
 """Services module initialization."""
 
-from app.services.facade import HBnBFacade, facade
+from app.services.facade import (
+    ConflictError,
+    ForbiddenError,
+    HBnBFacade,
+    NotFoundError,
+    facade,
+)
 
-__all__ = ["HBnBFacade", "facade"]
+__all__ = [
+    "ConflictError",
+    "ForbiddenError",
+    "HBnBFacade",
+    "NotFoundError",
+    "facade",
+]
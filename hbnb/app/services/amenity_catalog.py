@@ -0,0 +1,143 @@
+"""Versioned in-memory copy of the amenity catalog."""
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app.db import db
+from app.models.amenity import Amenity
+from app.models.catalog_version import CatalogVersion
+
+CATALOG_NAME = "amenities"
+
+# Workers compare their copy with the stored version at most this
+# often, so a write made elsewhere shows up within this many seconds
+CATALOG_CHECK_SECONDS = 2
+
+# session.info flag set by the writes of the current transaction
+_PENDING = "amenity_catalog_pending"
+
+
+class CatalogSnapshot:
+    """
+    The amenities of one catalog version, in (created_at, id) order,
+    as column values, as serialized dicts and as one JSON document.
+    Never mutated: a new version gets a new snapshot.
+    """
+
+    def __init__(self, version: int, rows: List[Dict[str, Any]]):
+        self.version = version
+        self.items = tuple(rows)
+        self.by_id = {item["id"]: item for item in self.items}
+        self.keys = [(item["created_at"], item["id"]) for item in self.items]
+        self.serialized = {
+            item["id"]: {
+                "id": item["id"],
+                "name": item["name"],
+                "created_at": item["created_at"].isoformat(),
+                "updated_at": item["updated_at"].isoformat(),
+            }
+            for item in self.items
+        }
+        self.json = json.dumps(
+            [self.serialized[item["id"]] for item in self.items]
+        )
+        self._rendered: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def rendered(self, name: str, render: Callable[[], Any]) -> Any:
+        """Build a representation of this version once, then reuse it"""
+        with self._lock:
+            if name not in self._rendered:
+                self._rendered[name] = render()
+            return self._rendered[name]
+
+
+class AmenityCatalog:
+    """
+    Process-wide amenity catalog. Reads are served from memory; at most
+    every check_interval seconds one primary key lookup on
+    catalog_versions tells whether another worker changed it.
+    """
+
+    def __init__(self, check_interval: float = CATALOG_CHECK_SECONDS):
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at: Optional[float] = None
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog, reloaded when the stored version moved"""
+        if db.session.info.get(_PENDING):
+            # Uncommitted amenity writes are only visible to this session
+            return self._load(self._stored_version())
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._snapshot is not None
+                and self._checked_at is not None
+                and now - self._checked_at < self.check_interval
+            ):
+                return self._snapshot
+            # Version first: rows read after it are at least as recent
+            version = self._stored_version()
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._load(version)
+            self._checked_at = now
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Check the stored version on the next read"""
+        with self._lock:
+            self._checked_at = None
+
+    def reset(self) -> None:
+        """Forget the catalog, e.g. when the database changes"""
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = None
+
+    def bump(self) -> None:
+        """Advance the version inside the caller's transaction"""
+        result = db.session.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.name == CATALOG_NAME)
+            .values(version=CatalogVersion.version + 1)
+        )
+        if not result.rowcount:
+            db.session.add(CatalogVersion(name=CATALOG_NAME, version=1))
+        db.session.info[_PENDING] = True
+
+    @staticmethod
+    def _stored_version() -> int:
+        version = (
+            db.session.query(CatalogVersion.version)
+            .filter(CatalogVersion.name == CATALOG_NAME)
+            .scalar()
+        )
+        return version or 0
+
+    @staticmethod
+    def _load(version: int) -> CatalogSnapshot:
+        rows = db.session.query(
+            Amenity.id, Amenity.name, Amenity.created_at, Amenity.updated_at
+        ).order_by(Amenity.created_at, Amenity.id)
+        return CatalogSnapshot(version, [dict(row._mapping) for row in rows])
+
+
+# Create singleton instance
+amenity_catalog = AmenityCatalog()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_catalog(session):
+    """Committed amenity writes: reload on the next read"""
+    if session.info.pop(_PENDING, None):
+        amenity_catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,129 @@
+"""In-process inverted index from amenity to the places offering it."""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+from app.db import db
+from app.models.association_tables import place_amenities
+from app.models.place import Place
+
+# Rebuild from the database at least this often, so writes made by
+# other worker processes are picked up
+INDEX_MAX_AGE_SECONDS = 60
+
+
+class AmenityIndex:
+    """
+    Maps each amenity id to the set of place ids offering it.
+    AND / OR / NOT amenity filters are answered with set intersections,
+    unions and differences in memory instead of correlated EXISTS
+    subqueries. Built lazily from place_amenities and kept current by
+    the facade write paths once their transaction commits.
+    """
+
+    def __init__(self, max_age: float = INDEX_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self._places: Set[str] = set()
+        self._by_amenity: Dict[str, Set[str]] = {}
+
+    def _ensure_built(self) -> None:
+        """(Re)build the index when missing or older than max_age"""
+        with self._lock:
+            if (
+                self._built_at is not None
+                and time.monotonic() - self._built_at < self.max_age
+            ):
+                return
+            places = {place_id for (place_id,) in db.session.query(Place.id)}
+            by_amenity: Dict[str, Set[str]] = {}
+            links = db.session.query(
+                place_amenities.c.place_id, place_amenities.c.amenity_id
+            )
+            for place_id, amenity_id in links:
+                by_amenity.setdefault(str(amenity_id), set()).add(
+                    str(place_id)
+                )
+            self._places, self._by_amenity = places, by_amenity
+            self._built_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the index; the next query rebuilds it"""
+        with self._lock:
+            self._built_at = None
+
+    # Maintenance, called after commit. Updates to an index that is not
+    # built yet are skipped: the next build reads them from the database.
+    def add_place(self, place_id: str, amenity_ids: Iterable[str] = ()):
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._places.add(place_id)
+            for amenity_id in amenity_ids:
+                self._by_amenity.setdefault(amenity_id, set()).add(place_id)
+
+    def set_place_amenities(self, place_id: str, amenity_ids: Iterable[str]):
+        with self._lock:
+            if self._built_at is None:
+                return
+            for places in self._by_amenity.values():
+                places.discard(place_id)
+            self.add_place(place_id, amenity_ids)
+
+    def remove_place(self, place_id: str) -> None:
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._places.discard(place_id)
+            for places in self._by_amenity.values():
+                places.discard(place_id)
+
+    def link(self, place_id: str, amenity_id: str) -> None:
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._by_amenity.setdefault(amenity_id, set()).add(place_id)
+
+    def unlink(self, place_id: str, amenity_id: str) -> None:
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._by_amenity.get(amenity_id, set()).discard(place_id)
+
+    def remove_amenity(self, amenity_id: str) -> None:
+        with self._lock:
+            self._by_amenity.pop(amenity_id, None)
+
+    # Queries
+    def match(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = (),
+    ) -> Set[str]:
+        """Place ids having every `all_of`, one of `any_of`, no `none_of`"""
+        self._ensure_built()
+        with self._lock:
+            empty: Set[str] = set()
+            all_of, any_of, none_of = list(all_of), list(any_of), set(none_of)
+            if all_of:
+                sets = sorted(
+                    (self._by_amenity.get(a, empty) for a in all_of), key=len
+                )
+                result = set(sets[0]).intersection(*sets[1:])
+            else:
+                result = set(self._places)
+            if any_of:
+                result &= empty.union(
+                    *(self._by_amenity.get(a, empty) for a in any_of)
+                )
+            if none_of:
+                result -= empty.union(
+                    *(self._by_amenity.get(a, empty) for a in none_of)
+                )
+            return result
+
+
+# Create singleton instance
+amenity_index = AmenityIndex()
@@ -0,0 +1,162 @@
+"""Read-through cache of entity rows used by the facade getters."""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from prometheus_client import Counter
+from app import metrics
+
+try:
+    import redis
+except ImportError:  # optional shared backend
+    redis = None
+
+# Defaults, overridden by ENTITY_CACHE_SIZE / ENTITY_CACHE_TTL
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 60
+
+cache_hits = Counter(
+    "hbnb_entity_cache_hits",
+    "Entity lookups served from the cache",
+    ["table"],
+    registry=metrics.registry,
+)
+cache_misses = Counter(
+    "hbnb_entity_cache_misses",
+    "Entity lookups that went to the database",
+    ["table"],
+    registry=metrics.registry,
+)
+
+Key = Tuple[str, str]
+
+
+class LRUCache:
+    """In-process LRU mapping with a per-entry time to live"""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Key, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Key) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Key, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[Key]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self, table: Optional[str] = None) -> None:
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == table]:
+                del self._entries[key]
+
+
+class RedisCache:
+    """Shared backend, so every worker sees the same invalidations"""
+
+    def __init__(
+        self, url: str, ttl: float = DEFAULT_CACHE_TTL, prefix="hbnb:entity"
+    ):
+        if redis is None:
+            raise RuntimeError("ENTITY_CACHE_URL requires the redis package")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _name(self, key: Key) -> str:
+        return f"{self.prefix}:{key[0]}:{key[1]}"
+
+    def get(self, key: Key) -> Optional[Any]:
+        raw = self.client.get(self._name(key))
+        return None if raw is None else pickle.loads(raw)
+
+    def set(self, key: Key, value: Any) -> None:
+        self.client.set(
+            self._name(key), pickle.dumps(value), ex=max(1, int(self.ttl))
+        )
+
+    def delete(self, keys: Iterable[Key]) -> None:
+        names = [self._name(key) for key in keys]
+        if names:
+            self.client.delete(*names)
+
+    def clear(self, table: Optional[str] = None) -> None:
+        pattern = f"{self.prefix}:{table or '*'}:*"
+        names = list(self.client.scan_iter(match=pattern))
+        if names:
+            self.client.delete(*names)
+
+
+class EntityCache:
+    """
+    Column values of rows keyed by (table, id), in front of a backend.
+    Values are plain dicts so they can be shared across sessions and
+    processes; the facade turns them back into session instances.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUCache()
+        self.enabled = True
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Pick the backend and bounds from the Flask configuration"""
+        self.enabled = config.get("ENTITY_CACHE_ENABLED", True)
+        ttl = config.get("ENTITY_CACHE_TTL", DEFAULT_CACHE_TTL)
+        if config.get("ENTITY_CACHE_URL"):
+            self.backend = RedisCache(config["ENTITY_CACHE_URL"], ttl)
+        else:
+            self.backend = LRUCache(
+                config.get("ENTITY_CACHE_SIZE", DEFAULT_CACHE_SIZE), ttl
+            )
+
+    def get(self, table: str, entity_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        values = self.backend.get((table, entity_id))
+        if values is None:
+            cache_misses.labels(table).inc()
+            return None
+        cache_hits.labels(table).inc()
+        return dict(values)
+
+    def set(self, table: str, entity_id: str, values: Dict[str, Any]):
+        if self.enabled:
+            self.backend.set((table, entity_id), values)
+
+    def evict(self, keys: Iterable[Key]) -> None:
+        self.backend.delete(keys)
+
+    def clear(self, table: Optional[str] = None) -> None:
+        self.backend.clear(table)
+
+
+# Create singleton instance
+entity_cache = EntityCache()
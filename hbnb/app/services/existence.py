@@ -0,0 +1,160 @@
+"""Answers for identifiers that do not exist, without a database query."""
+
+import hashlib
+import math
+import threading
+from typing import Any, Dict, Iterable, Tuple
+from prometheus_client import Counter
+from app import metrics
+from app.db import db
+from app.services.cache import LRUCache, RedisCache
+
+# Defaults, overridden by NEGATIVE_CACHE_SIZE / NEGATIVE_CACHE_TTL
+DEFAULT_NEGATIVE_CACHE_SIZE = 50000
+DEFAULT_NEGATIVE_CACHE_TTL = 30
+
+# Bloom filter bounds, overridden by EXISTENCE_BLOOM_*
+DEFAULT_BLOOM_CAPACITY = 100000
+DEFAULT_BLOOM_ERROR_RATE = 0.01
+
+negative_hits = Counter(
+    "hbnb_negative_lookups",
+    "Lookups of unknown identifiers answered without the database",
+    ["table", "source"],
+    registry=metrics.registry,
+)
+
+Key = Tuple[str, str]
+
+
+class BloomFilter:
+    """
+    Set of strings answering "maybe present" or "surely absent".
+    Members cannot be removed; deleted ones stay "maybe present".
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # Double hashing: k positions out of one 128 bit digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + i * step) % self.size for i in range(self.hashes)
+        )
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class ExistenceFilter:
+    """
+    Negative cache of identifiers recently looked up in vain, keyed by
+    (table, id), and optionally one Bloom filter of the existing
+    identifiers per table. Both are fed by the facade writes.
+
+    The Bloom filters live in each process: only enable them when a
+    single process creates rows, or a row created by another worker
+    would be reported missing until the next restart.
+    """
+
+    def __init__(self):
+        self.misses = LRUCache(
+            DEFAULT_NEGATIVE_CACHE_SIZE, DEFAULT_NEGATIVE_CACHE_TTL
+        )
+        self.enabled = True
+        self.bloom_enabled = False
+        self.bloom_capacity = DEFAULT_BLOOM_CAPACITY
+        self.bloom_error_rate = DEFAULT_BLOOM_ERROR_RATE
+        self._blooms: Dict[str, BloomFilter] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Pick the backend and bounds from the Flask configuration"""
+        self.enabled = config.get("NEGATIVE_CACHE_ENABLED", True)
+        ttl = config.get("NEGATIVE_CACHE_TTL", DEFAULT_NEGATIVE_CACHE_TTL)
+        if config.get("NEGATIVE_CACHE_URL"):
+            self.misses = RedisCache(
+                config["NEGATIVE_CACHE_URL"], ttl, prefix="hbnb:missing"
+            )
+        else:
+            self.misses = LRUCache(
+                config.get("NEGATIVE_CACHE_SIZE", DEFAULT_NEGATIVE_CACHE_SIZE),
+                ttl,
+            )
+        self.bloom_enabled = config.get("EXISTENCE_BLOOM_ENABLED", False)
+        self.bloom_capacity = config.get(
+            "EXISTENCE_BLOOM_CAPACITY", DEFAULT_BLOOM_CAPACITY
+        )
+        self.bloom_error_rate = config.get(
+            "EXISTENCE_BLOOM_ERROR_RATE", DEFAULT_BLOOM_ERROR_RATE
+        )
+        with self._lock:
+            self._blooms = {}
+
+    def build(self, models: Iterable[Any]) -> None:
+        """Load the identifiers of every model into its Bloom filter"""
+        if not self.bloom_enabled:
+            return
+        blooms = {}
+        for model in models:
+            ids = [row_id for (row_id,) in db.session.query(model.id)]
+            # Room to grow before the error rate degrades
+            bloom = BloomFilter(
+                max(self.bloom_capacity, 2 * len(ids)), self.bloom_error_rate
+            )
+            for row_id in ids:
+                bloom.add(row_id)
+            blooms[model.__tablename__] = bloom
+        with self._lock:
+            self._blooms = blooms
+
+    def missing(self, table: str, entity_id: str) -> bool:
+        """True when `entity_id` is known not to exist in `table`"""
+        if not self.enabled:
+            return False
+        bloom = self._blooms.get(table)
+        if bloom is not None and entity_id not in bloom:
+            negative_hits.labels(table, "bloom").inc()
+            return True
+        if self.misses.get((table, entity_id)) is not None:
+            negative_hits.labels(table, "cache").inc()
+            return True
+        return False
+
+    def record_miss(self, table: str, entity_id: str) -> None:
+        if self.enabled:
+            self.misses.set((table, entity_id), True)
+
+    def added(self, keys: Iterable[Key]) -> None:
+        """New rows: findable from now on"""
+        keys = list(keys)
+        for table, entity_id in keys:
+            bloom = self._blooms.get(table)
+            if bloom is not None:
+                with self._lock:
+                    bloom.add(entity_id)
+        self.misses.delete(keys)
+
+    def removed(self, keys: Iterable[Key]) -> None:
+        """Deleted rows: answered as missing until the entry expires"""
+        for table, entity_id in keys:
+            self.record_miss(table, entity_id)
+
+
+# Create singleton instance
+existence_filter = ExistenceFilter()
@@ -1,13 +1,185 @@
 """Complete Facade service implementation."""
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_, func
+import base64
+import binascii
+import bisect
+import heapq
+import json
+import uuid
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from typing import Callable, Optional, List, Dict, Any, Tuple, Iterator
+from typing import Union
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import and_, or_, func, case, select, event, inspect, DateTime
+from sqlalchemy import bindparam, delete, insert, literal, tuple_, update
+from sqlalchemy import ColumnElement, Delete
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import (
+    Session,
+    joinedload,
+    lazyload,
+    make_transient_to_detached,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 from app.models.user import User
+from app.models.admin_stat import AdminStat
 from app.models.amenity import Amenity
+from app.models.association_tables import place_amenities
 from app.models.place import Place
+from app.models.place_fts import match_places
 from app.models.review import Review
 from app.db import db
+from app.geo import covering_cells, encode_geohash, haversine_km
+from app.services.amenity_catalog import CatalogSnapshot, amenity_catalog
+from app.services.amenity_index import amenity_index
+from app.services.cache import entity_cache
+from app.services.existence import existence_filter
+from app.services.passwords import PasswordHasherBusy, password_hasher
+from app.services.periodic import PeriodicJob
+from app.services.response_cache import response_cache
+from app.services.token_versions import token_versions
+from app.services.unit_of_work import in_unit_of_work, mark_failed
+
+# Keyset pagination bounds shared by every list endpoint
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Rows fetched per round trip when streaming a whole collection
+STREAM_BATCH_SIZE = 500
+
+# Nearby search bounds
+NEARBY_DEFAULT_RADIUS_KM = 10.0
+NEARBY_MAX_RADIUS_KM = 500.0
+NEARBY_DEFAULT_K = 20
+NEARBY_MAX_K = 100
+
+# Relationship loading profiles accepted by get_place
+PLACE_LOAD_PROFILES = ("none", "amenities", "detail")
+
+# Tables whose updated_at drives the conditional GETs
+VERSIONED_MODELS = {
+    model.__tablename__: model for model in (User, Place, Review, Amenity)
+}
+
+# A user id, or the JWT identity claims issued by token_claims
+Identity = Union[str, Dict[str, Any]]
+
+
+# Counters of admin_stats, shifted by the write paths
+ADMIN_STATS = ("users", "places", "reviews", "amenities", "rating_sum")
+# Seconds between two background recounts of admin_stats, which catch
+# rows written outside the facade (0 leaves it to the CLI command)
+ADMIN_STATS_RECONCILE_INTERVAL = 3600
+
+# Bulk create endpoints: rows per INSERT (and per transaction), and
+# items accepted by one request
+BULK_BATCH_SIZE = 500
+BULK_MAX_ITEMS = 10000
+
+# Amenity link changes accepted by set_place_amenities, and links per
+# INSERT statement
+AMENITY_LINK_MODES = ("add", "remove", "replace")
+LINK_BATCH_SIZE = 1000
+
+# Above this many matches the amenity filter is left to the database,
+# where a correlated EXISTS beats shipping a huge IN list
+AMENITY_INDEX_MAX_IDS = 5000
+
+
+class NotFoundError(ValueError):
+    """A row the operation refers to does not exist"""
+
+
+class ConflictError(ValueError):
+    """The row changed since the version the caller based its write on"""
+
+
+class ForbiddenError(ValueError):
+    """The row belongs to another user than the caller"""
+
+
+# Fields a place owner may change through update_place_if_owner
+PLACE_EDITABLE_FIELDS = ("title", "description", "price", "latitude",
+                         "longitude")
+# Fields a review author may change through update_review_if_author
+REVIEW_EDITABLE_FIELDS = ("text", "rating")
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    """Run the callbacks queued by the facade once data is durable"""
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session):
+    """Rolled back work must not reach the in-memory structures"""
+    session.info.pop("after_commit", None)
+    session.info.pop("cache_evict", None)
+
+
+def _evict_entities(session, keys):
+    """
+    Drop (table, id) keys from the entity cache right away, and again
+    at commit in case a concurrent reader put the old row back.
+    """
+    entity_cache.evict(keys)
+    session.info.setdefault("cache_evict", set()).update(keys)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_cache_evictions(session, flush_context):
+    """Rows changed or deleted by the unit of work leave the cache"""
+    cached = tuple(VERSIONED_MODELS.values())
+    keys = {
+        (obj.__tablename__, obj.id)
+        for obj in [*session.dirty, *session.deleted]
+        if isinstance(obj, cached)
+    }
+    if keys:
+        _evict_entities(session, keys)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_existence(session, flush_context):
+    """
+    Inserted rows become findable as soon as they are flushed; deleted
+    ones are answered as missing once the delete is committed.
+    """
+    cached = tuple(VERSIONED_MODELS.values())
+    added = {
+        (obj.__tablename__, obj.id)
+        for obj in session.new
+        if isinstance(obj, cached)
+    }
+    removed = {
+        (obj.__tablename__, obj.id)
+        for obj in session.deleted
+        if isinstance(obj, cached)
+    }
+    if added:
+        existence_filter.added(added)
+    if added or removed:
+
+        def settle():
+            # Again at commit, past readers that missed the new rows
+            existence_filter.added(added)
+            existence_filter.removed(removed)
+
+        session.info.setdefault("after_commit", []).append(settle)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session):
+    """Second eviction once the new rows are visible to everyone"""
+    keys = session.info.pop("cache_evict", None)
+    if keys:
+        entity_cache.evict(keys)
 
 
 class HBnBFacade:
@@ -22,31 +194,482 @@ class HBnBFacade:
     def __init__(self):
         if not hasattr(self, "_initialized"):
             self._initialized = True
+        if not hasattr(self, "bulk_batch_size"):
+            self.bulk_batch_size = BULK_BATCH_SIZE
+        if not hasattr(self, "reconcile_job"):
+            self.reconcile_job = PeriodicJob(
+                "admin-stats-reconcile", self.reconcile_admin_stats
+            )
+
+    def init_app(self, app) -> None:
+        """
+        Configure the caches from the application settings, and start
+        the periodic recount of the admin statistics
+        """
+        entity_cache.configure(app.config)
+        response_cache.configure(app.config)
+        existence_filter.configure(app.config)
+        token_versions.configure(app.config)
+        password_hasher.configure(app.config)
+        existence_filter.build(VERSIONED_MODELS.values())
+        amenity_catalog.reset()
+        self.bulk_batch_size = app.config.get(
+            "BULK_BATCH_SIZE", BULK_BATCH_SIZE
+        )
+        self.reconcile_job.start(
+            app,
+            app.config.get(
+                "ADMIN_STATS_RECONCILE_INTERVAL",
+                ADMIN_STATS_RECONCILE_INTERVAL,
+            ),
+        )
 
     # Base CRUD operations
+    def _commit(self) -> None:
+        """Commit, unless an enclosing unit of work commits at its end"""
+        if not in_unit_of_work():
+            db.session.commit()
+
+    def _rollback(self) -> None:
+        """Roll back; an enclosing unit of work is lost as a whole"""
+        db.session.rollback()
+        mark_failed()
+
     def _add_and_commit(self, obj: Any) -> None:
         """Helper to add and commit with error handling"""
         try:
             db.session.add(obj)
-            db.session.commit()
+            self._commit()
         except SQLAlchemyError as e:
-            db.session.rollback()
+            self._rollback()
             raise ValueError(f"Database error: {str(e)}")
 
     def _delete_and_commit(self, obj: Any) -> bool:
         """Helper to delete and commit with error handling"""
         try:
             db.session.delete(obj)
-            db.session.commit()
+            self._commit()
             return True
         except SQLAlchemyError as e:
-            db.session.rollback()
+            self._rollback()
             raise ValueError(f"Database error: {str(e)}")
 
+    def _after_commit(self, callback: Callable[[], None]) -> None:
+        """Queue callback to run when the current transaction commits"""
+        db.session.info.setdefault("after_commit", []).append(callback)
+
+    def _get_for_write(self, model, entity_id: str):
+        """
+        Load an entity about to be modified from the database, never
+        from the entity cache: its version must be the row's current one.
+        """
+        if existence_filter.missing(model.__tablename__, entity_id):
+            return None
+        instance = db.session.get(model, entity_id, populate_existing=True)
+        if instance is None:
+            existence_filter.record_miss(model.__tablename__, entity_id)
+        return instance
+
+    def _check_version(self, instance: Any, version: Optional[int]) -> None:
+        """Refuse a write based on another version than the loaded one"""
+        if version is not None and instance.version != version:
+            self._evict(instance.__tablename__, instance.id)
+            raise ConflictError(
+                f"{type(instance).__name__} is at version "
+                f"{instance.version}, not {version}"
+            )
+
+    def _flush_versioned(self, instance: Any) -> None:
+        """
+        Flush the UPDATE of `instance`, which only matches the row at
+        the version it was loaded with (version_id_col) and bumps it.
+        A concurrent write in between raises ConflictError.
+        """
+        key = (instance.__tablename__, instance.id)
+        try:
+            db.session.flush()
+        except StaleDataError:
+            self._rollback()
+            # The loaded version may have come from a stale cache entry
+            self._evict(*key)
+            raise ConflictError(
+                f"{type(instance).__name__} was modified concurrently"
+            )
+
+    def _retry_stale(self, write: Callable[[], Any], version: Optional[int]):
+        """
+        Run a versioned write. Without an expected version, losing the
+        race to a concurrent write is no conflict for the caller: the
+        write runs once more on the new row, unless an enclosing unit of
+        work was lost with the rollback (the API decorator retries those).
+        """
+        try:
+            return write()
+        except ConflictError:
+            if version is not None or in_unit_of_work():
+                raise
+            return write()
+
+    def _emit(self, *tags: str) -> None:
+        """
+        Announce what a write changes, e.g. "places" or "place:<id>".
+        Cached responses tagged with it are dropped now and at commit.
+        """
+        response_cache.invalidate(tags)
+        self._after_commit(lambda: response_cache.invalidate(tags))
+
+    # Entity cache
+    def _get_cached(self, model, entity_id: str, options=None):
+        """
+        Get an entity by primary key: from the session when already
+        loaded, else from the entity cache, else from the database,
+        caching the row for the next requests. Identifiers known not
+        to exist are answered without a query.
+        """
+        if entity_id is None:
+            return None
+        identity = inspect(model).identity_key_from_primary_key([entity_id])
+        instance = db.session.identity_map.get(identity)
+        if instance is not None and not inspect(instance).expired:
+            return instance
+
+        table = model.__tablename__
+        if existence_filter.missing(table, entity_id):
+            return None
+        values = entity_cache.get(table, entity_id)
+        if values is not None:
+            return self._restore(model, values)
+
+        instance = db.session.get(model, entity_id, options=options)
+        if instance is None:
+            existence_filter.record_miss(table, entity_id)
+            return None
+        pending = db.session.info.get("cache_evict", ())
+        if (table, entity_id) not in pending:
+            entity_cache.set(
+                table,
+                entity_id,
+                {
+                    attr.key: getattr(instance, attr.key)
+                    for attr in inspect(model).column_attrs
+                },
+            )
+        return instance
+
+    @staticmethod
+    def _restore(model, values: Dict[str, Any]):
+        """
+        Attach a cached or returned row to the session without querying
+        it; an instance of it already in the session takes its values.
+        """
+        identity = inspect(model).identity_key_from_primary_key(
+            [values["id"]]
+        )
+        instance = db.session.identity_map.get(identity)
+        if instance is not None:
+            for key, value in values.items():
+                set_committed_value(instance, key, value)
+            return instance
+        instance = inspect(model).class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        return db.session.merge(instance, load=False)
+
+    def _evict(self, table: str, *entity_ids: str) -> None:
+        """Uncache rows written by statements bypassing the unit of work"""
+        _evict_entities(db.session, {(table, eid) for eid in entity_ids})
+
+    def _evict_table(self, table: str) -> None:
+        """Uncache every row of a table after a bulk statement"""
+        entity_cache.clear(table)
+        self._after_commit(lambda: entity_cache.clear(table))
+
+    def _delete_where(self, target, criterion) -> int:
+        """
+        One set-based DELETE: the rows are neither loaded nor looked up
+        in the session. Returns the number of rows deleted.
+        """
+        return db.session.execute(
+            delete(target).where(criterion),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+
+    def _returning(self, statement, columns, key):
+        """
+        Run a single-row UPDATE or DELETE and return `columns` of the row
+        it hit (values after an UPDATE), or None when nothing matched.
+        Without RETURNING support the row is read by `key`: before a
+        DELETE, after an UPDATE.
+        """
+        dialect = db.session.get_bind().dialect
+        if isinstance(statement, Delete):
+            if dialect.delete_returning:
+                return db.session.execute(
+                    statement.returning(*columns)
+                ).first()
+            row = db.session.execute(select(*columns).where(key)).first()
+            if row is None or not db.session.execute(statement).rowcount:
+                return None
+            return row
+        if dialect.update_returning:
+            return db.session.execute(statement.returning(*columns)).first()
+        if not db.session.execute(statement).rowcount:
+            return None
+        return db.session.execute(select(*columns).where(key)).first()
+
+    def _locate(self, model, entity_id: str, *columns):
+        """
+        Probe a row a guarded statement did not match, by primary key:
+        `columns` and its version, or NotFoundError when it is missing.
+        """
+        row = db.session.execute(
+            select(*columns, model.version).where(model.id == entity_id)
+        ).first()
+        if row is None:
+            existence_filter.record_miss(model.__tablename__, entity_id)
+            raise NotFoundError(f"{model.__name__} not found")
+        return row
+
+    def _delete_places(self, criterion) -> Dict[str, int]:
+        """
+        Delete the places matching `criterion` with their reviews and
+        amenity links, one DELETE per table driven by a subquery, so
+        memory does not grow with the number of rows.
+        """
+        place_ids = select(Place.id).where(criterion)
+        reviews = self._delete_where(Review, Review.place_id.in_(place_ids))
+        if reviews:
+            # Review ids are not fetched, forget every cached review
+            self._evict_table("reviews")
+        return {
+            "place_amenities": self._delete_where(
+                place_amenities, place_amenities.c.place_id.in_(place_ids)
+            ),
+            "reviews": reviews,
+            "places": self._delete_where(Place, criterion),
+        }
+
+    # Keyset pagination
+    @staticmethod
+    def _encode_cursor(values: List[Any]) -> str:
+        """Encode the sort key of the last item into an opaque cursor"""
+        raw = json.dumps(
+            [v.isoformat() if isinstance(v, datetime) else v for v in values]
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, keys: List[Any]) -> List[Any]:
+        """Decode a cursor back into typed sort key values"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError
+            return [
+                datetime.fromisoformat(value)
+                if isinstance(key.type, DateTime)
+                else value
+                for key, value in zip(keys, values)
+            ]
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
+
+    def _paginate(
+        self,
+        query,
+        model,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        keys: Optional[List[Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return one page of `query` ordered by `keys`, which default to
+        (created_at, id) and must end with a unique column.
+        The filter on the last seen key lets the index seek straight to
+        the page instead of counting past an OFFSET.
+        With `fields`, only those columns are selected and items are
+        plain dicts instead of ORM instances.
+        """
+        keys = keys or [model.created_at, model.id]
+        query = self._after_cursor(
+            self._project(query, model, fields), keys, cursor
+        )
+        limit = DEFAULT_PAGE_SIZE if limit is None else limit
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        rows = query.add_columns(*keys).order_by(*keys).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(list(rows[-1][-len(keys):]))
+        if fields:
+            items = [dict(zip(fields, row)) for row in rows]
+        else:
+            items = [row[0] for row in rows]
+        return {"items": items, "next": next_cursor}
+
+    @staticmethod
+    def _project(query, model, fields: Optional[List[str]] = None):
+        """Restrict `query` to the `fields` columns of `model`"""
+        if not fields:
+            return query
+        HBnBFacade._check_fields(model, fields)
+        return query.with_entities(*[getattr(model, name) for name in fields])
+
+    @staticmethod
+    def _check_fields(model, fields: List[str]) -> None:
+        """Reject field names that are not columns of `model`"""
+        columns = model.__table__.columns
+        unknown = [name for name in fields if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    def _after_cursor(self, query, keys: List[Any], cursor: Optional[str]):
+        """Keep the rows sorting after the position encoded in `cursor`"""
+        if not cursor:
+            return query
+        values = self._decode_cursor(cursor, keys)
+        return query.filter(
+            or_(
+                *[
+                    and_(
+                        *[keys[j] == values[j] for j in range(i)],
+                        key > values[i],
+                    )
+                    for i, key in enumerate(keys)
+                ]
+            )
+        )
+
+    def _stream(
+        self,
+        query,
+        model,
+        cursor: Optional[str] = None,
+        keys: Optional[List[Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        Iterate over every row of `query` from `cursor` on, in the same
+        order as _paginate, fetching STREAM_BATCH_SIZE rows at a time.
+        The query is built here so bad fields or cursors raise before
+        the first row is sent.
+        """
+        keys = keys or [model.created_at, model.id]
+        query = self._after_cursor(
+            self._project(query, model, fields), keys, cursor
+        )
+        query = query.order_by(*keys).yield_per(STREAM_BATCH_SIZE)
+        if fields:
+            return (dict(zip(fields, row)) for row in query)
+        return iter(query)
+
+    def get_last_modified(
+        self, table: str, entity_id: str
+    ) -> Optional[datetime]:
+        """
+        Read updated_at of one row of `table` without loading the
+        entity, None when it does not exist.
+        """
+        row = self.get_row_version(table, entity_id)
+        return row[1] if row else None
+
+    def get_row_version(
+        self, table: str, entity_id: str
+    ) -> Optional[Tuple[int, datetime]]:
+        """
+        Read version and updated_at of one row of `table` without
+        loading the entity, None when it does not exist.
+        """
+        if existence_filter.missing(table, entity_id):
+            return None
+        model = VERSIONED_MODELS[table]
+        row = (
+            db.session.query(model.version, model.updated_at)
+            .filter(model.id == entity_id)
+            .first()
+        )
+        if row is None:
+            existence_filter.record_miss(table, entity_id)
+            return None
+        return row.version, row.updated_at
+
+    def get_collection_version(
+        self, table: str, **criteria
+    ) -> Tuple[Optional[datetime], int]:
+        """Newest updated_at and row count of `table` rows matching"""
+        model = VERSIONED_MODELS[table]
+        newest, count = (
+            db.session.query(func.max(model.updated_at), func.count(model.id))
+            .filter_by(**criteria)
+            .one()
+        )
+        return newest, count
+
+    # Authorization
+    def token_claims(self, user: User) -> Dict[str, Any]:
+        """JWT identity of `user`, checked by is_admin on each request"""
+        version = user.token_version or 0
+        token_versions.set(user.id, version)
+        return {
+            "id": str(user.id),
+            "is_admin": bool(user.is_admin),
+            "token_version": version,
+        }
+
+    def _current_token_version(self, user_id: str) -> Optional[int]:
+        """Stored token version of a user, None when the user is gone"""
+        version = token_versions.get(user_id)
+        if version is None:
+            version = (
+                db.session.query(User.token_version)
+                .filter(User.id == user_id)
+                .scalar()
+            )
+            if version is not None:
+                token_versions.set(user_id, version)
+        return version
+
+    def is_admin(self, identity: Identity) -> bool:
+        """
+        Whether `identity` has admin rights. Claims from token_claims
+        are trusted while their token version is current; a bare id,
+        older claims or stale ones are checked against the user row.
+        """
+        if not identity:
+            return False
+        if isinstance(identity, dict):
+            user_id = identity.get("id")
+            version = identity.get("token_version")
+            if version is not None:
+                current = self._current_token_version(user_id)
+                if current is None:
+                    return False
+                if current == version:
+                    return bool(identity.get("is_admin"))
+        else:
+            user_id = identity
+        user = self.get_user(user_id)
+        return bool(user and user.is_admin)
+
+    def _require_admin(self, identity: Identity) -> None:
+        if not self.is_admin(identity):
+            raise ValueError("Admin privileges required")
+
+    def _revoke_tokens(self, user: User) -> None:
+        """Invalidate the claims issued to `user` so far"""
+        user.token_version = User.token_version + 1
+        user_id = user.id
+        token_versions.forget(user_id)
+        self._after_commit(lambda: token_versions.forget(user_id))
+
     # User methods
     def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        return User.query.get(user_id)
+        return self._get_cached(User, user_id)
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -56,6 +679,23 @@ class HBnBFacade:
         """Get all users"""
         return User.query.all()
 
+    def list_users(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Get one page of users"""
+        return self._paginate(
+            User.query, User, limit, cursor, fields=fields
+        )
+
+    def stream_users(
+        self, cursor: Optional[str] = None, fields: Optional[List[str]] = None
+    ) -> Iterator[Any]:
+        """Iterate over all users without loading them at once"""
+        return self._stream(User.query, User, cursor, fields=fields)
+
     def create_user(self, user_data: dict) -> User:
         """Create new user with validation"""
         if self.get_user_by_email(user_data.get("email")):
@@ -63,18 +703,48 @@ class HBnBFacade:
         try:
             user = User(**user_data)
             user.validate()
+            db.session.add(user)
+            self._bump_stats(users=1)
             self._add_and_commit(user)
             return user
+        except PasswordHasherBusy:
+            self._rollback()
+            raise
         except (ValueError, SQLAlchemyError) as e:
+            self._rollback()
             raise ValueError(f"Error creating user: {str(e)}")
 
     def update_user(
-        self, user_id: str, user_data: dict, check_email: bool = True
+        self,
+        user_id: str,
+        user_data: dict,
+        check_email: bool = True,
+        version: Optional[int] = None,
     ) -> User:
-        """Update existing user"""
-        user = self.get_user(user_id)
+        """
+        Update existing user. With `version`, only if the user is still
+        at that version; ConflictError otherwise.
+        """
+        return self._retry_stale(
+            lambda: self._update_user(
+                user_id, dict(user_data), check_email, version
+            ),
+            version,
+        )
+
+    def _update_user(
+        self,
+        user_id: str,
+        user_data: dict,
+        check_email: bool,
+        version: Optional[int],
+    ) -> User:
+        user = self._get_for_write(User, user_id)
         if not user:
             raise ValueError("User not found")
+        self._check_version(user, version)
+        # The version only moves through _flush_versioned
+        user_data.pop("version", None)
 
         if check_email and "email" in user_data:
             existing_user = self.get_user_by_email(user_data["email"])
@@ -82,36 +752,154 @@ class HBnBFacade:
                 raise ValueError("Email already registered")
 
         try:
+            revoke = "password" in user_data or (
+                "is_admin" in user_data
+                and bool(user_data["is_admin"]) != bool(user.is_admin)
+            )
             for key, value in user_data.items():
                 if key == "password":
                     user.set_password(value)
                 else:
                     setattr(user, key, value)
             user.validate()
-            db.session.commit()
+            if revoke:
+                self._revoke_tokens(user)
+            self._flush_versioned(user)
+            self._commit()
             return user
+        except ConflictError:
+            raise
+        except PasswordHasherBusy:
+            self._rollback()
+            raise
         except (ValueError, SQLAlchemyError) as e:
-            db.session.rollback()
+            self._rollback()
             raise ValueError(f"Error updating user: {str(e)}")
 
-    def delete_user(self, user_id: str) -> bool:
-        """Delete user and all related data"""
+    def delete_user(self, user_id: str) -> Dict[str, int]:
+        """
+        Delete a user with their places, the reviews of those places,
+        their own reviews and the amenity links of their places, using
+        set-based DELETE statements. Returns the rows deleted per table,
+        or an empty dict when the user does not exist.
+        """
         user = self.get_user(user_id)
         if not user:
-            return False
-        return self._delete_and_commit(user)
+            return {}
+
+        owned = Place.owner_id == user_id
+        owned_ids = select(Place.id).where(owned)
+        owned_place_ids = list(db.session.scalars(owned_ids))
+        # Other places reviewed by the user lose those reviews
+        reviewed_place_ids = list(
+            db.session.scalars(
+                select(Review.place_id).where(
+                    Review.user_id == user_id,
+                    Review.place_id.not_in(owned_ids),
+                )
+            )
+        )
+        removed_rating = db.session.scalar(
+            select(func.coalesce(func.sum(Review.rating), 0)).where(
+                or_(Review.user_id == user_id, Review.place_id.in_(owned_ids))
+            )
+        )
+        try:
+            authored = self._delete_where(Review, Review.user_id == user_id)
+            if authored:
+                self._evict_table("reviews")
+            counts = self._delete_places(owned)
+            counts["reviews"] += authored
+            counts["users"] = self._delete_where(User, User.id == user_id)
+            db.session.expunge(user)
+
+            self._bump_stats(
+                users=-counts["users"],
+                places=-counts["places"],
+                reviews=-counts["reviews"],
+                rating_sum=-removed_rating,
+            )
+            self._evict("users", user_id)
+            self._evict("places", *owned_place_ids)
+            deleted = {("users", user_id)} | {
+                ("places", place_id) for place_id in owned_place_ids
+            }
+            self._after_commit(lambda: existence_filter.removed(deleted))
+            self._after_commit(amenity_index.invalidate)
+            self._after_commit(lambda: token_versions.forget(user_id))
+            self._emit(
+                "places",
+                *[f"place:{place_id}" for place_id in owned_place_ids],
+                *[
+                    f"reviews:{place_id}"
+                    for place_id in owned_place_ids + reviewed_place_ids
+                ],
+            )
+            if reviewed_place_ids:
+                self._refresh_rating_aggregates(
+                    Place.id.in_(reviewed_place_ids)
+                )
+            self._commit()
+            return counts
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        """Authenticate user and return user object if successful"""
+        """
+        Authenticate user and return user object if successful.
+        A password hashed with older parameters is hashed again.
+        """
         user = self.get_user_by_email(email)
-        if user and user.check_password(password):
-            return user
-        return None
+        if not user or not user.check_password(password):
+            return None
+        if password_hasher.needs_rehash(user.password):
+            try:
+                user.password = password_hasher.hash(password)
+                self._commit()
+            except SQLAlchemyError:
+                # The old hash still works, upgrade on a later login
+                self._rollback()
+        return user
 
     # Place methods
-    def get_place(self, place_id: str) -> Optional[Place]:
-        """Get place by ID"""
-        return Place.query.get(place_id)
+    @staticmethod
+    def _place_load_options(load: str) -> list:
+        """
+        Loader options for a place loading profile:
+        - none: the row only, relationships load on first access
+        - amenities: amenities fetched with one extra SELECT ... IN
+        - detail: reviews by SELECT ... IN, owner joined; amenities
+          come from the amenity catalog
+        """
+        if load == "none":
+            return [lazyload(Place.amenities), lazyload(Place.reviews)]
+        if load == "amenities":
+            return [selectinload(Place.amenities), lazyload(Place.reviews)]
+        if load == "detail":
+            return [
+                lazyload(Place.amenities),
+                selectinload(Place.reviews),
+                joinedload(Place.owner),
+            ]
+        raise ValueError(
+            f"Unknown loading profile, expected one of {PLACE_LOAD_PROFILES}"
+        )
+
+    def get_place(self, place_id: str, load: str = "none") -> Optional[Place]:
+        """
+        Get place by ID, eager loading what the `load` profile needs.
+        Only the bare row of the 'none' profile goes through the cache.
+        """
+        options = self._place_load_options(load)
+        if load == "none":
+            return self._get_cached(Place, place_id, options)
+        if existence_filter.missing("places", place_id):
+            return None
+        place = db.session.get(Place, place_id, options=options)
+        if place is None:
+            existence_filter.record_miss("places", place_id)
+        return place
 
     def get_user_places(self, user_id: str) -> List[Place]:
         """Get all places owned by user"""
@@ -119,17 +907,135 @@ class HBnBFacade:
 
     def get_all_places(self, filters: dict = None) -> List[Place]:
         """Get all places with optional filters"""
-        query = Place.query
-        if filters:
-            if "price_min" in filters:
-                query = query.filter(Place.price >= filters["price_min"])
-            if "price_max" in filters:
-                query = query.filter(Place.price <= filters["price_max"])
-            if "amenities" in filters:
-                query = query.filter(
-                    Place.amenities.any(Amenity.id.in_(filters["amenities"]))
+        return self.search_places(filters)
+
+    def list_places(
+        self,
+        filters: Dict[str, Any] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one page of places matching the search filters, by
+        relevance when searching text, else by creation date.
+        """
+        query, rank = self._filter_places(filters)
+        keys = [rank, Place.id] if rank is not None else None
+        return self._paginate(query, Place, limit, cursor, keys, fields)
+
+    def stream_places(
+        self,
+        filters: Dict[str, Any] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """Iterate over all places matching the search filters"""
+        query, rank = self._filter_places(filters)
+        keys = [rank, Place.id] if rank is not None else None
+        return self._stream(query, Place, cursor, keys, fields)
+
+    def _filter_places(self, filters: Dict[str, Any] = None):
+        """
+        Build the place query for the search filters:
+        q (full-text), price_min, price_max, rating_min and the amenity
+        filters amenities (any of), amenities_all and amenities_none.
+        Returns the query and the relevance rank column when q is set.
+        """
+        query, rank = Place.query, None
+        if not filters:
+            return query, rank
+
+        if filters.get("q"):
+            matches, rank = match_places(db.session, filters["q"])
+            query = query.join(matches, matches.c.place_id == Place.id)
+
+        if "price_min" in filters:
+            query = query.filter(Place.price >= filters["price_min"])
+        if "price_max" in filters:
+            query = query.filter(Place.price <= filters["price_max"])
+        if "rating_min" in filters:
+            query = query.filter(Place.rating_avg >= filters["rating_min"])
+
+        all_of = filters.get("amenities_all") or []
+        any_of = filters.get("amenities") or []
+        none_of = filters.get("amenities_none") or []
+        if all_of or any_of or none_of:
+            place_ids = amenity_index.match(all_of, any_of, none_of)
+            if len(place_ids) <= AMENITY_INDEX_MAX_IDS:
+                query = query.filter(Place.id.in_(place_ids))
+            else:
+                for amenity_id in all_of:
+                    query = query.filter(
+                        Place.amenities.any(Amenity.id == amenity_id)
+                    )
+                if any_of:
+                    query = query.filter(
+                        Place.amenities.any(Amenity.id.in_(any_of))
+                    )
+                if none_of:
+                    query = query.filter(
+                        ~Place.amenities.any(Amenity.id.in_(none_of))
+                    )
+        return query, rank
+
+    def get_places_nearby(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float = NEARBY_DEFAULT_RADIUS_KM,
+        k: int = NEARBY_DEFAULT_K,
+    ) -> List[Tuple[Place, float]]:
+        """
+        Get the k closest places within radius_km, nearest first.
+        Candidates come from an index range scan on the geohash cells
+        covering the circle; exact haversine distances then refine and
+        order them on (id, lat, lon) tuples before loading the winners.
+        """
+        if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+            raise ValueError("Invalid coordinates")
+        if not 0 < radius_km <= NEARBY_MAX_RADIUS_KM:
+            raise ValueError(
+                f"radius_km must be between 0 and {NEARBY_MAX_RADIUS_KM}"
+            )
+        if not 1 <= k <= NEARBY_MAX_K:
+            raise ValueError(f"k must be between 1 and {NEARBY_MAX_K}")
+
+        query = db.session.query(
+            Place.id, Place.latitude, Place.longitude
+        ).filter(Place.latitude.isnot(None), Place.longitude.isnot(None))
+        cells = covering_cells(lat, lon, radius_km)
+        if cells is not None:
+            query = query.filter(
+                or_(
+                    *[
+                        and_(Place.geohash >= cell, Place.geohash < cell + "~")
+                        for cell in cells
+                    ]
                 )
-        return query.all()
+            )
+
+        distances = (
+            (haversine_km(lat, lon, place_lat, place_lon), place_id)
+            for place_id, place_lat, place_lon in query
+        )
+        nearest = heapq.nsmallest(
+            k, (hit for hit in distances if hit[0] <= radius_km)
+        )
+        if not nearest:
+            return []
+
+        places = {
+            place.id: place
+            for place in Place.query.filter(
+                Place.id.in_([place_id for _, place_id in nearest])
+            )
+        }
+        return [
+            (places[place_id], distance)
+            for distance, place_id in nearest
+            if place_id in places
+        ]
 
     def create_place(self, place_data: dict, owner_id: str) -> Place:
         """Create new place"""
@@ -148,58 +1054,363 @@ class HBnBFacade:
             place = Place(**place_data)
             place.amenities = amenities
             place.validate()
-            self._add_and_commit(place)
+            amenity_ids = [amenity.id for amenity in amenities]
+            try:
+                db.session.add(place)
+                db.session.flush()
+                place_id = place.id
+                self._after_commit(
+                    lambda: amenity_index.add_place(place_id, amenity_ids)
+                )
+                self._emit("places")
+                self._bump_stats(places=1)
+                self._commit()
+            except SQLAlchemyError as e:
+                self._rollback()
+                raise ValueError(f"Database error: {str(e)}")
             return place
         except (ValueError, SQLAlchemyError) as e:
             raise ValueError(f"Error creating place: {str(e)}")
 
     def update_place(
-        self, place_id: str, place_data: dict, owner_id: str = None
+        self,
+        place_id: str,
+        place_data: dict,
+        owner_id: str = None,
+        version: Optional[int] = None,
     ) -> Place:
-        """Update place with owner verification"""
-        place = self.get_place(place_id)
+        """
+        Update place with owner verification. With `version`, only if
+        the place is still at that version; ConflictError otherwise.
+        """
+        return self._retry_stale(
+            lambda: self._update_place(
+                place_id, dict(place_data), owner_id, version
+            ),
+            version,
+        )
+
+    def _update_place(
+        self,
+        place_id: str,
+        place_data: dict,
+        owner_id: Optional[str],
+        version: Optional[int],
+    ) -> Place:
+        place = self._get_for_write(Place, place_id)
         if not place:
             raise ValueError("Place not found")
 
         if owner_id and str(place.owner_id) != str(owner_id):
             raise ValueError("Unauthorized: not the owner")
+        self._check_version(place, version)
+        place_data.pop("version", None)
 
         try:
             if "amenity_ids" in place_data:
-                amenities = [
-                    self.get_amenity(aid)
-                    for aid in place_data.pop("amenity_ids")
-                ]
-                if None in amenities:
+                amenity_ids = list(
+                    dict.fromkeys(place_data.pop("amenity_ids"))
+                )
+                catalog = self.get_amenity_catalog()
+                if any(aid not in catalog.by_id for aid in amenity_ids):
                     raise ValueError("One or more amenities not found")
-                place.amenities = amenities
+                self._delete_links([place_id], amenity_ids, keep=True)
+                self._insert_links([(place_id, aid) for aid in amenity_ids])
+                self._after_commit(
+                    lambda: amenity_index.set_place_amenities(
+                        place_id, amenity_ids
+                    )
+                )
+                # New links are a new version of the place as well
+                place.updated_at = datetime.now(timezone.utc)
 
             for key, value in place_data.items():
                 if hasattr(place, key):
                     setattr(place, key, value)
 
             place.validate()
-            db.session.commit()
+            self._flush_versioned(place)
+            self._emit("places", f"place:{place_id}")
+            self._commit()
             return place
+        except ConflictError:
+            raise
         except (ValueError, SQLAlchemyError) as e:
-            db.session.rollback()
+            self._rollback()
             raise ValueError(f"Error updating place: {str(e)}")
 
-    def delete_place(self, place_id: str, owner_id: str = None) -> bool:
-        """Delete place with owner verification"""
+    def delete_place(
+        self, place_id: str, owner_id: str = None
+    ) -> Dict[str, int]:
+        """
+        Delete a place with its reviews and amenity links (owner
+        verified when given), using set-based DELETE statements.
+        Returns the rows deleted per table, or an empty dict when the
+        place does not exist.
+        """
         place = self.get_place(place_id)
         if not place:
-            return False
+            return {}
 
         if owner_id and str(place.owner_id) != str(owner_id):
             raise ValueError("Unauthorized: not the owner")
 
-        return self._delete_and_commit(place)
+        try:
+            counts = self._delete_places(Place.id == place_id)
+            self._bump_stats(
+                places=-counts["places"],
+                reviews=-counts["reviews"],
+                rating_sum=-(place.rating_sum or 0),
+            )
+            db.session.expunge(place)
+            self._evict("places", place_id)
+            self._after_commit(
+                lambda: existence_filter.removed({("places", place_id)})
+            )
+            self._after_commit(lambda: amenity_index.remove_place(place_id))
+            self._emit("places", f"place:{place_id}", f"reviews:{place_id}")
+            self._commit()
+            return counts
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    def update_place_if_owner(
+        self,
+        place_id: str,
+        place_data: dict,
+        owner_id: str,
+        version: Optional[int] = None,
+    ) -> Place:
+        """
+        Update a place of `owner_id` without loading it: one UPDATE
+        guarded by id and owner (and `version` when given) returns the
+        new row. When it matches nothing, a primary key probe tells
+        NotFoundError, ForbiddenError and ConflictError apart.
+        """
+        if existence_filter.missing("places", place_id):
+            raise NotFoundError("Place not found")
+        values = {
+            key: value
+            for key, value in place_data.items()
+            if key in PLACE_EDITABLE_FIELDS
+        }
+        amenity_ids = place_data.get("amenity_ids")
+        try:
+            Place.validate(
+                SimpleNamespace(
+                    **{"title": "-", "price": 0, "latitude": None,
+                       "longitude": None, **values}
+                )
+            )
+            if amenity_ids is not None:
+                amenity_ids = list(dict.fromkeys(amenity_ids))
+                catalog = self.get_amenity_catalog()
+                if any(aid not in catalog.by_id for aid in amenity_ids):
+                    raise ValueError("One or more amenities not found")
+        except ValueError as e:
+            raise ValueError(f"Error updating place: {str(e)}")
+
+        # Core statements bypass the before_update geohash listener
+        coordinates = {"latitude", "longitude"} & values.keys()
+        if len(coordinates) == 2:
+            values["geohash"] = self._geohash(
+                values["latitude"], values["longitude"]
+            )
+
+        table = Place.__table__
+        criterion = and_(table.c.id == place_id, table.c.owner_id == owner_id)
+        if version is not None:
+            criterion = and_(criterion, table.c.version == version)
+        try:
+            row = self._returning(
+                update(table)
+                .where(criterion)
+                .values(version=table.c.version + 1, **values),
+                table.c,
+                table.c.id == place_id,
+            )
+            if row is None:
+                found = self._locate(Place, place_id, Place.owner_id)
+                if str(found.owner_id) != str(owner_id):
+                    raise ForbiddenError("Unauthorized: not the owner")
+                raise ConflictError(
+                    f"Place is at version {found.version}, not {version}"
+                )
+
+            values = dict(row._mapping)
+            geohash = self._geohash(values["latitude"], values["longitude"])
+            if coordinates and geohash != values["geohash"]:
+                # Only one coordinate was sent, the cell needs both
+                db.session.execute(
+                    update(table)
+                    .where(table.c.id == place_id)
+                    .values(geohash=geohash, updated_at=values["updated_at"])
+                )
+                values["geohash"] = geohash
+            if amenity_ids is not None:
+                self._delete_links([place_id], amenity_ids, keep=True)
+                self._insert_links([(place_id, aid) for aid in amenity_ids])
+                self._after_commit(
+                    lambda: amenity_index.set_place_amenities(
+                        place_id, amenity_ids
+                    )
+                )
+            self._evict("places", place_id)
+            self._emit("places", f"place:{place_id}")
+            self._commit()
+            return self._restore(Place, values)
+        except (NotFoundError, ForbiddenError, ConflictError):
+            raise
+        except (ValueError, SQLAlchemyError) as e:
+            self._rollback()
+            raise ValueError(f"Error updating place: {str(e)}")
+
+    @staticmethod
+    def _geohash(latitude, longitude) -> Optional[str]:
+        """Geohash cell of a location, None without both coordinates"""
+        if latitude is None or longitude is None:
+            return None
+        return encode_geohash(latitude, longitude)
+
+    def delete_place_if_owner(
+        self, place_id: str, owner_id: str
+    ) -> Dict[str, int]:
+        """
+        Delete a place of `owner_id` with its reviews and amenity links,
+        set-based and guarded by id and owner, without loading it.
+        Returns the rows deleted per table; NotFoundError or
+        ForbiddenError when the place was not deleted.
+        """
+        if existence_filter.missing("places", place_id):
+            raise NotFoundError("Place not found")
+        guard = and_(Place.id == place_id, Place.owner_id == owner_id)
+        try:
+            # Read by the stats UPDATE itself, before the row is gone
+            self._bump_stats(
+                rating_sum=-func.coalesce(
+                    select(Place.rating_sum).where(guard).scalar_subquery(), 0
+                )
+            )
+            counts = self._delete_places(guard)
+            if not counts["places"]:
+                self._locate(Place, place_id)
+                raise ForbiddenError("Unauthorized: not the owner")
+            self._bump_stats(
+                places=-counts["places"], reviews=-counts["reviews"]
+            )
+            self._evict("places", place_id)
+            self._after_commit(
+                lambda: existence_filter.removed({("places", place_id)})
+            )
+            self._after_commit(lambda: amenity_index.remove_place(place_id))
+            self._emit("places", f"place:{place_id}", f"reviews:{place_id}")
+            self._commit()
+            return counts
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    # Rating aggregates
+    def _adjust_rating_aggregates(
+        self,
+        place_id: str,
+        removed: Optional[int] = None,
+        added: Optional[int] = None,
+    ) -> None:
+        """
+        Shift the stored rating aggregates of a place by one review.
+        Runs as a single relative UPDATE inside the caller's
+        transaction, so concurrent reviews never lose an increment.
+        """
+        if removed == added:
+            return
+
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+        new_count = Place.review_count + count_delta
+        values = {
+            Place.review_count: new_count,
+            Place.rating_sum: Place.rating_sum + sum_delta,
+            Place.rating_avg: case(
+                (
+                    new_count > 0,
+                    (Place.rating_sum + sum_delta) * 1.0 / new_count,
+                ),
+                else_=None,
+            ),
+        }
+        if removed is not None:
+            star = getattr(Place, f"stars_{removed}")
+            values[star] = star - 1
+        if added is not None:
+            star = getattr(Place, f"stars_{added}")
+            values[star] = star + 1
+
+        Place.query.filter(Place.id == place_id).update(
+            values, synchronize_session=False
+        )
+        self._evict("places", place_id)
+        self._bump_stats(reviews=count_delta, rating_sum=sum_delta)
+
+    def _refresh_rating_aggregates(self, criterion=None) -> int:
+        """Recompute rating aggregates from the reviews table"""
+
+        def per_place(expression, *criteria):
+            return (
+                select(expression)
+                .where(Review.place_id == Place.id, *criteria)
+                .scalar_subquery()
+            )
+
+        values = {
+            Place.review_count: per_place(func.count(Review.id)),
+            Place.rating_sum: per_place(
+                func.coalesce(func.sum(Review.rating), 0)
+            ),
+            Place.rating_avg: per_place(func.avg(Review.rating)),
+        }
+        for star in range(1, 6):
+            values[getattr(Place, f"stars_{star}")] = per_place(
+                func.count(Review.id), Review.rating == star
+            )
+
+        query = Place.query
+        if criterion is not None:
+            query = query.filter(criterion)
+        self._evict_table("places")
+        self._emit("places")
+        return query.update(values, synchronize_session=False)
 
     # Review methods
     def get_review(self, review_id: str) -> Optional[Review]:
         """Get review by ID"""
-        return Review.query.get(review_id)
+        return self._get_cached(Review, review_id)
+
+    def list_reviews(
+        self,
+        place_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Get one page of reviews, optionally for a single place"""
+        query = Review.query
+        if place_id:
+            query = query.filter_by(place_id=place_id)
+        return self._paginate(query, Review, limit, cursor, fields=fields)
+
+    def stream_reviews(
+        self,
+        place_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """Iterate over all reviews, optionally for a single place"""
+        query = Review.query
+        if place_id:
+            query = query.filter_by(place_id=place_id)
+        return self._stream(query, Review, cursor, fields=fields)
 
     def get_place_reviews(self, place_id: str) -> List[Review]:
         """Get all reviews for a place"""
@@ -210,167 +1421,571 @@ class HBnBFacade:
         return Review.query.filter_by(user_id=user_id).all()
 
     def create_review(self, review_data: dict, user_id: str) -> Review:
-        """Create review with validations"""
+        """
+        Create a review with a single INSERT ... SELECT from the place,
+        which only yields a row when the place exists, is not owned by
+        the reviewer and the reviewer exists; the unique constraint on
+        (user_id, place_id) refuses a second review. The place is only
+        probed again to tell why nothing was inserted.
+        Raises NotFoundError for an unknown place or user.
+        """
+        place_id = review_data.get("place_id")
+        if not place_id or existence_filter.missing("places", place_id):
+            raise NotFoundError("Place not found")
+        if existence_filter.missing("users", user_id):
+            raise NotFoundError("User not found")
         try:
-            place = self.get_place(review_data.get("place_id"))
-            if not place:
-                raise ValueError("Place not found")
-
-            if str(place.owner_id) == str(user_id):
-                raise ValueError("Cannot review your own place")
-
-            existing = Review.query.filter_by(
-                user_id=user_id, place_id=review_data["place_id"]
-            ).first()
-
-            if existing:
-                raise ValueError("Already reviewed this place")
-
             review_data["user_id"] = user_id
             review = Review(**review_data)
             review.validate()
-            self._add_and_commit(review)
-            return review
-        except (ValueError, SQLAlchemyError) as e:
+        except (ValueError, TypeError) as e:
             raise ValueError(f"Error creating review: {str(e)}")
 
+        row = self._new_row(review, Review)
+        columns = Review.__table__.c
+        source = select(
+            *(
+                Place.id
+                if key == "place_id"
+                else literal(value, columns[key].type)
+                for key, value in row.items()
+            )
+        ).where(
+            Place.id == place_id,
+            Place.owner_id != user_id,
+            # Foreign keys are not enforced by every database (SQLite)
+            select(User.id).where(User.id == user_id).exists(),
+        )
+        try:
+            inserted = db.session.execute(
+                insert(Review).from_select(list(row), source)
+            ).rowcount
+            if inserted:
+                self._adjust_rating_aggregates(place_id, added=review.rating)
+                keys = {("reviews", row["id"])}
+                self._after_commit(lambda: existence_filter.added(keys))
+                self._emit("places", f"reviews:{place_id}")
+                self._commit()
+        except IntegrityError as e:
+            self._rollback()
+            message = str(e.orig).lower()
+            if "unique" in message or "duplicate" in message:
+                raise ValueError("Already reviewed this place")
+            if "foreign key" in message:
+                raise NotFoundError("User not found")
+            raise ValueError(f"Database error: {str(e)}")
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+        if not inserted:
+            owner_id = db.session.execute(
+                select(Place.owner_id).where(Place.id == place_id)
+            ).scalar()
+            if owner_id is None:
+                existence_filter.record_miss("places", place_id)
+                raise NotFoundError("Place not found")
+            if str(owner_id) == str(user_id):
+                raise ValueError("Cannot review your own place")
+            existence_filter.record_miss("users", user_id)
+            raise NotFoundError("User not found")
+        return self._restore(Review, row)
+
     def update_review(
-        self, review_id: str, review_data: dict, user_id: str = None
+        self,
+        review_id: str,
+        review_data: dict,
+        user_id: str = None,
+        version: Optional[int] = None,
+    ) -> Review:
+        """
+        Update review with author verification. With `version`, only if
+        the review is still at that version; ConflictError otherwise.
+        """
+        return self._retry_stale(
+            lambda: self._update_review(
+                review_id, dict(review_data), user_id, version
+            ),
+            version,
+        )
+
+    def _update_review(
+        self,
+        review_id: str,
+        review_data: dict,
+        user_id: Optional[str],
+        version: Optional[int],
     ) -> Review:
-        """Update review with author verification"""
-        review = self.get_review(review_id)
+        review = self._get_for_write(Review, review_id)
         if not review:
             raise ValueError("Review not found")
 
         if user_id and str(review.user_id) != str(user_id):
             raise ValueError("Unauthorized: not the author")
+        self._check_version(review, version)
 
         try:
-            protected = ["place_id", "user_id"]
+            protected = ["place_id", "user_id", "version"]
             update_data = {
                 k: v for k, v in review_data.items() if k not in protected
             }
 
+            old_rating = review.rating
             for key, value in update_data.items():
                 setattr(review, key, value)
 
             review.validate()
-            db.session.commit()
+            self._flush_versioned(review)
+            self._adjust_rating_aggregates(
+                review.place_id, removed=old_rating, added=review.rating
+            )
+            self._emit("places", f"reviews:{review.place_id}")
+            self._commit()
             return review
+        except ConflictError:
+            raise
         except (ValueError, SQLAlchemyError) as e:
-            db.session.rollback()
+            self._rollback()
             raise ValueError(f"Error updating review: {str(e)}")
 
     def delete_review(self, review_id: str, user_id: str = None) -> bool:
         """Delete review with author verification"""
-        review = self.get_review(review_id)
+        review = self._get_for_write(Review, review_id)
         if not review:
             return False
 
         if user_id and str(review.user_id) != str(user_id):
             raise ValueError("Unauthorized: not the author")
 
-        return self._delete_and_commit(review)
+        try:
+            db.session.delete(review)
+            self._adjust_rating_aggregates(
+                review.place_id, removed=review.rating
+            )
+            self._emit("places", f"reviews:{review.place_id}")
+            self._commit()
+            return True
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    def update_review_if_author(
+        self,
+        review_id: str,
+        review_data: dict,
+        user_id: str,
+        version: Optional[int] = None,
+    ) -> Review:
+        """
+        Update a review of `user_id` without loading it: one UPDATE
+        guarded by id and author (and `version`, and `place_id` when
+        sent) returns the new row. A new rating also reads the old one,
+        under the same guard, to shift the place aggregates.
+        """
+        if existence_filter.missing("reviews", review_id):
+            raise NotFoundError("Review not found")
+        values = {
+            key: value
+            for key, value in review_data.items()
+            if key in REVIEW_EDITABLE_FIELDS
+        }
+        try:
+            Review.validate(
+                SimpleNamespace(**{"text": "-", "rating": 1, **values})
+            )
+        except ValueError as e:
+            raise ValueError(f"Error updating review: {str(e)}")
+
+        table = Review.__table__
+        criterion = and_(table.c.id == review_id, table.c.user_id == user_id)
+        if version is not None:
+            criterion = and_(criterion, table.c.version == version)
+        if "place_id" in review_data:
+            criterion = and_(
+                criterion, table.c.place_id == review_data["place_id"]
+            )
+        try:
+            old_rating = None
+            if "rating" in values:
+                old_rating = db.session.execute(
+                    select(table.c.rating).where(criterion).with_for_update()
+                ).scalar()
+            row = None
+            if old_rating is not None or "rating" not in values:
+                row = self._returning(
+                    update(table)
+                    .where(criterion)
+                    .values(version=table.c.version + 1, **values),
+                    table.c,
+                    table.c.id == review_id,
+                )
+            if row is None:
+                found = self._locate(
+                    Review, review_id, Review.user_id, Review.place_id
+                )
+                if str(found.user_id) != str(user_id):
+                    raise ForbiddenError("Unauthorized: not the author")
+                if found.place_id != review_data.get(
+                    "place_id", found.place_id
+                ):
+                    raise ValueError("Cannot change the place of a review")
+                raise ConflictError(
+                    f"Review is at version {found.version}, not {version}"
+                )
+
+            self._adjust_rating_aggregates(
+                row.place_id, removed=old_rating, added=values.get("rating")
+            )
+            self._evict("reviews", review_id)
+            self._emit("places", f"reviews:{row.place_id}")
+            self._commit()
+            return self._restore(Review, dict(row._mapping))
+        except (NotFoundError, ForbiddenError, ConflictError):
+            raise
+        except (ValueError, SQLAlchemyError) as e:
+            self._rollback()
+            raise ValueError(f"Error updating review: {str(e)}")
+
+    def delete_review_if_author(self, review_id: str, user_id: str) -> None:
+        """
+        Delete a review of `user_id` with one DELETE guarded by id and
+        author, returning what the place aggregates need. NotFoundError
+        or ForbiddenError when it matched nothing.
+        """
+        if existence_filter.missing("reviews", review_id):
+            raise NotFoundError("Review not found")
+        table = Review.__table__
+        try:
+            row = self._returning(
+                delete(table).where(
+                    table.c.id == review_id, table.c.user_id == user_id
+                ),
+                (table.c.place_id, table.c.rating),
+                table.c.id == review_id,
+            )
+            if row is None:
+                self._locate(Review, review_id)
+                raise ForbiddenError("Unauthorized: not the author")
+            self._adjust_rating_aggregates(row.place_id, removed=row.rating)
+            self._evict("reviews", review_id)
+            self._after_commit(
+                lambda: existence_filter.removed({("reviews", review_id)})
+            )
+            self._emit("places", f"reviews:{row.place_id}")
+            self._commit()
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
 
     # Amenity methods
     def get_amenity(self, amenity_id: str) -> Optional[Amenity]:
         """Get amenity by ID"""
-        return Amenity.query.get(amenity_id)
+        return self._get_cached(Amenity, amenity_id)
 
     def get_all_amenities(self) -> List[Amenity]:
         """Get all amenities"""
         return Amenity.query.all()
 
+    def get_amenity_catalog(self) -> CatalogSnapshot:
+        """Get the in-memory amenity catalog"""
+        return amenity_catalog.snapshot()
+
+    def list_amenities(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one page of amenities from the in-memory catalog, with the
+        same ordering and cursors as the database backed listings.
+        """
+        catalog = amenity_catalog.snapshot()
+        if fields:
+            self._check_fields(Amenity, fields)
+        limit = DEFAULT_PAGE_SIZE if limit is None else limit
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        start = 0
+        if cursor:
+            values = self._decode_cursor(
+                cursor, [Amenity.created_at, Amenity.id]
+            )
+            try:
+                start = bisect.bisect_right(catalog.keys, tuple(values))
+            except TypeError:
+                raise ValueError("Invalid cursor")
+
+        items = catalog.items[start:start + limit]
+        next_cursor = None
+        if start + limit < len(catalog.items):
+            last = items[-1]
+            next_cursor = self._encode_cursor(
+                [last["created_at"], last["id"]]
+            )
+        if fields:
+            items = [{name: item[name] for name in fields} for item in items]
+        else:
+            items = [dict(item) for item in items]
+        return {"items": items, "next": next_cursor}
+
     def create_amenity(self, amenity_data: dict) -> Amenity:
         """Create new amenity"""
         try:
             amenity = Amenity(**amenity_data)
             amenity.validate()
+            db.session.add(amenity)
+            amenity_catalog.bump()
+            self._emit("amenities")
+            self._bump_stats(amenities=1)
             self._add_and_commit(amenity)
             return amenity
         except (ValueError, SQLAlchemyError) as e:
+            self._rollback()
             raise ValueError(f"Error creating amenity: {str(e)}")
 
+    def update_amenity(self, amenity_id: str, amenity_data: dict) -> Amenity:
+        """Update an amenity"""
+        amenity = self._get_for_write(Amenity, amenity_id)
+        if not amenity:
+            raise ValueError("Amenity not found")
+
+        try:
+            for key, value in amenity_data.items():
+                setattr(amenity, key, value)
+            amenity.validate()
+            amenity_catalog.bump()
+            self._emit("amenities")
+            self._commit()
+            return amenity
+        except (ValueError, SQLAlchemyError) as e:
+            self._rollback()
+            raise ValueError(f"Error updating amenity: {str(e)}")
+
+    def delete_amenity(self, amenity_id: str) -> Dict[str, int]:
+        """
+        Delete an amenity and its links to places with set-based
+        DELETE statements. Returns the rows deleted per table, or an
+        empty dict when the amenity does not exist.
+        """
+        amenity = self.get_amenity(amenity_id)
+        if not amenity:
+            return {}
+
+        try:
+            counts = {
+                "place_amenities": self._delete_where(
+                    place_amenities,
+                    place_amenities.c.amenity_id == amenity_id,
+                ),
+                "amenities": self._delete_where(
+                    Amenity, Amenity.id == amenity_id
+                ),
+            }
+            db.session.expunge(amenity)
+            amenity_catalog.bump()
+            self._emit("amenities", "places")
+            self._bump_stats(amenities=-counts["amenities"])
+            self._evict("amenities", amenity_id)
+            self._after_commit(
+                lambda: existence_filter.removed({("amenities", amenity_id)})
+            )
+            self._after_commit(
+                lambda: amenity_index.remove_amenity(amenity_id)
+            )
+            self._commit()
+            return counts
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
     def add_place_amenity(
-        self, place_id: str, amenity_id: str, admin_id: str = None
+        self, place_id: str, amenity_id: str, admin_id: Identity = None
     ) -> bool:
         """Add amenity to place."""
+        if admin_id:
+            self._require_admin(admin_id)
         try:
-            if admin_id:
-                admin = self.get_user(admin_id)
-                if not admin or not admin.is_admin:
-                    raise ValueError("Admin privileges required")
-
-            place = self.get_place(place_id)
-            amenity = self.get_amenity(amenity_id)
-
-            if not place or not amenity:
-                raise ValueError("Place or amenity not found")
-
-            if amenity not in place.amenities:
-                place.amenities.append(amenity)
-                db.session.commit()
-            return True
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise ValueError(f"Error adding amenity to place: {str(e)}")
+            self.set_place_amenities([place_id], [amenity_id], "add")
+        except ValueError:
+            raise ValueError("Place or amenity not found")
+        return True
 
     def remove_place_amenity(
-        self, place_id: str, amenity_id: str, admin_id: str = None
+        self, place_id: str, amenity_id: str, admin_id: Identity = None
     ) -> bool:
         """Remove amenity from place."""
+        if admin_id:
+            self._require_admin(admin_id)
         try:
-            if admin_id:
-                admin = self.get_user(admin_id)
-                if not admin or not admin.is_admin:
-                    raise ValueError("Admin privileges required")
-
-            place = self.get_place(place_id)
-            amenity = self.get_amenity(amenity_id)
-
-            if not place or not amenity:
-                raise ValueError("Place or amenity not found")
+            self.set_place_amenities([place_id], [amenity_id], "remove")
+        except ValueError:
+            raise ValueError("Place or amenity not found")
+        return True
+
+    def set_place_amenities(
+        self,
+        place_ids: List[str],
+        amenity_ids: List[str],
+        mode: str = "add",
+        user: Identity = None,
+    ) -> Dict[str, int]:
+        """
+        Add, remove or replace (`mode`) a set of amenities on many
+        places with set-based statements on place_amenities, without
+        loading any collection. When `user` is given, every place must
+        be theirs unless they are an admin. Returns the number of
+        links added and removed.
+        """
+        if mode not in AMENITY_LINK_MODES:
+            raise ValueError(
+                f"Unknown mode, expected one of {AMENITY_LINK_MODES}"
+            )
+        place_ids = list(dict.fromkeys(place_ids))
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        catalog = self.get_amenity_catalog()
+        if any(aid not in catalog.by_id for aid in amenity_ids):
+            raise ValueError("One or more amenities not found")
+        owners = dict(
+            db.session.query(Place.id, Place.owner_id).filter(
+                Place.id.in_(place_ids)
+            )
+        )
+        if len(owners) != len(place_ids):
+            raise ValueError("One or more places not found")
+        if user is not None:
+            user_id = user.get("id") if isinstance(user, dict) else user
+            if any(
+                str(owner) != str(user_id) for owner in owners.values()
+            ) and not self.is_admin(user):
+                raise ValueError("Unauthorized: not the owner")
 
-            if amenity in place.amenities:
-                place.amenities.remove(amenity)
-                db.session.commit()
-            return True
+        try:
+            removed = 0
+            if mode == "remove":
+                removed = self._delete_links(place_ids, amenity_ids)
+            elif mode == "replace":
+                removed = self._delete_links(
+                    place_ids, amenity_ids, keep=True
+                )
+            added = 0
+            if mode != "remove":
+                added = self._insert_links(
+                    [(pid, aid) for pid in place_ids for aid in amenity_ids]
+                )
+            self._after_commit(
+                lambda: self._index_links(place_ids, amenity_ids, mode)
+            )
+            self._evict("places", *place_ids)
+            self._emit("places", *[f"place:{pid}" for pid in place_ids])
+            self._commit()
         except SQLAlchemyError as e:
-            db.session.rollback()
-            raise ValueError(f"Error removing amenity from place: {str(e)}")
+            self._rollback()
+            raise ValueError(f"Error updating place amenities: {str(e)}")
+        return {"added": added, "removed": removed}
+
+    @staticmethod
+    def _insert_links(pairs: List[Tuple[str, str]]) -> int:
+        """INSERT ... ON CONFLICT DO NOTHING of (place, amenity) links"""
+        dialect = db.session.get_bind().dialect.name
+        added = 0
+        for start in range(0, len(pairs), LINK_BATCH_SIZE):
+            rows = [
+                {"place_id": place_id, "amenity_id": amenity_id}
+                for place_id, amenity_id in pairs[
+                    start:start + LINK_BATCH_SIZE
+                ]
+            ]
+            if dialect == "sqlite":
+                statement = sqlite_insert(place_amenities).values(rows)
+            elif dialect == "postgresql":
+                statement = postgresql_insert(place_amenities).values(rows)
+            else:
+                # No portable upsert: leave out the links already there
+                existing = set(
+                    db.session.query(
+                        place_amenities.c.place_id,
+                        place_amenities.c.amenity_id,
+                    ).filter(
+                        tuple_(
+                            place_amenities.c.place_id,
+                            place_amenities.c.amenity_id,
+                        ).in_(pairs[start:start + LINK_BATCH_SIZE])
+                    )
+                )
+                rows = [
+                    row
+                    for row in rows
+                    if (row["place_id"], row["amenity_id"]) not in existing
+                ]
+                if rows:
+                    added += db.session.execute(
+                        insert(place_amenities).values(rows)
+                    ).rowcount
+                continue
+            added += db.session.execute(
+                statement.on_conflict_do_nothing()
+            ).rowcount
+        return added
+
+    @staticmethod
+    def _delete_links(
+        place_ids: List[str], amenity_ids: List[str], keep: bool = False
+    ) -> int:
+        """
+        DELETE the links of `place_ids` to `amenity_ids`, or with `keep`
+        to every amenity but those
+        """
+        in_set = place_amenities.c.amenity_id.in_(amenity_ids)
+        return db.session.execute(
+            delete(place_amenities).where(
+                place_amenities.c.place_id.in_(place_ids),
+                ~in_set if keep else in_set,
+            )
+        ).rowcount
+
+    @staticmethod
+    def _index_links(
+        place_ids: List[str], amenity_ids: List[str], mode: str
+    ) -> None:
+        """Replay a committed link change on the amenity index"""
+        for place_id in place_ids:
+            if mode == "replace":
+                amenity_index.set_place_amenities(place_id, amenity_ids)
+                continue
+            for amenity_id in amenity_ids:
+                if mode == "add":
+                    amenity_index.link(place_id, amenity_id)
+                else:
+                    amenity_index.unlink(place_id, amenity_id)
 
     def get_place_with_amenities(self, place_id: str) -> Dict[str, Any]:
         """Get place with all amenities."""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, load="detail")
         if not place:
             raise ValueError("Place not found")
 
+        # Amenities already serialized by the catalog: only the links
+        # are read from the database
+        catalog = amenity_catalog.snapshot()
+        links = db.session.query(place_amenities.c.amenity_id).filter(
+            place_amenities.c.place_id == place_id
+        )
+        amenities = [
+            catalog.serialized[str(amenity_id)]
+            for (amenity_id,) in links
+            if str(amenity_id) in catalog.serialized
+        ]
         return {
-            **place.to_dict(),
-            "amenities": [amenity.to_dict() for amenity in place.amenities],
+            **place.to_dict(amenities),
             "reviews": [review.to_dict() for review in place.reviews],
         }
 
     def search_places(self, filters: Dict[str, Any] = None) -> List[Place]:
         """Search places with filters."""
-        query = Place.query
-
-        if filters:
-            if "price_min" in filters:
-                query = query.filter(Place.price >= filters["price_min"])
-            if "price_max" in filters:
-                query = query.filter(Place.price <= filters["price_max"])
-            if "amenities" in filters:
-                query = query.filter(
-                    Place.amenities.any(Amenity.id.in_(filters["amenities"]))
-                )
-            if "rating_min" in filters:
-                query = (
-                    query.join(Review)
-                    .group_by(Place.id)
-                    .having(func.avg(Review.rating) >= filters["rating_min"])
-                )
-
+        query, rank = self._filter_places(filters)
+        if rank is not None:
+            query = query.order_by(rank)
         return query.all()
 
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
@@ -390,139 +2005,420 @@ class HBnBFacade:
 
     def get_place_stats(self, place_id: str) -> Dict[str, Any]:
         """Get statistics for a place."""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, load="amenities")
         if not place:
             raise ValueError("Place not found")
 
-        reviews = place.reviews
-        if not reviews:
+        if not place.review_count:
             return {
                 "review_count": 0,
                 "average_rating": 0,
                 "rating_distribution": {str(i): 0 for i in range(1, 6)},
             }
 
-        rating_dist = {str(i): 0 for i in range(1, 6)}
-        for review in reviews:
-            rating_dist[str(review.rating)] += 1
-
         return {
-            "review_count": len(reviews),
-            "average_rating": sum(r.rating for r in reviews) / len(reviews),
-            "rating_distribution": rating_dist,
+            "review_count": place.review_count,
+            "average_rating": place.rating_avg,
+            "rating_distribution": place.rating_histogram,
             "amenities_count": len(place.amenities),
         }
 
+    # Bulk creation
+    @staticmethod
+    def _new_row(instance, model) -> Dict[str, Any]:
+        """
+        Column values of a validated, never added instance. Unset
+        columns with a default are left out, so every row of a model has
+        the same keys and the INSERT applies the defaults.
+        """
+        now = datetime.now(timezone.utc)
+        row = {}
+        for attr in inspect(model).column_attrs:
+            value = getattr(instance, attr.key)
+            if value is not None or attr.columns[0].default is None:
+                row[attr.key] = value
+        row.update(id=str(uuid.uuid4()), created_at=now, updated_at=now)
+        return row
+
+    def _bulk_create(
+        self,
+        model,
+        items: List[Dict[str, Any]],
+        prepare: Callable[[Dict[str, Any]], Dict[str, Any]],
+        finish: Callable[[List[Dict[str, Any]]], None],
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many rows of `model`. Every item is validated first by
+        `prepare`, which returns its row or raises ValueError; the valid
+        rows are then inserted bulk_batch_size at a time with one
+        executemany INSERT and one transaction per batch, `finish`
+        adding the batch side effects to that transaction. Inside a
+        unit of work the batches share its transaction instead.
+        Returns one result per item, in order: its id, or its error.
+        """
+        if len(items) > BULK_MAX_ITEMS:
+            raise ValueError(
+                f"Too many items, at most {BULK_MAX_ITEMS} per request"
+            )
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        valid = []
+        for index, data in enumerate(items):
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError("Item must be an object")
+                valid.append((index, prepare(dict(data))))
+            except (ValueError, TypeError) as e:
+                results[index] = {"index": index, "error": str(e)}
+
+        table = model.__tablename__
+        for start in range(0, len(valid), self.bulk_batch_size):
+            batch = valid[start:start + self.bulk_batch_size]
+            rows = [row for _, row in batch]
+            keys = {(table, row["id"]) for row in rows}
+            try:
+                db.session.execute(insert(model), rows)
+                finish(rows)
+                self._after_commit(
+                    lambda keys=keys: existence_filter.added(keys)
+                )
+                self._commit()
+            except SQLAlchemyError as e:
+                self._rollback()
+                if in_unit_of_work():
+                    # The earlier batches were lost with the unit
+                    raise ValueError(f"Database error: {str(e)}")
+                for index, _ in batch:
+                    results[index] = {
+                        "index": index,
+                        "error": f"Database error: {str(e)}",
+                    }
+                continue
+            for index, row in batch:
+                results[index] = {"index": index, "id": row["id"]}
+        return results
+
+    def bulk_create_places(
+        self, items: List[Dict[str, Any]], owner_id: str
+    ) -> List[Dict[str, Any]]:
+        """Create many places of one owner, see _bulk_create"""
+        catalog = self.get_amenity_catalog()
+        links: Dict[str, List[str]] = {}
+
+        def prepare(data):
+            amenity_ids = list(dict.fromkeys(data.pop("amenity_ids", [])))
+            if any(aid not in catalog.by_id for aid in amenity_ids):
+                raise ValueError("One or more amenities not found")
+            data["owner_id"] = owner_id
+            place = Place(**data)
+            row = self._new_row(place, Place)
+            if place.latitude is not None and place.longitude is not None:
+                row["geohash"] = encode_geohash(
+                    place.latitude, place.longitude
+                )
+            links[row["id"]] = amenity_ids
+            return row
+
+        def finish(rows):
+            link_rows = [
+                {"place_id": row["id"], "amenity_id": amenity_id}
+                for row in rows
+                for amenity_id in links[row["id"]]
+            ]
+            if link_rows:
+                db.session.execute(insert(place_amenities), link_rows)
+            added = [(row["id"], links[row["id"]]) for row in rows]
+
+            def index_places():
+                for place_id, amenity_ids in added:
+                    amenity_index.add_place(place_id, amenity_ids)
+
+            self._after_commit(index_places)
+            self._emit("places")
+            self._bump_stats(places=len(rows))
+
+        return self._bulk_create(Place, items, prepare, finish)
+
+    def bulk_create_amenities(
+        self, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Create many amenities, see _bulk_create"""
+        names = {item["name"] for item in self.get_amenity_catalog().items}
+
+        def prepare(data):
+            amenity = Amenity(**data)
+            if amenity.name in names:
+                raise ValueError(f"Amenity {amenity.name} already exists")
+            names.add(amenity.name)
+            return self._new_row(amenity, Amenity)
+
+        def finish(rows):
+            amenity_catalog.bump()
+            self._emit("amenities")
+            self._bump_stats(amenities=len(rows))
+
+        return self._bulk_create(Amenity, items, prepare, finish)
+
+    def bulk_create_reviews(
+        self, items: List[Dict[str, Any]], user_id: str
+    ) -> List[Dict[str, Any]]:
+        """Create many reviews by one user, see _bulk_create"""
+        place_ids = {
+            item.get("place_id") for item in items if isinstance(item, dict)
+        }
+        place_ids.discard(None)
+        owners = dict(
+            db.session.query(Place.id, Place.owner_id).filter(
+                Place.id.in_(place_ids)
+            )
+        )
+        reviewed = {
+            place_id
+            for (place_id,) in db.session.query(Review.place_id).filter(
+                Review.user_id == user_id, Review.place_id.in_(place_ids)
+            )
+        }
+
+        def prepare(data):
+            data["user_id"] = user_id
+            review = Review(**data)
+            if review.place_id not in owners:
+                raise ValueError("Place not found")
+            if str(owners[review.place_id]) == str(user_id):
+                raise ValueError("Cannot review your own place")
+            if review.place_id in reviewed:
+                raise ValueError("Already reviewed this place")
+            reviewed.add(review.place_id)
+            return self._new_row(review, Review)
+
+        def finish(rows):
+            batch_places = {row["place_id"] for row in rows}
+            self._refresh_rating_aggregates(Place.id.in_(batch_places))
+            self._emit(*[f"reviews:{place_id}" for place_id in batch_places])
+            self._bump_stats(
+                reviews=len(rows),
+                rating_sum=sum(row["rating"] for row in rows),
+            )
+
+        return self._bulk_create(Review, items, prepare, finish)
+
     # Admin methods
-    def admin_create_user(self, user_data: dict, admin_id: str) -> User:
+    def admin_create_user(self, user_data: dict, admin_id: Identity) -> User:
         """Create user with admin privileges check"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
         return self.create_user(user_data)
 
     def admin_update_user(
-        self, user_id: str, user_data: dict, admin_id: str
+        self, user_id: str, user_data: dict, admin_id: Identity
     ) -> User:
         """Update any user as admin"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
         return self.update_user(user_id, user_data)
 
-    def admin_delete_user(self, user_id: str, admin_id: str) -> bool:
+    def admin_delete_user(
+        self, user_id: str, admin_id: Identity
+    ) -> Dict[str, int]:
         """Delete user as admin"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
         return self.delete_user(user_id)
 
     def admin_manage_place(
-        self, place_id: str, place_data: dict, admin_id: str
+        self, place_id: str, place_data: dict, admin_id: Identity
     ) -> Place:
         """Admin can manage any place"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
 
         if place_id:
             return self.update_place(place_id, place_data)
         return self.create_place(place_data, place_data.get("owner_id"))
 
+    def admin_delete_place(self, place_id: str, admin_id: Identity) -> bool:
+        """Admin can delete any place"""
+        self._require_admin(admin_id)
+
+        if not self.delete_place(place_id):
+            raise ValueError("Place not found")
+        return True
+
     def admin_manage_amenity(
-        self, amenity_id: str, amenity_data: dict, admin_id: str
+        self, amenity_id: str, amenity_data: dict, admin_id: Identity
     ) -> Amenity:
         """Admin can manage amenities"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
 
         if amenity_id:
-            amenity = self.get_amenity(amenity_id)
-            if not amenity:
-                raise ValueError("Amenity not found")
+            return self.update_amenity(amenity_id, amenity_data)
+        return self.create_amenity(amenity_data)
 
-            try:
-                for key, value in amenity_data.items():
-                    setattr(amenity, key, value)
-                amenity.validate()
-                db.session.commit()
-                return amenity
-            except SQLAlchemyError as e:
-                db.session.rollback()
-                raise ValueError(f"Error updating amenity: {str(e)}")
-        else:
-            return self.create_amenity(amenity_data)
-
-    def admin_delete_amenity(self, amenity_id: str, admin_id: str) -> bool:
+    def admin_delete_amenity(
+        self, amenity_id: str, admin_id: Identity
+    ) -> bool:
         """Admin can delete any amenity"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
 
-        amenity = self.get_amenity(amenity_id)
-        if not amenity:
+        if not self.delete_amenity(amenity_id):
             raise ValueError("Amenity not found")
-
-        return self._delete_and_commit(amenity)
+        return True
 
     def admin_manage_review(
-        self, review_id: str, review_data: dict, admin_id: str
+        self, review_id: str, review_data: dict, admin_id: Identity
     ) -> Review:
         """Admin can manage any review"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+        self._require_admin(admin_id)
 
         if review_id:
             return self.update_review(review_id, review_data)
         return self.create_review(review_data, review_data.get("user_id"))
 
-    def admin_get_stats(self, admin_id: str) -> Dict[str, Any]:
-        """Get admin statistics"""
-        admin = self.get_user(admin_id)
-        if not admin or not admin.is_admin:
-            raise ValueError("Admin privileges required")
+    def admin_rebuild_geo_index(self, admin_id: Identity) -> int:
+        """Recompute the geohash cell of every located place"""
+        self._require_admin(admin_id)
+
+        try:
+            rows = (
+                db.session.query(Place.id, Place.latitude, Place.longitude)
+                .filter(
+                    Place.latitude.isnot(None), Place.longitude.isnot(None)
+                )
+                .all()
+            )
+            # Derived column: a plain executemany, versions are left as is
+            places = Place.__table__
+            if rows:
+                db.session.execute(
+                    update(places)
+                    .where(places.c.id == bindparam("place_id"))
+                    .values(geohash=bindparam("cell")),
+                    [
+                        {
+                            "place_id": pid,
+                            "cell": encode_geohash(plat, plon),
+                        }
+                        for pid, plat, plon in rows
+                    ],
+                )
+            self._evict_table("places")
+            self._commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Error rebuilding geo index: {str(e)}")
+
+    def admin_rebuild_rating_aggregates(self, admin_id: Identity) -> int:
+        """Recompute the rating aggregates of every place"""
+        self._require_admin(admin_id)
 
+        try:
+            count = self._refresh_rating_aggregates()
+            self._commit()
+            return count
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Error rebuilding rating aggregates: {str(e)}")
+
+    # Admin statistics
+    def _bump_stats(self, **deltas: int) -> None:
+        """
+        Shift admin_stats counters by `deltas` (ints, or SQL expressions
+        evaluated by the UPDATE) with one relative UPDATE inside the
+        caller's transaction.
+        """
+        deltas = {
+            name: delta
+            for name, delta in deltas.items()
+            if isinstance(delta, ColumnElement) or delta
+        }
+        if not deltas:
+            return
+        db.session.execute(
+            update(AdminStat)
+            .where(AdminStat.name.in_(deltas))
+            .values(
+                value=AdminStat.value
+                + case(deltas, value=AdminStat.name, else_=0)
+            )
+        )
+
+    def reconcile_admin_stats(self) -> Dict[str, Any]:
+        """
+        Recount admin_stats from the tables. The counter rows are locked
+        first so writes cannot slip between the counts and the store.
+        """
+        try:
+            rows = {
+                row.name: row for row in AdminStat.query.with_for_update()
+            }
+            values = {
+                "users": User.query.count(),
+                "places": Place.query.count(),
+                "reviews": Review.query.count(),
+                "amenities": Amenity.query.count(),
+                "rating_sum": db.session.query(
+                    func.coalesce(func.sum(Review.rating), 0)
+                ).scalar(),
+            }
+            now = datetime.now(timezone.utc)
+            for name, value in values.items():
+                row = rows.get(name) or AdminStat(name=name)
+                row.value = value
+                row.reconciled_at = now
+                db.session.add(row)
+            self._commit()
+        except SQLAlchemyError as e:
+            self._rollback()
+            raise ValueError(f"Error reconciling admin stats: {str(e)}")
+        return self._stats_payload(values, now, fresh=True)
+
+    @staticmethod
+    def _stats_payload(
+        values: Dict[str, int], reconciled_at: datetime, fresh: bool
+    ) -> Dict[str, Any]:
+        """Shape the counters as returned by admin_get_stats"""
+        if reconciled_at.tzinfo is None:
+            reconciled_at = reconciled_at.replace(tzinfo=timezone.utc)
+        reviews = values["reviews"]
         return {
-            "users_count": User.query.count(),
-            "places_count": Place.query.count(),
-            "reviews_count": Review.query.count(),
-            "amenities_count": Amenity.query.count(),
-            "average_rating": db.session.query(
-                func.avg(Review.rating)
-            ).scalar()
-            or 0.0,
-            "places_by_rating": db.session.query(
-                Place.id,
-                Place.title,
-                func.avg(Review.rating).label("avg_rating"),
-            )
-            .join(Review)
-            .group_by(Place.id)
-            .all(),
+            "users_count": values["users"],
+            "places_count": values["places"],
+            "reviews_count": reviews,
+            "amenities_count": values["amenities"],
+            "average_rating": (
+                values["rating_sum"] / reviews if reviews else 0.0
+            ),
+            "reconciled_at": reconciled_at,
+            "age_seconds": (
+                datetime.now(timezone.utc) - reconciled_at
+            ).total_seconds(),
+            "fresh": fresh,
         }
 
+    def admin_get_stats(
+        self, admin_id: Identity, fresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get admin statistics from the materialized counters, exact as of
+        reconciled_at plus every facade write since. `fresh` recounts
+        the tables (storing the result) and adds places_by_rating.
+        """
+        self._require_admin(admin_id)
+
+        rows = AdminStat.query.all()
+        if fresh or len(rows) < len(ADMIN_STATS):
+            stats = self.reconcile_admin_stats()
+        else:
+            stats = self._stats_payload(
+                {row.name: row.value for row in rows},
+                min(row.reconciled_at for row in rows),
+                fresh=False,
+            )
+        if fresh:
+            stats["places_by_rating"] = [
+                {"id": pid, "title": title, "avg_rating": avg}
+                for pid, title, avg in db.session.query(
+                    Place.id, Place.title, Place.rating_avg
+                ).filter(Place.review_count > 0)
+            ]
+        return stats
+
 
 # Create singleton instance
 facade = HBnBFacade()
@@ -0,0 +1,134 @@
+"""Stored responses of the requests sent with an Idempotency-Key."""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.db import db
+from app.models.idempotency_key import IdempotencyKey
+from app.services.periodic import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridden by IDEMPOTENCY_TTL / IDEMPOTENCY_LOCK_TIMEOUT /
+# IDEMPOTENCY_PURGE_INTERVAL (seconds; an interval of 0 disables the
+# background purge)
+DEFAULT_IDEMPOTENCY_TTL = 86400
+DEFAULT_IDEMPOTENCY_LOCK_TIMEOUT = 60
+DEFAULT_IDEMPOTENCY_PURGE_INTERVAL = 600
+
+
+def _now() -> datetime:
+    """Stored timestamps are naive UTC"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def digest(*parts: Union[str, bytes]) -> bytes:
+    """16 byte digest of the parts, the key of the idempotency table"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        hasher.update(len(part).to_bytes(8, "big"))
+        hasher.update(part)
+    return hasher.digest()
+
+
+class IdempotencyStore:
+    """
+    Idempotency keys and the first response given to each. A request
+    claims its key before running, so a retry arriving meanwhile is
+    told the request is in progress; the claim lapses after the lock
+    timeout if the worker died. Completed keys are kept for the TTL,
+    and a background thread deletes the expired rows.
+    """
+
+    def __init__(self):
+        self.ttl = DEFAULT_IDEMPOTENCY_TTL
+        self.lock_timeout = DEFAULT_IDEMPOTENCY_LOCK_TIMEOUT
+        self.purge_interval = DEFAULT_IDEMPOTENCY_PURGE_INTERVAL
+        self.purge_job = PeriodicJob("idempotency-purge", self.purge)
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Read the TTL, lock timeout and purge interval"""
+        self.ttl = config.get("IDEMPOTENCY_TTL", DEFAULT_IDEMPOTENCY_TTL)
+        self.lock_timeout = config.get(
+            "IDEMPOTENCY_LOCK_TIMEOUT", DEFAULT_IDEMPOTENCY_LOCK_TIMEOUT
+        )
+        self.purge_interval = config.get(
+            "IDEMPOTENCY_PURGE_INTERVAL", DEFAULT_IDEMPOTENCY_PURGE_INTERVAL
+        )
+
+    def init_app(self, app) -> None:
+        """Configure from `app` and start its background purge"""
+        self.configure(app.config)
+        self.purge_job.start(app, self.purge_interval)
+
+    def claim(
+        self, key: bytes, fingerprint: bytes
+    ) -> Optional[IdempotencyKey]:
+        """
+        Reserve `key` for a new request. Returns None when the caller
+        should run the request, else the live row already holding the
+        key (still in progress while its status is None).
+        """
+        now = _now()
+        try:
+            db.session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.digest == key,
+                    IdempotencyKey.expires_at <= now,
+                )
+            )
+            db.session.execute(
+                insert(IdempotencyKey).values(
+                    digest=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=self.lock_timeout),
+                )
+            )
+            db.session.commit()
+            return None
+        except IntegrityError:
+            db.session.rollback()
+        return db.session.execute(
+            select(IdempotencyKey).where(IdempotencyKey.digest == key)
+        ).scalar_one_or_none()
+
+    def complete(self, key: bytes, status: int, body: str) -> None:
+        """Store the response of the claimed request for the TTL"""
+        db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.digest == key)
+            .values(
+                status=status,
+                body=body,
+                expires_at=_now() + timedelta(seconds=self.ttl),
+            )
+        )
+        db.session.commit()
+
+    def release(self, key: bytes) -> None:
+        """Give up the claim, so that a retry runs the request again"""
+        db.session.rollback()
+        db.session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.digest == key,
+                IdempotencyKey.status.is_(None),
+            )
+        )
+        db.session.commit()
+
+    def purge(self) -> int:
+        """Delete the expired keys, returning how many were removed"""
+        result = db.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= _now())
+        )
+        db.session.commit()
+        logger.debug("Purged %s idempotency keys", result.rowcount)
+        return result.rowcount
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,163 @@
+"""Password hashing with a configurable cost, off the request threads."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from werkzeug.security import check_password_hash, generate_password_hash
+from app import bcrypt, metrics
+
+# Defaults, overridden by PASSWORD_HASH_METHOD / PASSWORD_HASH_COST
+DEFAULT_HASH_METHOD = "scrypt"
+DEFAULT_HASH_COSTS = {"scrypt": 32768, "pbkdf2": 1000000, "bcrypt": 12}
+
+# Hashes computed at once, and requests allowed to wait for a worker;
+# past that, hashing is refused instead of piling up
+DEFAULT_HASH_WORKERS = 2
+DEFAULT_HASH_QUEUE_SIZE = 32
+
+hash_queue_depth = Gauge(
+    "hbnb_password_hash_queue_depth",
+    "Password hash or verify calls waiting for a worker",
+    registry=metrics.registry,
+)
+hash_in_progress = Gauge(
+    "hbnb_password_hash_in_progress",
+    "Password hash or verify calls being computed",
+    registry=metrics.registry,
+)
+hash_seconds = Histogram(
+    "hbnb_password_hash_seconds",
+    "Time spent computing password hashes",
+    ["operation"],
+    registry=metrics.registry,
+)
+hash_rejected = Counter(
+    "hbnb_password_hash_rejected",
+    "Password hash or verify calls refused because the queue was full",
+    registry=metrics.registry,
+)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Every worker is busy and the queue is full"""
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with scrypt, pbkdf2 (werkzeug) or
+    bcrypt (flask_bcrypt). Stored hashes of any of them verify, so the
+    method can change; needs_rehash tells which ones to upgrade.
+    The work runs on a small thread pool (the hash functions release
+    the GIL), bounding the CPU a burst of logins can take.
+    """
+
+    def __init__(self):
+        self.method = DEFAULT_HASH_METHOD
+        self.cost = DEFAULT_HASH_COSTS[DEFAULT_HASH_METHOD]
+        self.workers = DEFAULT_HASH_WORKERS
+        self.queue_size = DEFAULT_HASH_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(
+            self.workers + self.queue_size
+        )
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Pick the method, cost and pool bounds from the configuration"""
+        method = config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD)
+        if method not in DEFAULT_HASH_COSTS:
+            raise ValueError(
+                f"Unknown password hash method, expected one of "
+                f"{tuple(DEFAULT_HASH_COSTS)}"
+            )
+        cost = config.get("PASSWORD_HASH_COST")
+        if cost is None and method == "bcrypt":
+            cost = config.get("BCRYPT_LOG_ROUNDS")
+        with self._lock:
+            self.method = method
+            self.cost = cost or DEFAULT_HASH_COSTS[method]
+            self.workers = config.get(
+                "PASSWORD_HASH_WORKERS", DEFAULT_HASH_WORKERS
+            )
+            self.queue_size = config.get(
+                "PASSWORD_HASH_QUEUE_SIZE", DEFAULT_HASH_QUEUE_SIZE
+            )
+            self._slots = threading.BoundedSemaphore(
+                self.workers + self.queue_size
+            )
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    @property
+    def _werkzeug_method(self) -> str:
+        if self.method == "scrypt":
+            return f"scrypt:{self.cost}:8:1"
+        return f"pbkdf2:sha256:{self.cost}"
+
+    def _hash(self, password: str) -> str:
+        if self.method == "bcrypt":
+            return bcrypt.generate_password_hash(password, self.cost).decode()
+        return generate_password_hash(password, method=self._werkzeug_method)
+
+    @staticmethod
+    def _verify(stored: str, password: str) -> bool:
+        if stored.startswith("$2"):
+            return bcrypt.check_password_hash(stored, password)
+        return check_password_hash(stored, password)
+
+    def needs_rehash(self, stored: str) -> bool:
+        """Whether `stored` was made with another method or cost"""
+        if self.method == "bcrypt":
+            # $2b$<rounds>$<salt and hash>
+            parts = stored.split("$")
+            return len(parts) < 3 or parts[2] != f"{self.cost:02d}"
+        return stored.split("$", 1)[0] != self._werkzeug_method
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created on first use, so forked workers start their own
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    def _run(self, operation: str, work: Callable[..., Any], *args) -> Any:
+        """Run `work` on the pool and wait for its result"""
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            hash_rejected.inc()
+            raise PasswordHasherBusy("Password hashing queue is full")
+        hash_queue_depth.inc()
+
+        def timed():
+            hash_queue_depth.dec()
+            hash_in_progress.inc()
+            started = time.perf_counter()
+            try:
+                return work(*args)
+            finally:
+                hash_seconds.labels(operation).observe(
+                    time.perf_counter() - started
+                )
+                hash_in_progress.dec()
+
+        try:
+            return self._pool().submit(timed).result()
+        finally:
+            slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", self._hash, password)
+
+    def verify(self, stored: str, password: str) -> bool:
+        if not stored or not password:
+            return False
+        return self._run("verify", self._verify, stored, password)
+
+
+# Create singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,49 @@
+"""Maintenance jobs run periodically on a background thread."""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Run `job` inside an application context every `interval` seconds
+    on a daemon thread. Starting it again (a new app) stops the
+    previous thread first; an interval of 0 leaves it stopped.
+    """
+
+    def __init__(self, name: str, job: Callable[[], object]):
+        self.name = name
+        self.job = job
+        self._stop: Optional[threading.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._stop is not None
+
+    def start(self, app, interval: float) -> None:
+        """(Re)start the job for `app`, every `interval` seconds"""
+        self.stop()
+        if interval:
+            self._stop = threading.Event()
+            threading.Thread(
+                target=self._run_forever,
+                args=(app, self._stop, interval),
+                name=self.name,
+                daemon=True,
+            ).start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def _run_forever(self, app, stop: threading.Event, interval) -> None:
+        while not stop.wait(interval):
+            try:
+                with app.app_context():
+                    self.job()
+            except Exception:
+                logger.exception("Periodic job %s failed", self.name)
@@ -0,0 +1,104 @@
+"""Cache of rendered public GET responses, invalidated by tags."""
+
+import gzip
+import uuid
+from typing import Any, Dict, Iterable, Optional
+from prometheus_client import Counter
+from app import metrics
+from app.services.cache import LRUCache, RedisCache
+
+# Defaults, overridden by RESPONSE_CACHE_SIZE / RESPONSE_CACHE_TTL
+DEFAULT_RESPONSE_CACHE_SIZE = 2000
+DEFAULT_RESPONSE_CACHE_TTL = 300
+
+response_hits = Counter(
+    "hbnb_response_cache_hits",
+    "Responses served from the response cache",
+    ["endpoint"],
+    registry=metrics.registry,
+)
+response_misses = Counter(
+    "hbnb_response_cache_misses",
+    "Cacheable responses that had to be rendered",
+    ["endpoint"],
+    registry=metrics.registry,
+)
+
+
+class ResponseCache:
+    """
+    Stores gzip-compressed response bodies with their headers.
+    Each entry remembers the token of every tag it depends on, e.g.
+    "places" or "place:<id>"; invalidating a tag drops its token, so
+    every entry stored under the old one misses from then on.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUCache(
+            DEFAULT_RESPONSE_CACHE_SIZE, DEFAULT_RESPONSE_CACHE_TTL
+        )
+        self.enabled = True
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Pick the backend and bounds from the Flask configuration"""
+        self.enabled = config.get("RESPONSE_CACHE_ENABLED", True)
+        ttl = config.get("RESPONSE_CACHE_TTL", DEFAULT_RESPONSE_CACHE_TTL)
+        if config.get("RESPONSE_CACHE_URL"):
+            self.backend = RedisCache(
+                config["RESPONSE_CACHE_URL"], ttl, prefix="hbnb:response"
+            )
+        else:
+            self.backend = LRUCache(
+                config.get("RESPONSE_CACHE_SIZE", DEFAULT_RESPONSE_CACHE_SIZE),
+                ttl,
+            )
+
+    def tokens(self, tags: Iterable[str]) -> Dict[str, str]:
+        """
+        Current token of each tag. Read them before rendering: a write
+        committed meanwhile replaces a token and strands the entry.
+        """
+        tokens = {}
+        for tag in tags:
+            token = self.backend.get(("tag", tag))
+            if token is None:
+                token = uuid.uuid4().hex
+                self.backend.set(("tag", tag), token)
+            tokens[tag] = token
+        return tokens
+
+    def get(
+        self, endpoint: str, key: str, tokens: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        entry = self.backend.get(("entry", key))
+        if entry is None or entry["tokens"] != tokens:
+            response_misses.labels(endpoint).inc()
+            return None
+        response_hits.labels(endpoint).inc()
+        return entry
+
+    def set(
+        self,
+        key: str,
+        tokens: Dict[str, str],
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> None:
+        self.backend.set(
+            ("entry", key),
+            {
+                "tokens": tokens,
+                "headers": headers,
+                "body": gzip.compress(body),
+            },
+        )
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.backend.delete([("tag", tag) for tag in tags])
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+# Create singleton instance
+response_cache = ResponseCache()
@@ -0,0 +1,56 @@
+"""Current token version of each user, in front of the users table."""
+
+from typing import Any, Dict, Optional
+from app.services.cache import LRUCache, RedisCache
+
+# Defaults, overridden by TOKEN_VERSION_CACHE_SIZE / TOKEN_VERSION_CACHE_TTL
+DEFAULT_TOKEN_VERSION_CACHE_SIZE = 50000
+DEFAULT_TOKEN_VERSION_CACHE_TTL = 60
+
+
+class TokenVersions:
+    """
+    Maps a user id to the token_version stored on the user row.
+    JWT claims carrying the same version are trusted as is; a changed
+    role or password bumps the row and forgets the entry here, so the
+    next check reads the row again. With the in-process backend other
+    workers notice within the TTL, with redis immediately.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUCache(
+            DEFAULT_TOKEN_VERSION_CACHE_SIZE, DEFAULT_TOKEN_VERSION_CACHE_TTL
+        )
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Pick the backend and bounds from the Flask configuration"""
+        ttl = config.get(
+            "TOKEN_VERSION_CACHE_TTL", DEFAULT_TOKEN_VERSION_CACHE_TTL
+        )
+        if config.get("TOKEN_VERSION_CACHE_URL"):
+            self.backend = RedisCache(
+                config["TOKEN_VERSION_CACHE_URL"],
+                ttl,
+                prefix="hbnb:token-version",
+            )
+        else:
+            self.backend = LRUCache(
+                config.get(
+                    "TOKEN_VERSION_CACHE_SIZE",
+                    DEFAULT_TOKEN_VERSION_CACHE_SIZE,
+                ),
+                ttl,
+            )
+
+    def get(self, user_id: str) -> Optional[int]:
+        return self.backend.get(("users", user_id))
+
+    def set(self, user_id: str, version: int) -> None:
+        self.backend.set(("users", user_id), version)
+
+    def forget(self, user_id: str) -> None:
+        self.backend.delete([("users", user_id)])
+
+
+# Create singleton instance
+token_versions = TokenVersions()
@@ -0,0 +1,69 @@
+"""Request-scoped unit of work: one flush and one commit per request."""
+
+from contextlib import ContextDecorator
+from sqlalchemy.exc import SQLAlchemyError
+from app.db import db
+
+# Keys of session.info: nesting depth, and whether the unit is lost
+_DEPTH = "unit_of_work"
+_FAILED = "unit_of_work_failed"
+
+
+def in_unit_of_work(session=None) -> bool:
+    """Whether commits of the session are deferred to a unit of work"""
+    session = session if session is not None else db.session
+    return bool(session.info.get(_DEPTH))
+
+
+def mark_failed(session=None) -> None:
+    """The enclosing unit of work, if any, must roll back on exit"""
+    session = session if session is not None else db.session
+    if session.info.get(_DEPTH):
+        session.info[_FAILED] = True
+
+
+class UnitOfWork(ContextDecorator):
+    """
+    Groups the facade calls made inside it into one transaction: their
+    commits are deferred, and the outermost unit flushes and commits
+    once on exit. Leaving with an exception, or after a participant
+    rolled back, rolls the whole unit back instead. Nested units join
+    the outermost one.
+    """
+
+    def __enter__(self) -> "UnitOfWork":
+        info = db.session.info
+        depth = info.get(_DEPTH, 0)
+        if not depth:
+            info[_FAILED] = False
+        info[_DEPTH] = depth + 1
+        return self
+
+    def fail(self) -> None:
+        """Roll back on exit even though no exception was raised"""
+        mark_failed()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        session = db.session
+        session.info[_DEPTH] -= 1
+        if session.info[_DEPTH]:
+            if exc_type is not None:
+                session.info[_FAILED] = True
+            return False
+
+        del session.info[_DEPTH]
+        failed = session.info.pop(_FAILED, False)
+        if exc_type is not None or failed:
+            session.rollback()
+            return False
+        try:
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+        return False
+
+
+def unit_of_work() -> UnitOfWork:
+    """Context manager / decorator running its body in one unit of work"""
+    return UnitOfWork()
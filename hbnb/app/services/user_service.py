@@ -47,12 +47,9 @@ class UserService:
         """Delete a user"""
         return self.facade.delete_user(user_id)
 
-    def is_admin(self, user_id: str) -> bool:
-        """Check if user has admin privileges"""
-        if not user_id:
-            return False
-        user = self.get_user_by_id(user_id)
-        return bool(user and getattr(user, "is_admin", False))
+    def is_admin(self, identity) -> bool:
+        """Check admin privileges of a user id or of JWT identity claims"""
+        return self.facade.is_admin(identity)
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user credentials"""
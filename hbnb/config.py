@@ -22,24 +22,81 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-secret-key-change-this")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
 
-    # Bcrypt
+    # Password hashing: scrypt, pbkdf2 or bcrypt (cost from
+    # BCRYPT_LOG_ROUNDS); hashes made otherwise are redone at login
+    PASSWORD_HASH_METHOD = "scrypt"
+    PASSWORD_HASH_COST = None
     BCRYPT_LOG_ROUNDS = 12
+    # Hashes computed at once, and logins allowed to wait for them
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_QUEUE_SIZE = 32
+
+    # Structured logs of the "app" loggers, written by a background
+    # thread; per-module levels, and sampling of the records below
+    # WARNING on hot paths
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING")
+    LOG_LEVELS = {}
+    LOG_SAMPLING = {"app.persistence": 0.01}
+    LOG_QUEUE_SIZE = 10000
+
+    # Background recount of the materialized admin statistics (seconds;
+    # 0 disables it, "flask reconcile-stats" can then be run from cron)
+    ADMIN_STATS_RECONCILE_INTERVAL = 3600
+
+    # Rows per INSERT, and per transaction, of the bulk create endpoints
+    BULK_BATCH_SIZE = 500
+
+    # Responses replayed to POST retries carrying the same
+    # Idempotency-Key, kept for the TTL; claims of requests still
+    # running lapse after the lock timeout (seconds)
+    IDEMPOTENCY_TTL = 86400
+    IDEMPOTENCY_LOCK_TIMEOUT = 60
+    IDEMPOTENCY_PURGE_INTERVAL = 600
+
+    # Entity cache of the facade (in-process LRU unless a URL is given)
+    ENTITY_CACHE_SIZE = 10000
+    ENTITY_CACHE_TTL = 60
+    ENTITY_CACHE_URL = os.getenv("ENTITY_CACHE_URL")
+
+    # Cache of the public GET responses, invalidated by facade writes
+    RESPONSE_CACHE_SIZE = 2000
+    RESPONSE_CACHE_TTL = 300
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+
+    # Identifiers recently looked up in vain, answered 404 without a query
+    NEGATIVE_CACHE_SIZE = 50000
+    NEGATIVE_CACHE_TTL = 30
+    NEGATIVE_CACHE_URL = os.getenv("NEGATIVE_CACHE_URL")
+
+    # Token versions checked against the admin claims of a JWT
+    TOKEN_VERSION_CACHE_SIZE = 50000
+    TOKEN_VERSION_CACHE_TTL = 60
+    TOKEN_VERSION_CACHE_URL = os.getenv("TOKEN_VERSION_CACHE_URL")
+
+    # Per-process Bloom filters of the existing identifiers, built at
+    # startup; only safe when a single process creates rows
+    EXISTENCE_BLOOM_ENABLED = False
+    EXISTENCE_BLOOM_CAPACITY = 100000
+    EXISTENCE_BLOOM_ERROR_RATE = 0.01
 
 
 class DevelopmentConfig(Config):
     """Development configuration."""
 
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///development.db"
+    SQLALCHEMY_DATABASE_URI = "sqlite:///hbnb.db"
+    LOG_LEVEL = "DEBUG"
 
 
 class TestingConfig(Config):
     """Test configuration."""
 
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///test.db"
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     DEBUG = False
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    IDEMPOTENCY_PURGE_INTERVAL = 0
+    ADMIN_STATS_RECONCILE_INTERVAL = 0
 
 
 class ProductionConfig(Config):
@@ -1,8 +1,12 @@
 import unittest
 from collections.abc import Mapping
+from contextlib import contextmanager
+from flask_jwt_extended import JWTManager, create_access_token
 from flask_testing import TestCase
+from sqlalchemy import event
 from app import create_app
 from app.db import db
+from app.services.facade import facade
 
 
 class BaseTestCase(TestCase):
@@ -19,3 +23,57 @@ class BaseTestCase(TestCase):
     def tearDown(self):
         db.session.remove()
         db.drop_all()
+
+    @staticmethod
+    def make_user(email="owner@test.com", **fields):
+        """Create a valid user through the facade"""
+        return facade.create_user(
+            {
+                "email": email,
+                "first_name": "User",
+                "last_name": "Test",
+                "password": "pass123",
+                **fields,
+            }
+        )
+
+    @contextmanager
+    def recorded_queries(self):
+        """Collect the SQL statements executed inside the block"""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    def record_queries(self):
+        """Collect the SQL statements executed until the test ends"""
+        recorder = self.recorded_queries()
+        statements = recorder.__enter__()
+        self.addCleanup(recorder.__exit__, None, None, None)
+        return statements
+
+
+class ApiTestCase(BaseTestCase):
+    """BaseTestCase serving the v1 API to self.client"""
+
+    def create_app(self):
+        from app.api.v1 import api
+
+        app = super().create_app()
+        # Identities are the claim dicts of facade.token_claims
+        app.config["JWT_VERIFY_SUB"] = False
+        JWTManager(app)
+        api.init_app(app)
+        return app
+
+    @staticmethod
+    def auth_headers(user):
+        """Authorization header carrying a token for `user`"""
+        token = create_access_token(identity=facade.token_claims(user))
+        return {"Authorization": f"Bearer {token}"}
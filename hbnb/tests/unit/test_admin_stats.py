@@ -0,0 +1,91 @@
+"""Materialized admin statistics."""
+
+import threading
+from tests.base import BaseTestCase
+from app.db import db
+from app.models.user import User
+from app.services.facade import facade
+from app.services.periodic import PeriodicJob
+
+
+class TestAdminStats(BaseTestCase):
+    """Counters follow the facade writes and match a live recount"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user("admin@test.com", is_admin=True)
+        # First read reconciles the counters from the tables
+        facade.admin_get_stats(self.admin.id)
+
+    def _counters(self):
+        stats = facade.admin_get_stats(self.admin.id)
+        self.assertFalse(stats["fresh"])
+        return stats
+
+    def _assert_matches_recount(self):
+        stats = self._counters()
+        live = facade.admin_get_stats(self.admin.id, fresh=True)
+        for key in (
+            "users_count",
+            "places_count",
+            "reviews_count",
+            "amenities_count",
+            "average_rating",
+        ):
+            self.assertEqual(stats[key], live[key], key)
+
+    def test_writes_shift_counters(self):
+        owner = self.make_user("o@test.com")
+        guest = self.make_user("g@test.com")
+        place = facade.create_place({"title": "Villa", "price": 1}, owner.id)
+        facade.create_amenity({"name": "WiFi"})
+        review = facade.create_review(
+            {"text": "Good", "rating": 4, "place_id": place.id}, guest.id
+        )
+        stats = self._counters()
+        self.assertEqual(stats["users_count"], 3)
+        self.assertEqual(stats["places_count"], 1)
+        self.assertEqual(stats["reviews_count"], 1)
+        self.assertEqual(stats["amenities_count"], 1)
+        self.assertEqual(stats["average_rating"], 4.0)
+
+        facade.update_review(review.id, {"rating": 2})
+        self.assertEqual(self._counters()["average_rating"], 2.0)
+        self._assert_matches_recount()
+
+    def test_cascading_deletes(self):
+        owner = self.make_user("o@test.com")
+        guest = self.make_user("g@test.com")
+        place = facade.create_place({"title": "Villa", "price": 1}, owner.id)
+        facade.create_review(
+            {"text": "Good", "rating": 5, "place_id": place.id}, guest.id
+        )
+        facade.delete_user(owner.id)
+        stats = self._counters()
+        self.assertEqual(stats["places_count"], 0)
+        self.assertEqual(stats["reviews_count"], 0)
+        self._assert_matches_recount()
+
+    def test_fresh_recount(self):
+        stats = facade.admin_get_stats(self.admin.id, fresh=True)
+        self.assertTrue(stats["fresh"])
+        self.assertEqual(stats["places_by_rating"], [])
+        self.assertLess(stats["age_seconds"], 5)
+
+    def test_periodic_job(self):
+        runs = []
+        done = threading.Event()
+
+        def job():
+            # Runs in an application context of its own
+            runs.append(db.session.query(User).count())
+            done.set()
+
+        periodic = PeriodicJob("test-job", job)
+        periodic.start(self.app, 0.01)
+        try:
+            self.assertTrue(done.wait(5))
+        finally:
+            periodic.stop()
+        self.assertFalse(periodic.running)
+        self.assertEqual(runs[0], 1)
@@ -0,0 +1,79 @@
+"""Versioned in-memory amenity catalog."""
+
+from tests.base import BaseTestCase
+from app.db import db
+from app.services.amenity_catalog import amenity_catalog
+from app.services.facade import facade
+
+
+class TestAmenityCatalog(BaseTestCase):
+    """Amenity reads come from memory, writes move the version"""
+
+    def setUp(self):
+        super().setUp()
+        for name in ("WiFi", "Pool", "Parking"):
+            facade.create_amenity({"name": name})
+
+    def test_reads_need_no_query(self):
+        """Within the check interval the catalog is not read again"""
+        facade.list_amenities()
+        with self.recorded_queries() as statements:
+            page = facade.list_amenities()
+            catalog = facade.get_amenity_catalog()
+        self.assertEqual(statements, [])
+        self.assertEqual(
+            [item["name"] for item in page["items"]],
+            ["WiFi", "Pool", "Parking"],
+        )
+        self.assertIs(catalog.rendered("x", object), catalog.rendered("x", 1))
+
+    def test_writes_bump_version(self):
+        """Create, update and delete each publish a new version"""
+        version = facade.get_amenity_catalog().version
+        amenity = facade.create_amenity({"name": "Spa"})
+        self.assertEqual(facade.get_amenity_catalog().version, version + 1)
+        facade.update_amenity(amenity.id, {"name": "Sauna"})
+        catalog = facade.get_amenity_catalog()
+        self.assertEqual(catalog.version, version + 2)
+        self.assertEqual(catalog.by_id[amenity.id]["name"], "Sauna")
+        facade.delete_amenity(amenity.id)
+        catalog = facade.get_amenity_catalog()
+        self.assertEqual(catalog.version, version + 3)
+        self.assertNotIn(amenity.id, catalog.by_id)
+
+    def test_other_worker_write_is_picked_up(self):
+        """A version moved elsewhere reloads the catalog on next check"""
+        facade.get_amenity_catalog()
+        db.session.execute(
+            db.text(
+                "UPDATE catalog_versions SET version = version + 1 "
+                "WHERE name = 'amenities'"
+            )
+        )
+        db.session.execute(
+            db.text("UPDATE amenities SET name = 'Garage' "
+                    "WHERE name = 'Parking'")
+        )
+        db.session.commit()
+        amenity_catalog.invalidate()
+        names = [item["name"] for item in facade.list_amenities()["items"]]
+        self.assertIn("Garage", names)
+
+    def test_cursor_pages(self):
+        """In-memory pages follow the usual cursors"""
+        first = facade.list_amenities(limit=2)
+        self.assertEqual(len(first["items"]), 2)
+        rest = facade.list_amenities(limit=2, cursor=first["next"])
+        self.assertEqual([i["name"] for i in rest["items"]], ["Parking"])
+        self.assertIsNone(rest["next"])
+        with self.assertRaises(ValueError):
+            facade.list_amenities(fields=["password"])
+
+    def test_rolled_back_write_is_not_published(self):
+        """Uncommitted amenities never reach the shared catalog"""
+        version = facade.get_amenity_catalog().version
+        with self.assertRaises(ValueError):
+            facade.create_amenity({"name": "WiFi"})
+        catalog = facade.get_amenity_catalog()
+        self.assertEqual(catalog.version, version)
+        self.assertEqual(len(catalog.items), 3)
@@ -0,0 +1,66 @@
+"""Tests for the in-process amenity index."""
+
+from tests.base import BaseTestCase
+from app.services.facade import facade
+from app.services.amenity_index import amenity_index
+
+
+class TestAmenityIndex(BaseTestCase):
+    """All-of, any-of and none-of amenity filters."""
+
+    def setUp(self):
+        super().setUp()
+        amenity_index.invalidate()
+        owner = self.make_user("owner@test.com")
+        self.wifi, self.parking, self.pool = (
+            facade.create_amenity({"name": name}).id
+            for name in ("WiFi", "Parking", "Pool")
+        )
+        self.villa = facade.create_place(
+            {
+                "title": "Villa",
+                "price": 300.0,
+                "amenity_ids": [self.wifi, self.parking, self.pool],
+            },
+            owner.id,
+        ).id
+        self.flat = facade.create_place(
+            {
+                "title": "Flat",
+                "price": 90.0,
+                "amenity_ids": [self.wifi, self.parking],
+            },
+            owner.id,
+        ).id
+        self.cabin = facade.create_place(
+            {"title": "Cabin", "price": 40.0}, owner.id
+        ).id
+
+    def search(self, **filters):
+        return sorted(place.id for place in facade.search_places(filters))
+
+    def test_all_of(self):
+        """Every listed amenity is required"""
+        self.assertEqual(
+            self.search(amenities_all=[self.wifi, self.pool]), [self.villa]
+        )
+
+    def test_any_of_with_price(self):
+        """Index matches combine with the price filters"""
+        self.assertEqual(
+            self.search(amenities=[self.parking], price_max=100.0),
+            [self.flat],
+        )
+
+    def test_none_of(self):
+        """Excluded amenities remove places"""
+        self.assertEqual(self.search(amenities_none=[self.wifi]), [self.cabin])
+
+    def test_index_follows_writes(self):
+        """Linking an amenity is visible to the next search"""
+        self.search(amenities=[self.pool])
+        facade.add_place_amenity(self.cabin, self.pool)
+        self.assertEqual(
+            self.search(amenities=[self.pool]),
+            sorted([self.villa, self.cabin]),
+        )
@@ -0,0 +1,105 @@
+"""Set-based amenity links of places."""
+
+from werkzeug.exceptions import HTTPException
+from tests.base import BaseTestCase
+from app.api.v1.places import change_amenities
+from app.services.amenity_index import amenity_index
+from app.services.facade import facade
+
+
+class TestAmenityLinks(BaseTestCase):
+    """Add, remove and replace amenity sets on many places"""
+
+    def setUp(self):
+        super().setUp()
+        amenity_index.invalidate()
+        self.owner_id = self.make_user("owner@test.com").id
+        self.wifi, self.parking, self.pool = (
+            facade.create_amenity({"name": name}).id
+            for name in ("WiFi", "Parking", "Pool")
+        )
+        self.villa, self.flat = (
+            facade.create_place({"title": t, "price": 10}, self.owner_id).id
+            for t in ("Villa", "Flat")
+        )
+        self.places = [self.villa, self.flat]
+        self.statements = self.record_queries()
+
+    def links(self, place_id):
+        place = facade.get_place(place_id, load="amenities")
+        return sorted(amenity.id for amenity in place.amenities)
+
+    def search(self, amenity_id):
+        return sorted(
+            place.id for place in facade.search_places(
+                {"amenities": [amenity_id]}
+            )
+        )
+
+    def test_add_is_one_statement_and_idempotent(self):
+        self.search(self.wifi)
+        self.statements.clear()
+        result = facade.set_place_amenities(
+            self.places, [self.wifi, self.pool]
+        )
+        self.assertEqual(result, {"added": 4, "removed": 0})
+        writes = [s for s in self.statements if "place_amenities" in s]
+        self.assertEqual(len(writes), 1)
+        self.assertIn("ON CONFLICT DO NOTHING", writes[0])
+
+        again = facade.set_place_amenities([self.villa], [self.wifi])
+        self.assertEqual(again, {"added": 0, "removed": 0})
+        self.assertEqual(
+            self.links(self.villa), sorted([self.wifi, self.pool])
+        )
+        self.assertEqual(self.search(self.wifi), sorted(self.places))
+
+    def test_remove_and_replace(self):
+        facade.set_place_amenities(self.places, [self.wifi, self.parking])
+        self.search(self.wifi)
+        self.assertEqual(
+            facade.set_place_amenities(self.places, [self.wifi], "remove"),
+            {"added": 0, "removed": 2},
+        )
+        self.assertEqual(
+            facade.set_place_amenities(
+                [self.villa], [self.parking, self.pool], "replace"
+            ),
+            {"added": 1, "removed": 0},
+        )
+        self.assertEqual(
+            self.links(self.villa), sorted([self.parking, self.pool])
+        )
+        self.assertEqual(self.links(self.flat), [self.parking])
+        self.assertEqual(self.search(self.wifi), [])
+        self.assertEqual(self.search(self.pool), [self.villa])
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            facade.set_place_amenities(self.places, ["missing"])
+        with self.assertRaises(ValueError):
+            facade.set_place_amenities(["missing"], [self.wifi])
+        with self.assertRaises(ValueError):
+            facade.set_place_amenities(self.places, [self.wifi], "toggle")
+
+    def test_ownership(self):
+        other = self.make_user("other@test.com").id
+        with self.assertRaisesRegex(ValueError, "Unauthorized"):
+            facade.set_place_amenities(self.places, [self.wifi], user=other)
+        admin = self.make_user("admin@test.com", is_admin=True).id
+        facade.set_place_amenities(self.places, [self.wifi], user=admin)
+        self.assertEqual(self.links(self.flat), [self.wifi])
+
+    def test_update_place_replaces_links(self):
+        facade.set_place_amenities([self.villa], [self.wifi, self.parking])
+        facade.update_place(self.villa, {"amenity_ids": [self.pool]})
+        self.assertEqual(self.links(self.villa), [self.pool])
+
+    def test_bulk_endpoint_requires_places(self):
+        for body in ({"amenity_ids": [self.wifi]}, {"place_ids": []}):
+            with self.app.test_request_context(
+                "/api/v1/places/amenities", method="POST", json=body
+            ):
+                with self.assertRaises(HTTPException) as raised:
+                    change_amenities(None, "add")
+            self.assertEqual(raised.exception.code, 400)
@@ -0,0 +1,74 @@
+"""Claims-based admin checks of the facade."""
+
+from tests.base import BaseTestCase
+from app.db import db
+from app.services.facade import facade
+from app.services.token_versions import token_versions
+
+
+class TestClaimsAuthorization(BaseTestCase):
+    """Current claims are trusted, stale ones go back to the user row"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user("admin@test.com", is_admin=True)
+        self.claims = facade.token_claims(self.admin)
+        self.statements = self.record_queries()
+
+    def tearDown(self):
+        token_versions.configure({})
+        super().tearDown()
+
+    def test_claims(self):
+        self.assertEqual(
+            self.claims,
+            {"id": self.admin.id, "is_admin": True, "token_version": 0},
+        )
+
+    def test_current_claims_need_no_query(self):
+        db.session.remove()
+        self.statements.clear()
+        self.assertTrue(facade.is_admin(self.claims))
+        self.assertEqual(self.statements, [])
+
+    def test_unknown_version_is_read_once(self):
+        token_versions.configure({})
+        db.session.remove()
+        self.statements.clear()
+        self.assertTrue(facade.is_admin(self.claims))
+        self.assertTrue(facade.is_admin(self.claims))
+        self.assertEqual(len(self.statements), 1)
+
+    def test_demotion_revokes_claims(self):
+        facade.update_user(self.admin.id, {"is_admin": False})
+        self.assertFalse(facade.is_admin(self.claims))
+        with self.assertRaises(ValueError):
+            facade.admin_get_stats(self.claims)
+
+        fresh = facade.token_claims(facade.get_user(self.admin.id))
+        self.assertEqual(fresh["token_version"], 1)
+        self.assertFalse(fresh["is_admin"])
+
+    def test_password_change_revokes_claims(self):
+        facade.update_user(self.admin.id, {"password": "other456"})
+        self.assertEqual(facade.get_user(self.admin.id).token_version, 1)
+        # Still an admin according to the row
+        self.assertTrue(facade.is_admin(self.claims))
+        self.assertNotEqual(
+            facade.token_claims(facade.get_user(self.admin.id)), self.claims
+        )
+
+    def test_other_updates_keep_claims(self):
+        facade.update_user(self.admin.id, {"first_name": "Renamed"})
+        self.assertEqual(facade.get_user(self.admin.id).token_version, 0)
+
+    def test_deleted_user(self):
+        facade.delete_user(self.admin.id)
+        self.assertFalse(facade.is_admin(self.claims))
+
+    def test_bare_id_and_legacy_claims(self):
+        self.assertTrue(facade.is_admin(self.admin.id))
+        legacy = {"id": self.admin.id, "is_admin": True}
+        self.assertTrue(facade.is_admin(legacy))
+        self.assertFalse(facade.is_admin({"id": "missing", "is_admin": True}))
+        self.assertFalse(facade.is_admin(None))
@@ -0,0 +1,136 @@
+"""Bulk creation of places, amenities and reviews."""
+
+from tests.base import BaseTestCase
+from app.models.place import Place
+from app.services.facade import facade
+
+
+class TestBulkCreate(BaseTestCase):
+    """Items are validated first, then inserted batch by batch"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner_id = self.make_user("owner@test.com").id
+        self.guest_id = self.make_user("guest@test.com").id
+
+    def tearDown(self):
+        facade.bulk_batch_size = 500
+        super().tearDown()
+
+    def _count_inserts(self, table, call):
+        with self.recorded_queries() as statements:
+            result = call()
+        prefix = f"INSERT INTO {table} "
+        return result, [s for s in statements if s.startswith(prefix)]
+
+    def test_places_in_batches(self):
+        facade.bulk_batch_size = 10
+        wifi = facade.create_amenity({"name": "WiFi"}).id
+        items = [
+            {
+                "title": f"Place {i}",
+                "price": i,
+                "latitude": 48.85,
+                "longitude": 2.35,
+                "amenity_ids": [wifi],
+            }
+            for i in range(25)
+        ]
+        results, inserts = self._count_inserts(
+            "places", lambda: facade.bulk_create_places(items, self.owner_id)
+        )
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual([r["index"] for r in results], list(range(25)))
+        self.assertTrue(all("id" in r for r in results))
+
+        place = facade.get_place(results[0]["id"], load="amenities")
+        self.assertEqual(place.owner_id, self.owner_id)
+        self.assertIsNotNone(place.geohash)
+        self.assertEqual(place.review_count, 0)
+        self.assertEqual([a.id for a in place.amenities], [wifi])
+        # Full-text index and the nearby search see the new rows
+        self.assertEqual(len(facade.search_places({"q": "Place"})), 25)
+        self.assertEqual(len(facade.get_places_nearby(48.85, 2.35, 1)), 20)
+
+    def test_invalid_items_are_reported(self):
+        items = [
+            {"title": "Good", "price": 10},
+            {"title": "", "price": 10},
+            {"title": "Bad price", "price": -1},
+            {"title": "Bad amenity", "price": 1, "amenity_ids": ["nope"]},
+            "not an object",
+        ]
+        results = facade.bulk_create_places(items, self.owner_id)
+        self.assertIn("id", results[0])
+        self.assertEqual(
+            [r["error"] for r in results[1:]],
+            [
+                "Title cannot be empty",
+                "Price must be a positive number",
+                "One or more amenities not found",
+                "Item must be an object",
+            ],
+        )
+        self.assertEqual(Place.query.count(), 1)
+
+    def test_amenities(self):
+        facade.create_amenity({"name": "WiFi"})
+        results = facade.bulk_create_amenities(
+            [{"name": "Pool"}, {"name": "WiFi"}, {"name": "Pool"}, {}]
+        )
+        self.assertIn("id", results[0])
+        self.assertEqual(
+            [r["error"] for r in results[1:]],
+            [
+                "Amenity WiFi already exists",
+                "Amenity Pool already exists",
+                "name cannot be empty",
+            ],
+        )
+        catalog = facade.get_amenity_catalog()
+        self.assertEqual(
+            sorted(item["name"] for item in catalog.items), ["Pool", "WiFi"]
+        )
+
+    def test_reviews_update_aggregates(self):
+        first, second = [
+            r["id"]
+            for r in facade.bulk_create_places(
+                [{"title": "A", "price": 1}, {"title": "B", "price": 1}],
+                self.owner_id,
+            )
+        ]
+        facade.create_review(
+            {"text": "Fine", "rating": 3, "place_id": second}, self.guest_id
+        )
+        results = facade.bulk_create_reviews(
+            [
+                {"text": "Great", "rating": 5, "place_id": first},
+                {"text": "Again", "rating": 4, "place_id": first},
+                {"text": "Twice", "rating": 4, "place_id": second},
+                {"text": "Lost", "rating": 4, "place_id": "missing"},
+                {"text": "Bad", "rating": 9, "place_id": first},
+            ],
+            self.guest_id,
+        )
+        self.assertIn("id", results[0])
+        self.assertEqual(
+            [r["error"] for r in results[1:]],
+            [
+                "Already reviewed this place",
+                "Already reviewed this place",
+                "Place not found",
+                "rating must be between 1 and 5",
+            ],
+        )
+        place = facade.get_place(first)
+        self.assertEqual((place.review_count, place.rating_avg), (1, 5.0))
+
+        own = facade.bulk_create_reviews(
+            [{"text": "Mine", "rating": 5, "place_id": first}], self.owner_id
+        )
+        self.assertEqual(own[0]["error"], "Cannot review your own place")
+
+    def test_too_many_items(self):
+        with self.assertRaises(ValueError):
+            facade.bulk_create_amenities([{"name": "x"}] * 10001)
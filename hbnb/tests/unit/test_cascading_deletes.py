@@ -0,0 +1,109 @@
+"""Set-based deletes of users, places and amenities."""
+
+from tests.base import BaseTestCase
+from app.db import db
+from app.models.association_tables import place_amenities
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import facade
+
+
+class TestCascadingDeletes(BaseTestCase):
+    """One DELETE per table, with the affected row counts"""
+
+    def setUp(self):
+        super().setUp()
+        self.host = self.make_user("host@test.com").id
+        self.guest = self.make_user("guest@test.com").id
+        self.other = self.make_user("other@test.com").id
+        self.wifi = facade.create_amenity({"name": "WiFi"}).id
+        self.places = [
+            facade.create_place(
+                {
+                    "title": f"Place {i}",
+                    "price": 10,
+                    "amenity_ids": [self.wifi],
+                },
+                self.host,
+            ).id
+            for i in range(3)
+        ]
+        self.elsewhere = facade.create_place(
+            {"title": "Elsewhere", "price": 10}, self.other
+        ).id
+        for place_id in self.places:
+            self._review(self.guest, place_id, 5)
+            self._review(self.other, place_id, 3)
+        self._review(self.host, self.elsewhere, 1)
+        self._review(self.guest, self.elsewhere, 5)
+        db.session.expunge_all()
+        self.statements = self.record_queries()
+
+    def _deleted_tables(self):
+        return [
+            statement.split()[2]
+            for statement in self.statements
+            if statement.startswith("DELETE")
+        ]
+
+    def _review(self, user_id, place_id, rating):
+        facade.create_review(
+            {"text": "Fine", "rating": rating, "place_id": place_id}, user_id
+        )
+
+    def _links(self):
+        return db.session.execute(
+            db.select(db.func.count()).select_from(place_amenities)
+        ).scalar()
+
+    def test_delete_user(self):
+        counts = facade.delete_user(self.host)
+        self.assertEqual(
+            counts,
+            {"users": 1, "places": 3, "reviews": 7, "place_amenities": 3},
+        )
+        self.assertEqual(
+            sorted(self._deleted_tables()),
+            ["place_amenities", "places", "reviews", "reviews", "users"],
+        )
+        self.assertIsNone(facade.get_user(self.host))
+        self.assertEqual(Place.query.count(), 1)
+        self.assertEqual(Review.query.count(), 1)
+        self.assertEqual(self._links(), 0)
+        # The host's review of another place left its aggregates
+        elsewhere = facade.get_place(self.elsewhere)
+        self.assertEqual(
+            (elsewhere.review_count, elsewhere.rating_avg), (1, 5.0)
+        )
+        admin = self.make_user("admin@test.com", is_admin=True).id
+        stats = facade.admin_get_stats(admin)
+        self.assertEqual(
+            [stats[f"{t}_count"] for t in ("users", "places", "reviews")],
+            [3, 1, 1],
+        )
+
+    def test_delete_place(self):
+        counts = facade.delete_place(self.places[0], self.host)
+        self.assertEqual(
+            counts, {"places": 1, "reviews": 2, "place_amenities": 1}
+        )
+        self.assertIsNone(facade.get_place(self.places[0]))
+        self.assertEqual(Review.query.count(), 6)
+        self.assertEqual(self._links(), 2)
+
+    def test_delete_amenity(self):
+        counts = facade.delete_amenity(self.wifi)
+        self.assertEqual(counts, {"amenities": 1, "place_amenities": 3})
+        self.assertIsNone(facade.get_amenity(self.wifi))
+        self.assertEqual(self._links(), 0)
+
+    def test_nothing_left_for_the_next_transaction(self):
+        facade.delete_user(self.guest)
+        facade.delete_place(self.places[0], self.host)
+        self.assertNotIn("after_commit", db.session.info)
+
+    def test_missing_rows(self):
+        self.assertEqual(facade.delete_user("missing"), {})
+        self.assertEqual(facade.delete_place("missing"), {})
+        self.assertEqual(facade.delete_amenity("missing"), {})
+        self.assertEqual(self._deleted_tables(), [])
@@ -0,0 +1,72 @@
+"""Version probes behind the conditional GETs."""
+
+from tests.base import BaseTestCase
+from app.api.v1.conditional import conditional_collection
+from app.services.facade import facade
+
+
+class TestVersionProbes(BaseTestCase):
+    """updated_at is read without loading the rows"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user("owner@test.com")
+        self.place = facade.create_place(
+            {"title": "Villa", "price": 200.0}, self.owner.id
+        )
+
+    def test_last_modified_moves_on_update(self):
+        """An update changes the version of the row"""
+        before = facade.get_last_modified("places", self.place.id)
+        self.assertIsNotNone(before)
+        facade.update_place(self.place.id, {"price": 250.0})
+        after = facade.get_last_modified("places", self.place.id)
+        self.assertGreater(after, before)
+
+    def test_last_modified_missing_row(self):
+        """Unknown ids have no version"""
+        self.assertIsNone(facade.get_last_modified("places", "missing"))
+
+    def test_collection_version_counts_rows(self):
+        """Adding or removing a row changes the collection version"""
+        newest, count = facade.get_collection_version("places")
+        self.assertEqual(count, 1)
+        self.assertEqual(newest, self.place.updated_at)
+        other = facade.create_place(
+            {"title": "Flat", "price": 50.0}, self.owner.id
+        )
+        self.assertEqual(facade.get_collection_version("places")[1], 2)
+        facade.delete_place(other.id, self.owner.id)
+        self.assertEqual(
+            facade.get_collection_version("places"), (newest, count)
+        )
+
+    def test_collection_version_criteria(self):
+        """A collection can be narrowed to the rows of one parent"""
+        self.assertEqual(
+            facade.get_collection_version("reviews", place_id=self.place.id),
+            (None, 0),
+        )
+
+    def test_collection_skip_args(self):
+        """Filters the tag does not follow always run the view"""
+        calls = []
+
+        @conditional_collection("places", skip_args=("amenities",))
+        def view():
+            calls.append(True)
+            return {"items": []}, 200
+
+        def get(url, etag=None):
+            headers = {"If-None-Match": etag} if etag else {}
+            with self.app.test_request_context(url, headers=headers):
+                return view()
+
+        etag = get("/api/v1/places/")[2]["ETag"]
+        self.assertEqual(get("/api/v1/places/", etag).status_code, 304)
+        self.assertEqual(len(calls), 1)
+
+        filtered = "/api/v1/places/?amenities=wifi"
+        self.assertEqual(get(filtered, etag)[1], 200)
+        self.assertEqual(get(filtered, etag)[1], 200)
+        self.assertEqual(len(calls), 3)
@@ -0,0 +1,34 @@
+"""Settings of config.py applied by create_app."""
+
+from tests.base import BaseTestCase
+from app import create_app
+from app.services.cache import entity_cache
+from app.services.facade import facade
+from app.services.idempotency import idempotency_store
+from config import TestingConfig, config
+
+
+class SmallConfig(TestingConfig):
+    ENTITY_CACHE_SIZE = 3
+    BULK_BATCH_SIZE = 7
+
+
+class TestConfig(BaseTestCase):
+    """create_app loads the configuration object it is named after"""
+
+    def test_testing_config_is_loaded(self):
+        self.assertEqual(self.app.config["IDEMPOTENCY_PURGE_INTERVAL"], 0)
+        # TestingConfig disables the background purge of idempotency keys
+        self.assertEqual(idempotency_store.purge_interval, 0)
+        self.assertFalse(idempotency_store.purge_job.running)
+        self.assertFalse(facade.reconcile_job.running)
+
+    def test_settings_reach_the_services(self):
+        config["small"] = SmallConfig
+        try:
+            app = create_app("small")
+        finally:
+            del config["small"]
+        self.assertEqual(app.config["BULK_BATCH_SIZE"], 7)
+        self.assertEqual(facade.bulk_batch_size, 7)
+        self.assertEqual(entity_cache.backend.max_size, 3)
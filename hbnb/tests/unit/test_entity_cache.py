@@ -0,0 +1,98 @@
+"""Read-through entity cache of the facade."""
+
+from tests.base import BaseTestCase
+from app.db import db
+from app.services.cache import LRUCache, cache_hits, entity_cache
+from app.services.facade import facade
+
+
+class TestLRUCache(BaseTestCase):
+    """Bounds of the in-process backend"""
+
+    def test_size_bound_evicts_least_recent(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set(("places", "a"), 1)
+        cache.set(("places", "b"), 2)
+        cache.get(("places", "a"))
+        cache.set(("places", "c"), 3)
+        self.assertIsNone(cache.get(("places", "b")))
+        self.assertEqual(cache.get(("places", "a")), 1)
+
+    def test_ttl(self):
+        cache = LRUCache(max_size=2, ttl=0)
+        cache.set(("places", "a"), 1)
+        self.assertIsNone(cache.get(("places", "a")))
+
+
+class TestEntityCache(BaseTestCase):
+    """Getters skip the database once a row is cached"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user("owner@test.com")
+        self.owner_id = self.owner.id
+        self.place_id = facade.create_place(
+            {"title": "Villa", "price": 200.0}, self.owner_id
+        ).id
+        self.amenity_id = facade.create_amenity({"name": "WiFi"}).id
+        db.session.expunge_all()
+        self.statements = self.record_queries()
+
+    def _fresh_request(self):
+        """Forget the identity map, as a new request would"""
+        db.session.remove()
+        self.statements.clear()
+
+    def test_second_lookup_is_served_from_cache(self):
+        facade.get_place(self.place_id)
+        self._fresh_request()
+        hits = cache_hits.labels("places")._value.get()
+        place = facade.get_place(self.place_id)
+        self.assertEqual(place.title, "Villa")
+        self.assertEqual(place.owner_id, self.owner_id)
+        self.assertEqual(self.statements, [])
+        self.assertEqual(cache_hits.labels("places")._value.get(), hits + 1)
+
+    def test_cached_entity_can_be_updated(self):
+        facade.get_place(self.place_id)
+        self._fresh_request()
+        facade.update_place(self.place_id, {"price": 300.0}, self.owner_id)
+        self._fresh_request()
+        self.assertEqual(facade.get_place(self.place_id).price, 300.0)
+
+    def test_review_invalidates_rating_aggregates(self):
+        guest = self.make_user("guest@test.com")
+        facade.get_place(self.place_id)
+        facade.create_review(
+            {"text": "Great", "rating": 4, "place_id": self.place_id},
+            guest.id,
+        )
+        self._fresh_request()
+        self.assertEqual(facade.get_place(self.place_id).review_count, 1)
+
+    def test_amenity_link_invalidates_place(self):
+        facade.get_place(self.place_id)
+        facade.add_place_amenity(self.place_id, self.amenity_id)
+        self.assertIsNone(entity_cache.get("places", self.place_id))
+
+    def test_delete_invalidates(self):
+        facade.get_place(self.place_id)
+        facade.delete_place(self.place_id, self.owner_id)
+        self._fresh_request()
+        self.assertIsNone(facade.get_place(self.place_id))
+
+    def test_user_update_invalidates(self):
+        facade.get_user(self.owner_id)
+        facade.update_user(self.owner_id, {"first_name": "Renamed"})
+        self._fresh_request()
+        self.assertEqual(facade.get_user(self.owner_id).first_name, "Renamed")
+
+    def test_rollback_does_not_cache_uncommitted_rows(self):
+        place = facade.get_place(self.place_id)
+        place.title = "Draft"
+        db.session.flush()
+        db.session.expire(place)
+        facade.get_place(self.place_id)
+        db.session.rollback()
+        self._fresh_request()
+        self.assertEqual(facade.get_place(self.place_id).title, "Villa")
@@ -0,0 +1,80 @@
+"""Negative lookups of unknown identifiers."""
+
+import uuid
+from tests.base import BaseTestCase
+from app.db import db
+from app.models.place import Place
+from app.services.existence import BloomFilter, existence_filter
+from app.services.facade import facade
+
+
+class TestBloomFilter(BaseTestCase):
+    """No false negatives, few false positives"""
+
+    def test_membership(self):
+        bloom = BloomFilter(1000, 0.01)
+        members = [str(uuid.uuid4()) for _ in range(1000)]
+        for member in members:
+            bloom.add(member)
+        self.assertTrue(all(member in bloom for member in members))
+        strangers = [str(uuid.uuid4()) for _ in range(1000)]
+        false_positives = sum(stranger in bloom for stranger in strangers)
+        self.assertLess(false_positives, 50)
+
+
+class TestExistenceFilter(BaseTestCase):
+    """Unknown identifiers stop reaching the database"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner_id = self.make_user("owner@test.com").id
+        self.statements = self.record_queries()
+
+    def tearDown(self):
+        existence_filter.configure({})
+        super().tearDown()
+
+    def _create_place(self):
+        return facade.create_place(
+            {"title": "Villa", "price": 200.0}, self.owner_id
+        ).id
+
+    def test_miss_is_remembered(self):
+        unknown = str(uuid.uuid4())
+        self.assertIsNone(facade.get_place(unknown))
+        self.statements.clear()
+        self.assertIsNone(facade.get_place(unknown))
+        self.assertIsNone(facade.get_place(unknown, load="detail"))
+        self.assertIsNone(facade.get_last_modified("places", unknown))
+        self.assertEqual(self.statements, [])
+
+    def test_deleted_row_is_missing(self):
+        place_id = self._create_place()
+        facade.delete_place(place_id)
+        db.session.remove()
+        self.statements.clear()
+        self.assertIsNone(facade.get_place(place_id))
+        self.assertEqual(self.statements, [])
+
+    def test_bloom_filter(self):
+        existence_filter.configure({"EXISTENCE_BLOOM_ENABLED": True})
+        place_id = self._create_place()
+        existence_filter.build([Place])
+        later_id = self._create_place()
+        db.session.remove()
+
+        self.statements.clear()
+        self.assertIsNone(facade.get_place(str(uuid.uuid4())))
+        self.assertEqual(self.statements, [])
+        self.assertEqual(facade.get_place(place_id).id, place_id)
+        self.assertEqual(facade.get_place(later_id).id, later_id)
+
+    def test_rolled_back_insert(self):
+        existence_filter.configure({"EXISTENCE_BLOOM_ENABLED": True})
+        existence_filter.build([Place])
+        place = Place(title="Draft", price=1.0, owner_id=self.owner_id)
+        db.session.add(place)
+        db.session.flush()
+        db.session.rollback()
+        # Still "maybe present" in the filter, so the database answers
+        self.assertIsNone(facade.get_place(place.id))
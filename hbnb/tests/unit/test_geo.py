@@ -0,0 +1,33 @@
+"""Tests for geohash cells and distances."""
+
+import unittest
+from app.geo import covering_cells, encode_geohash, haversine_km
+
+
+class TestGeo(unittest.TestCase):
+    """Geohash encoding and circle coverage."""
+
+    def test_encode_reference_point(self):
+        """Matches the reference geohash of a known coordinate"""
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+
+    def test_haversine_paris_lyon(self):
+        """Paris to Lyon is roughly 392 km"""
+        distance = haversine_km(48.8566, 2.3522, 45.764, 4.8357)
+        self.assertAlmostEqual(distance, 392, delta=3)
+
+    def test_cells_cover_circle(self):
+        """Points on the circle edge fall inside one of the cells"""
+        lat, lon, radius = 48.8566, 2.3522, 5.0
+        cells = covering_cells(lat, lon, radius)
+        for dlat, dlon in [(0.044, 0), (-0.044, 0), (0, 0.067), (0, -0.067)]:
+            point = encode_geohash(lat + dlat, lon + dlon)
+            self.assertTrue(any(point.startswith(c) for c in cells))
+
+    def test_polar_circle_falls_back(self):
+        """No cell precision fits a circle around the pole"""
+        self.assertIsNone(covering_cells(89.99, 0, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Idempotency keys of the create endpoints."""
+
+import json
+from datetime import timedelta
+from flask_jwt_extended import JWTManager
+from werkzeug.exceptions import HTTPException
+from tests.base import BaseTestCase
+from app.api.v1.idempotency import idempotent
+from app.db import db
+from app.models.idempotency_key import IdempotencyKey
+from app.services.idempotency import _now, digest, idempotency_store
+
+
+class TestIdempotencyStore(BaseTestCase):
+    """Claims, stored responses and the purge"""
+
+    def test_claim_then_replay(self):
+        key, body = digest("key"), digest("body")
+        self.assertIsNone(idempotency_store.claim(key, body))
+        self.assertIsNone(idempotency_store.claim(key, body).status)
+
+        idempotency_store.complete(key, 201, '{"id": "1"}')
+        stored = idempotency_store.claim(key, body)
+        self.assertEqual((stored.status, stored.body), (201, '{"id": "1"}'))
+
+    def test_release_frees_the_key(self):
+        key = digest("key")
+        idempotency_store.claim(key, digest("body"))
+        idempotency_store.release(key)
+        self.assertIsNone(idempotency_store.claim(key, digest("body")))
+
+    def test_purge_and_expiry(self):
+        old, live = digest("old"), digest("live")
+        idempotency_store.claim(old, digest("body"))
+        idempotency_store.claim(live, digest("body"))
+        idempotency_store.complete(live, 201, "{}")
+        db.session.get(IdempotencyKey, old).expires_at = _now() - timedelta(
+            seconds=1
+        )
+        db.session.commit()
+
+        # An expired claim no longer holds its key
+        self.assertIsNone(idempotency_store.claim(old, digest("other")))
+        db.session.get(IdempotencyKey, old).expires_at = _now()
+        db.session.commit()
+        self.assertEqual(idempotency_store.purge(), 1)
+        self.assertEqual(
+            [row.digest for row in IdempotencyKey.query.all()], [live]
+        )
+
+
+class TestIdempotentView(BaseTestCase):
+    """Retries with the same key replay the first response"""
+
+    def setUp(self):
+        super().setUp()
+        JWTManager(self.app)
+        self.calls = 0
+
+        @idempotent
+        def view():
+            self.calls += 1
+            return {"call": self.calls}, 201
+
+        self.view = view
+
+    def _post(self, body, key="retry-1"):
+        headers = {"Idempotency-Key": key} if key is not None else {}
+        with self.app.test_request_context(
+            "/api/v1/places/", method="POST", data=body, headers=headers
+        ):
+            return self.view()
+
+    def test_replay(self):
+        self.assertEqual(self._post('{"a": 1}'), ({"call": 1}, 201))
+        replay = self._post('{"a": 1}')
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(json.loads(replay.get_data()), {"call": 1})
+        self.assertEqual(replay.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(self.calls, 1)
+
+        # Other keys, or no key at all, run the view
+        self.assertEqual(self._post('{"a": 1}', key="retry-2")[0]["call"], 2)
+        self.assertEqual(self._post('{"a": 1}', key=None)[0]["call"], 3)
+
+    def test_key_reused_for_another_body(self):
+        self._post('{"a": 1}')
+        with self.assertRaises(HTTPException) as raised:
+            self._post('{"a": 2}')
+        self.assertEqual(raised.exception.code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_failed_request_can_be_retried(self):
+        def failing():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            with self.app.test_request_context(
+                "/", method="POST", headers={"Idempotency-Key": "k"}
+            ):
+                idempotent(failing)()
+        with self.app.test_request_context(
+            "/", method="POST", headers={"Idempotency-Key": "k"}
+        ):
+            self.assertEqual(self.view(), ({"call": 1}, 201))
+
+    def test_error_responses_are_not_stored(self):
+        def invalid():
+            self.calls += 1
+            return {"message": "Invalid input"}, 400
+
+        for _ in range(2):
+            with self.app.test_request_context(
+                "/", method="POST", headers={"Idempotency-Key": "bad"}
+            ):
+                self.assertEqual(idempotent(invalid)()[1], 400)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(IdempotencyKey.query.count(), 0)
@@ -0,0 +1,73 @@
+"""Query counts of the place loading profiles."""
+
+from contextlib import contextmanager
+from tests.base import BaseTestCase
+from app.db import db
+from app.services.facade import facade
+
+
+class TestLoadingProfiles(BaseTestCase):
+    """Each endpoint path issues a fixed number of queries."""
+
+    def setUp(self):
+        super().setUp()
+        owner = self.make_user("owner@test.com")
+        guest = self.make_user("guest@test.com")
+        wifi = facade.create_amenity({"name": "WiFi"})
+        pool = facade.create_amenity({"name": "Pool"})
+        self.place_id = facade.create_place(
+            {
+                "title": "Villa",
+                "price": 200.0,
+                "amenity_ids": [wifi.id, pool.id],
+            },
+            owner.id,
+        ).id
+        for i in range(3):
+            facade.create_place(
+                {"title": f"Flat {i}", "price": 50.0}, owner.id
+            )
+        facade.create_review(
+            {"text": "Great", "rating": 5, "place_id": self.place_id},
+            guest.id,
+        )
+        # Amenity catalog already in memory, as in steady state
+        facade.get_amenity_catalog()
+        db.session.expunge_all()
+
+    @contextmanager
+    def assertQueryCount(self, expected):
+        with self.recorded_queries() as statements:
+            yield
+        self.assertEqual(len(statements), expected, "\n".join(statements))
+
+    def test_get_place_for_ownership_check(self):
+        """PUT/DELETE /places/<id> and GET /places/<id>: the row only"""
+        with self.assertQueryCount(1):
+            place = facade.get_place(self.place_id)
+            place.owner_id
+
+    def test_get_place_with_amenities(self):
+        """Amenity linking: the row plus one SELECT ... IN"""
+        with self.assertQueryCount(2):
+            place = facade.get_place(self.place_id, load="amenities")
+            self.assertEqual(len(place.amenities), 2)
+
+    def test_get_place_with_amenities_detail(self):
+        """Place detail: row with owner, reviews, amenity links"""
+        with self.assertQueryCount(3):
+            detail = facade.get_place_with_amenities(self.place_id)
+        self.assertEqual(len(detail["amenities"]), 2)
+        self.assertEqual(len(detail["reviews"]), 1)
+
+    def test_list_places(self):
+        """GET /places/: one query per page whatever its size"""
+        with self.assertQueryCount(1):
+            page = facade.list_places(limit=10)
+            [place.title for place in page["items"]]
+
+    def test_list_place_reviews(self):
+        """GET /reviews/places/<id>/reviews: existence check and page"""
+        with self.assertQueryCount(2):
+            facade.get_place(self.place_id)
+            facade.list_reviews(place_id=self.place_id)
@@ -0,0 +1,72 @@
+"""Structured background logging."""
+
+import io
+import json
+import logging
+from tests.base import BaseTestCase
+from app.log import configure_logging, _flush_logs
+
+
+class TestStructuredLogging(BaseTestCase):
+    """JSON records, per-module levels and sampling"""
+
+    def setUp(self):
+        super().setUp()
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        configure_logging({"LOG_LEVELS": {"app.persistence": "NOTSET"}})
+        super().tearDown()
+
+    def _records(self):
+        _flush_logs()
+        return [
+            json.loads(line) for line in self.stream.getvalue().splitlines()
+        ]
+
+    def test_json_records_with_extra_fields(self):
+        configure_logging({"LOG_LEVEL": "INFO"}, stream=self.stream)
+        logger = logging.getLogger("app.api.v1.auth")
+        logger.info("Login failed", extra={"reason": "invalid_credentials"})
+        logger.debug("Not written")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Login error")
+
+        first, second = self._records()
+        self.assertEqual(first["level"], "INFO")
+        self.assertEqual(first["logger"], "app.api.v1.auth")
+        self.assertEqual(first["message"], "Login failed")
+        self.assertEqual(first["reason"], "invalid_credentials")
+        self.assertIn("ValueError: boom", second["exception"])
+
+    def test_module_levels(self):
+        configure_logging(
+            {
+                "LOG_LEVEL": "WARNING",
+                "LOG_LEVELS": {"app.persistence": "DEBUG"},
+            },
+            stream=self.stream,
+        )
+        logging.getLogger("app.persistence.repository").debug("Kept %s", 1)
+        logging.getLogger("app.api").info("Dropped")
+        self.assertEqual(
+            [record["message"] for record in self._records()], ["Kept 1"]
+        )
+
+    def test_sampling(self):
+        configure_logging(
+            {"LOG_LEVEL": "DEBUG", "LOG_SAMPLING": {"app.persistence": 0.1}},
+            stream=self.stream,
+        )
+        repository = logging.getLogger("app.persistence.repository")
+        for i in range(100):
+            repository.debug("Call %s", i)
+        repository.warning("Always kept")
+        logging.getLogger("app.api").debug("Not sampled")
+
+        messages = [record["message"] for record in self._records()]
+        self.assertEqual(len(messages), 12)
+        self.assertIn("Always kept", messages)
+        self.assertIn("Not sampled", messages)
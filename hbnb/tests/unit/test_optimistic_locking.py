@@ -0,0 +1,133 @@
+"""Optimistic concurrency on the version column."""
+
+from sqlalchemy import event, update
+from werkzeug.exceptions import HTTPException
+from tests.base import BaseTestCase
+from app.api.v1.conditional import _entity_etag, expected_version, if_match
+from app.db import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import ConflictError, facade
+
+
+class TestOptimisticLocking(BaseTestCase):
+    """Updates only match the row at the version they were based on"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner_id = self.make_user("owner@test.com").id
+        self.place = facade.create_place(
+            {"title": "Villa", "price": 10}, self.owner_id
+        )
+        self.place_id = self.place.id
+
+    def test_update_bumps_version(self):
+        self.assertEqual(self.place.version, 1)
+        with self.recorded_queries() as statements:
+            facade.update_place(self.place.id, {"price": 20}, version=1)
+        updates = [s for s in statements if s.startswith("UPDATE places")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("places.version = ?", updates[0])
+        self.assertEqual(facade.get_place(self.place.id).version, 2)
+
+    def test_stale_version_refused(self):
+        facade.update_place(self.place.id, {"price": 20})
+        with self.assertRaises(ConflictError):
+            facade.update_place(self.place.id, {"price": 30}, version=1)
+        self.assertEqual(facade.get_place(self.place.id).price, 20)
+
+    def _bump_elsewhere(self):
+        """Another process moves the row past the cached version"""
+        db.session.execute(
+            update(Place.__table__)
+            .where(Place.__table__.c.id == self.place_id)
+            .values(title="Theirs", version=Place.__table__.c.version + 1)
+        )
+
+    def test_stale_cache_is_not_a_conflict(self):
+        db.session.expunge_all()
+        facade.get_place(self.place_id)
+        self._bump_elsewhere()
+        db.session.commit()
+        db.session.expunge_all()
+        self.assertEqual(facade.get_place(self.place_id).version, 1)
+
+        # The version checked is the row's, not the cached one
+        place = facade.update_place(self.place_id, {"title": "Mine"})
+        self.assertEqual(place.version, 3)
+        facade.update_place(self.place_id, {"price": 30}, version=3)
+        with self.assertRaises(ConflictError):
+            facade.update_place(self.place_id, {"price": 40}, version=3)
+
+    def test_stale_cache_amenity_and_review_writes(self):
+        amenity_id = facade.create_amenity({"name": "WiFi"}).id
+        review_id = facade.create_review(
+            {"text": "Fine", "rating": 4, "place_id": self.place_id},
+            self.make_user("guest@test.com").id,
+        ).id
+        db.session.expunge_all()
+        facade.get_amenity(amenity_id)
+        facade.get_review(review_id)
+        for model, entity_id in ((Amenity, amenity_id), (Review, review_id)):
+            table = model.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.id == entity_id)
+                .values(version=table.c.version + 1)
+            )
+        db.session.commit()
+        db.session.expunge_all()
+
+        amenity = facade.update_amenity(amenity_id, {"name": "Pool"})
+        self.assertEqual((amenity.name, amenity.version), ("Pool", 3))
+        self.assertTrue(facade.delete_review(review_id))
+        self.assertIsNone(facade.get_review(review_id))
+
+    def test_lost_race_retried_without_expected_version(self):
+        flushes = []
+
+        def race(session, context, instances):
+            flushes.append(True)
+            if len(flushes) == 1:
+                self._bump_elsewhere()
+
+        event.listen(db.session, "before_flush", race)
+        try:
+            facade.update_place(self.place_id, {"title": "Mine"})
+        finally:
+            event.remove(db.session, "before_flush", race)
+        self.assertEqual(len(flushes), 2)
+        db.session.expire_all()
+        self.assertEqual(facade.get_place(self.place_id).title, "Mine")
+
+    def test_lost_race_with_expected_version(self):
+        def race(session, context, instances):
+            self._bump_elsewhere()
+
+        event.listen(db.session, "before_flush", race, once=True)
+        with self.assertRaises(ConflictError):
+            facade.update_place(self.place_id, {"title": "Mine"}, version=1)
+        db.session.expire_all()
+        self.assertNotEqual(facade.get_place(self.place_id).title, "Mine")
+
+    def test_if_match(self):
+        @if_match("places", "place_id")
+        def view(place_id):
+            return expected_version()
+
+        def put(tag):
+            with self.app.test_request_context(
+                method="PUT", headers={"If-Match": tag} if tag else {}
+            ):
+                return view(place_id=self.place.id)
+
+        current = _entity_etag(
+            "places", self.place.id, 1, self.place.updated_at
+        )
+        self.assertIsNone(put(None))
+        self.assertEqual(put(f'"{current}"'), 1)
+        self.assertEqual(put("*"), 1)
+        with self.assertRaises(HTTPException) as raised:
+            put('"stale"')
+        self.assertEqual(raised.exception.code, 412)
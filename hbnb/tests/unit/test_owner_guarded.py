@@ -0,0 +1,121 @@
+"""Owner-guarded single-statement updates and deletes."""
+
+from tests.base import BaseTestCase
+from app.db import db
+from app.models.admin_stat import AdminStat
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import (
+    ConflictError,
+    ForbiddenError,
+    NotFoundError,
+    facade,
+)
+
+
+class TestOwnerGuarded(BaseTestCase):
+    """The guard is in the WHERE clause; a probe runs only on a miss"""
+
+    def setUp(self):
+        super().setUp()
+        self.host = self.make_user("host@test.com").id
+        self.guest = self.make_user("guest@test.com").id
+        self.place = facade.create_place(
+            {"title": "Villa", "price": 10}, self.host
+        ).id
+        self.review = facade.create_review(
+            {"text": "Fine", "rating": 4, "place_id": self.place}, self.guest
+        ).id
+        facade.reconcile_admin_stats()
+        db.session.expunge_all()
+        self.statements = self.record_queries()
+
+    def _queries(self):
+        return [
+            " ".join(statement.split()[:3])
+            for statement in self.statements
+            if statement.split()[0] in ("SELECT", "UPDATE", "DELETE")
+        ]
+
+    def _stats_consistent(self):
+        stored = {row.name: row.value for row in AdminStat.query}
+        counted = facade.reconcile_admin_stats()
+        self.assertEqual(stored["places"], counted["places_count"])
+        self.assertEqual(stored["reviews"], counted["reviews_count"])
+        self.assertEqual(
+            stored["rating_sum"],
+            counted["average_rating"] * counted["reviews_count"],
+        )
+
+    def test_update_place(self):
+        place = facade.update_place_if_owner(
+            self.place,
+            {"price": 20, "latitude": 48.85, "longitude": 2.35},
+            self.host,
+            version=1,
+        )
+        self.assertEqual(self._queries(), ["UPDATE places SET"])
+        self.assertEqual((place.price, place.version), (20, 2))
+        self.assertIsNotNone(place.geohash)
+        self.assertEqual(db.session.get(Place, self.place).price, 20)
+
+    def test_update_place_misses(self):
+        with self.assertRaises(ForbiddenError):
+            facade.update_place_if_owner(self.place, {"price": 1}, self.guest)
+        with self.assertRaises(ConflictError):
+            facade.update_place_if_owner(
+                self.place, {"price": 1}, self.host, version=7
+            )
+        with self.assertRaises(NotFoundError):
+            facade.update_place_if_owner("missing", {"price": 1}, self.host)
+        with self.assertRaises(ValueError):
+            facade.update_place_if_owner(self.place, {"title": ""}, self.host)
+        self.assertEqual(db.session.get(Place, self.place).price, 10)
+
+    def test_delete_place(self):
+        with self.assertRaises(ForbiddenError):
+            facade.delete_place_if_owner(self.place, self.guest)
+        self.assertIsNotNone(db.session.get(Place, self.place))
+
+        counts = facade.delete_place_if_owner(self.place, self.host)
+        self.assertEqual((counts["places"], counts["reviews"]), (1, 1))
+        self.assertIsNone(db.session.get(Place, self.place))
+        self._stats_consistent()
+        with self.assertRaises(NotFoundError):
+            facade.delete_place_if_owner(self.place, self.host)
+
+    def test_update_review_rating(self):
+        review = facade.update_review_if_author(
+            self.review, {"rating": 2, "text": "Meh"}, self.guest
+        )
+        self.assertEqual((review.rating, review.text), (2, "Meh"))
+        place = db.session.get(Place, self.place)
+        self.assertEqual((place.rating_sum, place.stars_2), (2, 1))
+        self.assertEqual(place.stars_4, 0)
+        self._stats_consistent()
+
+    def test_update_review_text_is_one_statement(self):
+        facade.update_review_if_author(self.review, {"text": "Ok"}, self.guest)
+        self.assertEqual(self._queries(), ["UPDATE reviews SET"])
+
+    def test_update_review_misses(self):
+        with self.assertRaises(ForbiddenError):
+            facade.update_review_if_author(
+                self.review, {"rating": 1}, self.host
+            )
+        with self.assertRaisesRegex(ValueError, "place of a review"):
+            facade.update_review_if_author(
+                self.review, {"text": "Ok", "place_id": "other"}, self.guest
+            )
+        self.assertEqual(db.session.get(Review, self.review).rating, 4)
+
+    def test_delete_review(self):
+        with self.assertRaises(ForbiddenError):
+            facade.delete_review_if_author(self.review, self.host)
+        facade.delete_review_if_author(self.review, self.guest)
+        self.assertIsNone(db.session.get(Review, self.review))
+        place = db.session.get(Place, self.place)
+        self.assertEqual((place.review_count, place.rating_sum), (0, 0))
+        self._stats_consistent()
+        with self.assertRaises(NotFoundError):
+            facade.delete_review_if_author(self.review, self.guest)
@@ -0,0 +1,58 @@
+"""Tests for keyset pagination in the facade."""
+
+from tests.base import BaseTestCase
+from app.services.facade import facade
+
+
+class TestKeysetPagination(BaseTestCase):
+    """Pages are stable, complete and never overlap."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user("owner@test.com")
+        for i in range(7):
+            facade.create_place(
+                {"title": f"Place {i}", "price": 10.0 + i}, self.owner.id
+            )
+
+    def test_walks_every_place_once(self):
+        """Following `next` returns each place exactly once"""
+        seen, cursor = [], None
+        while True:
+            page = facade.list_places(limit=3, cursor=cursor)
+            self.assertLessEqual(len(page["items"]), 3)
+            seen.extend(place.id for place in page["items"])
+            cursor = page["next"]
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_last_page_has_no_cursor(self):
+        """A page that reaches the end does not hand out a cursor"""
+        page = facade.list_places(limit=50)
+        self.assertEqual(len(page["items"]), 7)
+        self.assertIsNone(page["next"])
+
+    def test_invalid_cursor(self):
+        """A tampered cursor is rejected"""
+        with self.assertRaises(ValueError):
+            facade.list_places(cursor="not-a-cursor")
+
+    def test_stream_matches_pages(self):
+        """Streaming yields the same places in the same order as paging"""
+        paged = [place.id for place in facade.list_places(limit=50)["items"]]
+        streamed = [place.id for place in facade.stream_places()]
+        self.assertEqual(streamed, paged)
+
+    def test_stream_from_cursor(self):
+        """A stream can resume after the last item of a page"""
+        page = facade.list_places(limit=3)
+        rest = list(facade.stream_places(cursor=page["next"], fields=["id"]))
+        self.assertEqual(len(rest), 4)
+        self.assertEqual(set(rest[0]), {"id"})
+
+    def test_stream_rejects_bad_input_early(self):
+        """Invalid cursors raise before any row is produced"""
+        with self.assertRaises(ValueError):
+            facade.stream_places(cursor="not-a-cursor")
@@ -0,0 +1,124 @@
+"""Password hashing service."""
+
+import threading
+from contextlib import contextmanager
+from tests.base import BaseTestCase
+from app.api.v1.users import UserList
+from app.models.user import User
+from app.services.facade import facade
+from app.services.passwords import PasswordHasherBusy, password_hasher
+
+FAST = {
+    "scrypt": {"PASSWORD_HASH_METHOD": "scrypt", "PASSWORD_HASH_COST": 1024},
+    "pbkdf2": {"PASSWORD_HASH_METHOD": "pbkdf2", "PASSWORD_HASH_COST": 1000},
+    "bcrypt": {"PASSWORD_HASH_METHOD": "bcrypt", "BCRYPT_LOG_ROUNDS": 4},
+}
+
+
+class TestPasswordHasher(BaseTestCase):
+    """Methods, costs and the bounded pool"""
+
+    def tearDown(self):
+        password_hasher.configure({})
+        super().tearDown()
+
+    def test_methods(self):
+        for method, config in FAST.items():
+            with self.subTest(method=method):
+                password_hasher.configure(config)
+                stored = password_hasher.hash("secret")
+                self.assertTrue(password_hasher.verify(stored, "secret"))
+                self.assertFalse(password_hasher.verify(stored, "wrong"))
+                self.assertFalse(password_hasher.needs_rehash(stored))
+
+    def test_other_parameters_need_rehash(self):
+        password_hasher.configure(FAST["pbkdf2"])
+        stored = password_hasher.hash("secret")
+        password_hasher.configure(
+            {**FAST["pbkdf2"], "PASSWORD_HASH_COST": 2000}
+        )
+        self.assertTrue(password_hasher.needs_rehash(stored))
+        password_hasher.configure(FAST["bcrypt"])
+        self.assertTrue(password_hasher.needs_rehash(stored))
+        # Hashes of another method still verify
+        self.assertTrue(password_hasher.verify(stored, "secret"))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            password_hasher.configure({"PASSWORD_HASH_METHOD": "md5"})
+
+    @contextmanager
+    def saturated(self):
+        """Hold the only worker of a pool without queue"""
+        password_hasher.configure(
+            {
+                **FAST["pbkdf2"],
+                "PASSWORD_HASH_WORKERS": 1,
+                "PASSWORD_HASH_QUEUE_SIZE": 0,
+            }
+        )
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(
+            target=password_hasher._run, args=("hash", blocking)
+        )
+        worker.start()
+        started.wait(5)
+        try:
+            yield
+        finally:
+            release.set()
+            worker.join()
+
+    def test_full_queue_is_refused(self):
+        with self.saturated():
+            with self.assertRaises(PasswordHasherBusy):
+                password_hasher.hash("secret")
+        self.assertTrue(password_hasher.hash("secret"))
+
+    def test_user_writes_refused_when_saturated(self):
+        password_hasher.configure(FAST["pbkdf2"])
+        admin = self.make_user("admin@test.com", is_admin=True)
+        identity = facade.token_claims(admin)
+        payload = {
+            "email": "new@test.com",
+            "first_name": "New",
+            "last_name": "User",
+            "password": "pass123",
+        }
+        with self.saturated():
+            with self.app.test_request_context(
+                "/api/v1/users/", method="POST", json=payload
+            ):
+                body, status = UserList().post()
+            with self.assertRaises(PasswordHasherBusy):
+                facade.admin_create_user(dict(payload), identity)
+            with self.assertRaises(PasswordHasherBusy):
+                facade.admin_update_user(
+                    admin.id, {"password": "changed"}, identity
+                )
+        self.assertEqual(status, 503, body)
+        self.assertIsNone(User.query.filter_by(email="new@test.com").first())
+        self.assertEqual(
+            facade.authenticate_user("admin@test.com", "pass123").id, admin.id
+        )
+
+    def test_rehash_on_login(self):
+        password_hasher.configure(FAST["pbkdf2"])
+        user = self.make_user("user@test.com")
+        password_hasher.configure(FAST["bcrypt"])
+        self.assertIsNone(facade.authenticate_user("user@test.com", "nope"))
+        self.assertTrue(user.password.startswith("pbkdf2:"))
+
+        self.assertEqual(
+            facade.authenticate_user("user@test.com", "pass123").id, user.id
+        )
+        self.assertTrue(user.password.startswith("$2b$04$"))
+        self.assertFalse(password_hasher.needs_rehash(user.password))
+        self.assertEqual(
+            facade.authenticate_user("user@test.com", "pass123").id, user.id
+        )
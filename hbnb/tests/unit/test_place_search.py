@@ -0,0 +1,46 @@
+"""Tests for full-text place search."""
+
+from tests.base import BaseTestCase
+from app.services.facade import facade
+
+
+class TestPlaceSearch(BaseTestCase):
+    """Keyword search ranks matches and follows writes."""
+
+    def setUp(self):
+        super().setUp()
+        owner = self.make_user("owner@test.com")
+        self.loft = facade.create_place(
+            {
+                "title": "Sea view loft",
+                "description": "Bright loft",
+                "price": 120.0,
+            },
+            owner.id,
+        ).id
+        self.cabin = facade.create_place(
+            {
+                "title": "Cabin",
+                "description": "Quiet cabin with a sea view",
+                "price": 60.0,
+            },
+            owner.id,
+        ).id
+
+    def search(self, **filters):
+        return [place.id for place in facade.search_places(filters)]
+
+    def test_title_match_ranks_first(self):
+        """Matches in the title outrank matches in the description"""
+        self.assertEqual(self.search(q="sea view"), [self.loft, self.cabin])
+
+    def test_combines_with_filters(self):
+        """Keyword and price filters apply together"""
+        self.assertEqual(self.search(q="sea", price_max=100.0), [self.cabin])
+
+    def test_index_follows_updates(self):
+        """Edited and deleted places leave the index"""
+        facade.update_place(self.cabin, {"description": "Forest retreat"})
+        self.assertEqual(self.search(q="sea"), [self.loft])
+        facade.delete_place(self.loft)
+        self.assertEqual(self.search(q="loft"), [])
@@ -0,0 +1,116 @@
+"""Nearest places around a point, through the geohash cells."""
+
+from math import floor
+from tests.base import ApiTestCase
+from app.geo import KM_PER_DEGREE, cell_size, covering_cells
+from app.services.facade import facade
+
+# Paris
+LAT, LON = 48.8566, 2.3522
+
+
+class TestPlacesNearby(ApiTestCase):
+    """Distance order, radius cutoff, k and the stored cell"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner_id = self.make_user().id
+
+    def _place(self, title, km_north=0.0, lat=LAT, lon=LON):
+        return facade.create_place(
+            {
+                "title": title,
+                "price": 10,
+                "latitude": lat + km_north / KM_PER_DEGREE,
+                "longitude": lon,
+            },
+            self.owner_id,
+        ).id
+
+    def _nearby(self, lat=LAT, lon=LON, radius_km=10.0, k=20):
+        return [
+            (place.title, round(distance, 1))
+            for place, distance in facade.get_places_nearby(
+                lat, lon, radius_km, k
+            )
+        ]
+
+    def test_nearest_first(self):
+        for title, km in (("Far", 7), ("Near", 1), ("Middle", -3)):
+            self._place(title, km)
+        facade.create_place({"title": "Unlocated", "price": 10}, self.owner_id)
+        self.assertEqual(
+            self._nearby(),
+            [("Near", 1.0), ("Middle", 3.0), ("Far", 7.0)],
+        )
+
+    def test_radius_cutoff(self):
+        self._place("Inside", 4.9)
+        self._place("Outside", 5.1)
+        self.assertEqual(self._nearby(radius_km=5), [("Inside", 4.9)])
+
+    def test_neighbouring_cell_inside_radius(self):
+        """A place across the edge of the center's cell is still found"""
+        precision = len(covering_cells(LAT, LON, 5)[0])
+        lat_deg, _ = cell_size(precision)
+        edge = floor((LAT + 90) / lat_deg) * lat_deg - 90
+        center = edge + 0.005
+        place_id = self._place("Across", lat=edge - 0.005)
+        cell = facade.get_place(place_id).geohash[:precision]
+        self.assertNotEqual(cell, facade._geohash(center, LON)[:precision])
+        self.assertIn(cell, covering_cells(center, LON, 5))
+        self.assertEqual(self._nearby(center, radius_km=5), [("Across", 1.1)])
+
+    def test_k_truncates(self):
+        for km in range(1, 6):
+            self._place(f"At {km}", km)
+        self.assertEqual(self._nearby(k=2), [("At 1", 1.0), ("At 2", 2.0)])
+
+    def test_moving_a_place_moves_its_cell(self):
+        place_id = self._place("Villa", 1)
+        before = facade.get_place(place_id).geohash
+        # Lyon
+        facade.update_place(
+            place_id, {"latitude": 45.764, "longitude": 4.8357}
+        )
+        self.assertNotEqual(facade.get_place(place_id).geohash, before)
+        self.assertEqual(self._nearby(), [])
+        self.assertEqual(self._nearby(45.764, 4.8357), [("Villa", 0.0)])
+
+    def test_invalid_arguments(self):
+        for args in ({"lat": 91}, {"radius_km": 0}, {"k": 0}):
+            with self.assertRaises(ValueError):
+                facade.get_places_nearby(
+                    args.get("lat", LAT),
+                    LON,
+                    args.get("radius_km", 10),
+                    args.get("k", 20),
+                )
+
+    def _get(self, query):
+        return self.client.get(f"/api/v1/places/nearby?{query}")
+
+    def test_endpoint(self):
+        for title, km in (("Far", 7), ("Near", 1), ("Middle", 3)):
+            self._place(title, km)
+        response = self._get(f"lat={LAT}&lon={LON}&radius_km=5")
+        self.assert200(response)
+        self.assertEqual(
+            [
+                (item["title"], round(item["distance_km"], 1))
+                for item in response.json
+            ],
+            [("Near", 1.0), ("Middle", 3.0)],
+        )
+        self.assertIn("id", response.json[0])
+        response = self._get(f"lat={LAT}&lon={LON}&k=1")
+        self.assertEqual([item["title"] for item in response.json], ["Near"])
+
+    def test_endpoint_rejects_invalid_arguments(self):
+        for query in (
+            f"lat={LAT}&lon={LON}&radius_km=-1",
+            f"lat={LAT}&lon={LON}&k=0",
+            f"lat=91&lon={LON}",
+            f"lat={LAT}",
+        ):
+            self.assert400(self._get(query), query)
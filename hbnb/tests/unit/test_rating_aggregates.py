@@ -0,0 +1,60 @@
+"""Tests for the rating aggregates stored on Place."""
+
+from tests.base import BaseTestCase
+from app.services.facade import facade
+
+
+class TestRatingAggregates(BaseTestCase):
+    """Review writes keep review_count, rating_sum and stars in sync."""
+
+    def setUp(self):
+        super().setUp()
+        users = [self.make_user(f"user{i}@test.com") for i in range(3)]
+        self.owner, self.alice, self.bob = users
+        self.place = facade.create_place(
+            {"title": "Loft", "price": 80.0}, self.owner.id
+        )
+
+    def assertAggregates(self, count, total, average):
+        place = facade.get_place(self.place.id)
+        self.assertEqual(place.review_count, count)
+        self.assertEqual(place.rating_sum, total)
+        self.assertEqual(place.rating_avg, average)
+
+    def test_create_update_delete(self):
+        """Each review write shifts the aggregates"""
+        review = facade.create_review(
+            {"text": "Great", "rating": 5, "place_id": self.place.id},
+            self.alice.id,
+        )
+        facade.create_review(
+            {"text": "Fine", "rating": 3, "place_id": self.place.id},
+            self.bob.id,
+        )
+        self.assertAggregates(2, 8, 4.0)
+
+        facade.update_review(review.id, {"rating": 1})
+        self.assertAggregates(2, 4, 2.0)
+        histogram = facade.get_place(self.place.id).rating_histogram
+        self.assertEqual(histogram, {"1": 1, "2": 0, "3": 1, "4": 0, "5": 0})
+
+        facade.delete_review(review.id)
+        self.assertAggregates(1, 3, 3.0)
+
+    def test_rating_filter_reads_column(self):
+        """rating_min filters on the stored average"""
+        facade.create_review(
+            {"text": "Good", "rating": 4, "place_id": self.place.id},
+            self.alice.id,
+        )
+        self.assertEqual(len(facade.search_places({"rating_min": 4})), 1)
+        self.assertEqual(facade.search_places({"rating_min": 4.5}), [])
+
+    def test_deleting_reviewer_updates_place(self):
+        """Reviews removed by a user cascade leave the place consistent"""
+        facade.create_review(
+            {"text": "Good", "rating": 4, "place_id": self.place.id},
+            self.alice.id,
+        )
+        facade.delete_user(self.alice.id)
+        self.assertAggregates(0, 0, None)
@@ -0,0 +1,71 @@
+"""Tag based invalidation of the response cache."""
+
+import gzip
+from tests.base import BaseTestCase
+from app.api.v1.caching import _cache_key
+from app.services.facade import facade
+from app.services.response_cache import response_cache
+
+
+class TestResponseCache(BaseTestCase):
+    """Facade writes strand the responses tagged with what they change"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user("owner@test.com")
+        self.place = facade.create_place(
+            {"title": "Villa", "price": 200.0}, self.owner.id
+        )
+
+    def _store(self, key, *tags):
+        tokens = response_cache.tokens(tags)
+        response_cache.set(key, tokens, {}, b'{"ok": true}')
+        return tags
+
+    def _cached(self, key, tags):
+        tokens = response_cache.tokens(tags)
+        return response_cache.get("test", key, tokens) is not None
+
+    def test_entry_round_trip(self):
+        tags = self._store("/places/", "places")
+        entry = response_cache.get(
+            "test", "/places/", response_cache.tokens(tags)
+        )
+        self.assertEqual(gzip.decompress(entry["body"]), b'{"ok": true}')
+
+    def test_key_follows_negotiated_format(self):
+        def key(accept):
+            with self.app.test_request_context(
+                "/api/v1/places/?limit=5&cursor=a", headers={"Accept": accept}
+            ):
+                return _cache_key()
+
+        self.assertNotEqual(
+            key("application/json"), key("application/x-ndjson")
+        )
+        self.assertEqual(key("application/json"), key("*/*"))
+
+    def test_place_update_invalidates_place_tags(self):
+        detail = self._store("detail", f"place:{self.place.id}")
+        listing = self._store("list", "places")
+        amenities = self._store("amenities", "amenities")
+        facade.update_place(self.place.id, {"price": 250.0})
+        self.assertFalse(self._cached("detail", detail))
+        self.assertFalse(self._cached("list", listing))
+        self.assertTrue(self._cached("amenities", amenities))
+
+    def test_review_invalidates_place_reviews(self):
+        guest = self.make_user("guest@test.com")
+        reviews = self._store("reviews", f"reviews:{self.place.id}")
+        detail = self._store("detail", f"place:{self.place.id}")
+        facade.create_review(
+            {"text": "Great", "rating": 5, "place_id": self.place.id},
+            guest.id,
+        )
+        self.assertFalse(self._cached("reviews", reviews))
+        self.assertTrue(self._cached("detail", detail))
+
+    def test_amenity_write_invalidates_amenities(self):
+        amenities = self._store("amenities", "amenities")
+        facade.create_amenity({"name": "WiFi"})
+        self.assertFalse(self._cached("amenities", amenities))
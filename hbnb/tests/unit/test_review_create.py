@@ -0,0 +1,67 @@
+"""Single statement review creation."""
+
+from tests.base import BaseTestCase
+from app.db import db
+from app.models.review import Review
+from app.services.facade import NotFoundError, facade
+
+
+class TestCreateReview(BaseTestCase):
+    """One INSERT checks the place, its owner and the unique rule"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner_id = self.make_user("owner@test.com").id
+        self.guest_id = self.make_user("guest@test.com").id
+        self.place_id = facade.create_place(
+            {"title": "Villa", "price": 10}, self.owner_id
+        ).id
+        db.session.expunge_all()
+
+    def _create(self, user_id, place_id=None, rating=4):
+        with self.recorded_queries() as statements:
+            review = facade.create_review(
+                {
+                    "text": "Nice",
+                    "rating": rating,
+                    "place_id": place_id or self.place_id,
+                },
+                user_id,
+            )
+        return review, [statement.split()[0] for statement in statements]
+
+    def test_insert_without_lookups(self):
+        review, statements = self._create(self.guest_id)
+        self.assertEqual(statements, ["INSERT", "UPDATE", "UPDATE"])
+        self.assertEqual(
+            (review.user_id, review.place_id, review.rating),
+            (self.guest_id, self.place_id, 4),
+        )
+        self.assertIsNotNone(review.created_at)
+        self.assertEqual(Review.query.count(), 1)
+        place = facade.get_place(self.place_id)
+        self.assertEqual((place.review_count, place.rating_avg), (1, 4.0))
+
+    def test_second_review_refused(self):
+        self._create(self.guest_id)
+        with self.assertRaisesRegex(ValueError, "Already reviewed"):
+            self._create(self.guest_id, rating=1)
+        self.assertEqual(facade.get_place(self.place_id).rating_avg, 4.0)
+
+    def test_own_place_and_missing_place(self):
+        with self.assertRaisesRegex(ValueError, "your own place") as raised:
+            self._create(self.owner_id)
+        self.assertNotIsInstance(raised.exception, NotFoundError)
+        with self.assertRaises(NotFoundError):
+            self._create(self.guest_id, place_id="missing")
+        self.assertEqual(Review.query.count(), 0)
+
+    def test_missing_user(self):
+        with self.assertRaisesRegex(NotFoundError, "User not found"):
+            self._create("no-such-user")
+        self.assertEqual(Review.query.count(), 0)
+        self.assertEqual(facade.get_place(self.place_id).review_count, 0)
+
+    def test_invalid_rating(self):
+        with self.assertRaisesRegex(ValueError, "between 1 and 5"):
+            self._create(self.guest_id, rating=9)
@@ -0,0 +1,79 @@
+"""Sparse fieldsets of the list endpoints."""
+
+from werkzeug.exceptions import HTTPException
+from tests.base import BaseTestCase
+from app.api.v1.listing import marshal_page, sparse_fields
+from app.api.v1.places import PlaceList, place_model
+from app.api.v1.reviews import review_model
+from app.api.v1.users import user_model
+from app.services.facade import facade
+
+
+class TestSparseFields(BaseTestCase):
+    """fields= selects only the named columns, id included"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user("owner@test.com")
+        self.guest = self.make_user("guest@test.com")
+        self.place = facade.create_place(
+            {"title": "Villa", "price": 10.0, "description": "Long text"},
+            self.owner.id,
+        )
+        facade.create_review(
+            {"text": "Fine", "rating": 4, "place_id": self.place.id},
+            self.guest.id,
+        )
+
+    def test_id_always_kept(self):
+        self.assertEqual(
+            sparse_fields("title,price", place_model), ["id", "title", "price"]
+        )
+        self.assertEqual(
+            sparse_fields("price, id,price", place_model), ["price", "id"]
+        )
+        self.assertIsNone(sparse_fields("", place_model))
+        self.assertIsNone(sparse_fields(" , ", place_model))
+
+    def test_unknown_field(self):
+        with self.assertRaisesRegex(ValueError, "Unknown fields: owner"):
+            sparse_fields("title,owner", place_model)
+        # Columns outside the API model are refused as well
+        with self.assertRaisesRegex(ValueError, "password"):
+            sparse_fields("email,password", user_model)
+        with self.assertRaises(ValueError):
+            facade.list_places(fields=["owner"])
+
+        with self.app.test_request_context("/api/v1/places/?fields=owner"):
+            with self.assertRaises(HTTPException) as raised:
+                PlaceList().get()
+        self.assertEqual(raised.exception.code, 400)
+
+    def test_projected_places_page(self):
+        names = sparse_fields("title,price", place_model)
+        with self.recorded_queries() as statements:
+            page = facade.list_places(fields=names)
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("description", statements[0])
+        self.assertEqual(
+            page["items"],
+            [{"id": self.place.id, "title": "Villa", "price": 10.0}],
+        )
+        self.assertEqual(
+            marshal_page(page, place_model, names)["items"],
+            [{"id": self.place.id, "title": "Villa", "price": 10.0}],
+        )
+
+    def test_projected_reviews_and_users(self):
+        names = sparse_fields("rating", review_model)
+        page = facade.list_reviews(fields=names)
+        self.assertEqual(
+            [sorted(item) for item in page["items"]], [["id", "rating"]]
+        )
+        names = sparse_fields("email", user_model)
+        page = facade.list_users(fields=names)
+        self.assertEqual(
+            sorted(item["email"] for item in page["items"]),
+            ["guest@test.com", "owner@test.com"],
+        )
+        self.assertEqual(set(page["items"][0]), {"id", "email"})
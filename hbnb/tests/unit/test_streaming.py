@@ -0,0 +1,99 @@
+"""Streamed list endpoints, as JSON pages and as NDJSON."""
+
+import json
+from unittest import mock
+from tests.base import ApiTestCase
+from app.api.v1.listing import NDJSON
+from app.services.facade import facade
+
+
+class TestStreamedLists(ApiTestCase):
+    """The streamed body is valid JSON, or one object per line"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user("owner@test.com")
+        self.guest = self.make_user("guest@test.com")
+        self.places = [
+            facade.create_place(
+                {"title": f"Place {i}", "price": 10 + i}, self.owner.id
+            ).id
+            for i in range(5)
+        ]
+        for place_id in self.places:
+            facade.create_review(
+                {"text": "Fine", "rating": 4, "place_id": place_id},
+                self.guest.id,
+            )
+        # Several chunks for five items
+        patcher = mock.patch("app.api.v1.listing.STREAM_CHUNK_ITEMS", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _json(self, url, **kwargs):
+        response = self.client.get(url, **kwargs)
+        self.assert200(response)
+        self.assertEqual(response.mimetype, "application/json")
+        return json.loads(response.get_data(as_text=True))
+
+    def _ndjson(self, url, headers=None):
+        response = self.client.get(
+            url, headers={"Accept": NDJSON, **(headers or {})}
+        )
+        self.assert200(response)
+        self.assertEqual(response.mimetype, NDJSON)
+        # One complete object per line, each ended by a newline
+        lines = response.get_data(as_text=True).split("\n")
+        self.assertEqual(lines.pop(), "")
+        return [json.loads(line) for line in lines]
+
+    def test_places(self):
+        paged = self._json("/api/v1/places/?limit=50")
+        streamed = self._json("/api/v1/places/?stream=true")
+        self.assertEqual(streamed, {"items": paged["items"], "next": None})
+        self.assertEqual(len(streamed["items"]), 5)
+        self.assertEqual(self._ndjson("/api/v1/places/"), paged["items"])
+
+    def test_places_fields(self):
+        items = self._json("/api/v1/places/?stream=1&fields=title")["items"]
+        self.assertEqual(set(items[0]), {"id", "title"})
+        lines = self._ndjson("/api/v1/places/?fields=price,title")
+        self.assertEqual(len(lines), 5)
+        for line in lines:
+            self.assertEqual(set(line), {"id", "title", "price"})
+
+    def test_places_resume_and_empty(self):
+        page = self._json("/api/v1/places/?limit=3")
+        rest = self._json(f"/api/v1/places/?stream=1&cursor={page['next']}")
+        self.assertEqual(len(rest["items"]), 2)
+        empty = self._json("/api/v1/places/?stream=1&q=nowhere")
+        self.assertEqual(empty, {"items": [], "next": None})
+        self.assertEqual(self._ndjson("/api/v1/places/?q=nowhere"), [])
+
+    def test_reviews(self):
+        streamed = self._json("/api/v1/reviews/?stream=1&fields=rating")
+        self.assertEqual(len(streamed["items"]), 5)
+        self.assertEqual(set(streamed["items"][0]), {"id", "rating"})
+        place_id = self.places[0]
+        lines = self._ndjson(f"/api/v1/reviews/places/{place_id}/reviews")
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["place_id"], place_id)
+
+    def test_users(self):
+        headers = self.auth_headers(self.owner)
+        streamed = self._json("/api/v1/users/?stream=1", headers=headers)
+        self.assertEqual(
+            {user["email"] for user in streamed["items"]},
+            {"owner@test.com", "guest@test.com"},
+        )
+        self.assertNotIn("password", streamed["items"][0])
+        lines = self._ndjson("/api/v1/users/?fields=email", headers=headers)
+        self.assertEqual([set(line) for line in lines], [{"id", "email"}] * 2)
+
+    def test_invalid_parameters(self):
+        for url in (
+            "/api/v1/places/?stream=1&fields=owner",
+            "/api/v1/places/?stream=1&cursor=not-a-cursor",
+            "/api/v1/reviews/?stream=1&fields=nope",
+        ):
+            self.assert400(self.client.get(url), url)
@@ -0,0 +1,113 @@
+"""Request-scoped unit of work."""
+
+from flask_restx import abort
+from sqlalchemy import event
+from werkzeug.exceptions import HTTPException
+from tests.base import BaseTestCase
+from app.db import db
+from app.api.v1.transaction import unit_of_work
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.services.facade import facade
+from app.services.unit_of_work import UnitOfWork
+
+
+class TestUnitOfWork(BaseTestCase):
+    """Facade writes made inside a unit commit once, or not at all"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner_id = self.make_user("owner@test.com").id
+        self.commits = 0
+        event.listen(db.engine, "commit", self._count)
+
+    def tearDown(self):
+        event.remove(db.engine, "commit", self._count)
+        super().tearDown()
+
+    def _count(self, conn):
+        self.commits += 1
+
+    def _create_place_with_amenity(self):
+        wifi = facade.create_amenity({"name": "WiFi"})
+        place = facade.create_place({"title": "Villa", "price": 10},
+                                    self.owner_id)
+        facade.set_place_amenities([place.id], [wifi.id],
+                                   user=self.owner_id)
+        return place
+
+    def test_single_commit(self):
+        ran = []
+        with UnitOfWork():
+            place = self._create_place_with_amenity()
+            facade._after_commit(lambda: ran.append(True))
+            self.assertEqual(self.commits, 0)
+            self.assertEqual(ran, [])
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(ran, [True])
+        db.session.expire_all()
+        self.assertEqual(
+            [a.name for a in facade.get_place(place.id).amenities], ["WiFi"]
+        )
+
+    def test_exception_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            with UnitOfWork():
+                self._create_place_with_amenity()
+                raise RuntimeError("boom")
+        self.assertEqual(self.commits, 0)
+        self.assertEqual((Place.query.count(), Amenity.query.count()), (0, 0))
+
+    def test_failed_participant_loses_the_unit(self):
+        with UnitOfWork():
+            facade.create_amenity({"name": "WiFi"})
+            with self.assertRaises(ValueError):
+                facade.create_amenity({"name": ""})
+            facade.create_amenity({"name": "Pool"})
+        self.assertEqual(Amenity.query.count(), 0)
+
+    def test_nested_units_join(self):
+        with UnitOfWork():
+            with UnitOfWork():
+                facade.create_amenity({"name": "WiFi"})
+            self.assertEqual(self.commits, 0)
+        self.assertEqual(self.commits, 1)
+
+    def test_decorator_rolls_back_error_responses(self):
+        @unit_of_work
+        def view(code):
+            facade.create_amenity({"name": f"Amenity {code}"})
+            return {"message": "done"}, code
+
+        self.assertEqual(view(400)[1], 400)
+        self.assertEqual(Amenity.query.count(), 0)
+        self.assertEqual(view(201)[1], 201)
+        self.assertEqual(
+            [a.name for a in Amenity.query.all()], ["Amenity 201"]
+        )
+
+    def test_decorator_retries_conflicts_without_if_match(self):
+        calls = []
+
+        @unit_of_work
+        def view():
+            calls.append(True)
+            facade.create_amenity({"name": f"Amenity {len(calls)}"})
+            if len(calls) % 2:
+                abort(409, "Amenity was modified concurrently")
+            return {"message": "done"}, 200
+
+        with self.app.test_request_context(method="PUT"):
+            self.assertEqual(view()[1], 200)
+        self.assertEqual(
+            [a.name for a in Amenity.query.all()], ["Amenity 2"]
+        )
+
+        # Under If-Match the client asked to hear about the conflict
+        with self.app.test_request_context(
+            method="PUT", headers={"If-Match": '"tag"'}
+        ):
+            with self.assertRaises(HTTPException) as raised:
+                view()
+        self.assertEqual(raised.exception.code, 409)
+        self.assertEqual(len(calls), 3)